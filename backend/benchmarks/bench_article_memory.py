@@ -0,0 +1,102 @@
+"""
+Story cache memory: plain dicts (the old item shape) vs. slot-based Article records.
+Builds N synthetic RSS-shaped stories from a realistic pool of sources, categories,
+regions and tags, and reports traced memory per representation.
+Run: cd backend && python benchmarks/bench_article_memory.py [--sizes 10000 100000]
+"""
+
+import argparse
+import gc
+import hashlib
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models.article import Article  # noqa: E402
+
+SOURCES = [f"Source {i}" for i in range(40)]
+CATEGORIES = [
+    "General",
+    "Politics",
+    "Business",
+    "Sports",
+    "Technology",
+    "Health",
+    "Entertainment",
+]
+REGIONS = ["local", "continental", "international"]
+TAGS = [
+    "Nigeria",
+    "Ghana",
+    "Kenya",
+    "Economy",
+    "Election",
+    "Football",
+    "Tech",
+    "Health",
+    "Naira",
+    "Oil",
+]
+
+
+def _fields(i: int, rng: random.Random) -> dict:
+    # Decoded feed strings are fresh objects per item, as they are after parsing
+    return {
+        "id": hashlib.md5(str(i).encode()).hexdigest()[:12],
+        "title": f"Headline number {i} about {rng.choice(TAGS)}",
+        "summary": f"Summary text for story {i}. " * 4,
+        "source": "".join(rng.choice(SOURCES)),
+        "source_url": f"https://example.com/news/{i}",
+        "image_url": f"https://cdn.example.com/{i}.jpg" if i % 3 else None,
+        "published": f"2026-06-{1 + i % 28:02d}T{i % 24:02d}:00:00",
+        "category": "".join(rng.choice(CATEGORIES)),
+        "region": "".join(rng.choice(REGIONS)),
+        "truth_score": 100,
+        "listen_count": 0,
+        "tags": ["".join(t) for t in rng.sample(TAGS, 3)],
+    }
+
+
+def build_dicts(n: int):
+    rng = random.Random(1)
+    return [_fields(i, rng) for i in range(n)]
+
+
+def build_records(n: int):
+    rng = random.Random(1)
+    return [Article(**_fields(i, rng)) for i in range(n)]
+
+
+def measure(build, n: int):
+    gc.collect()
+    tracemalloc.start()
+    items = build(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    gc.collect()
+    return current
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = ap.parse_args()
+
+    print(
+        f"{'stories':>8} {'dict MB':>9} {'record MB':>10} {'saved':>7} {'dict B/item':>12} {'record B/item':>14}"
+    )
+    for n in args.sizes:
+        dict_bytes = measure(build_dicts, n)
+        rec_bytes = measure(build_records, n)
+        print(
+            f"{n:>8} {dict_bytes / 1e6:>9.1f} {rec_bytes / 1e6:>10.1f} {1 - rec_bytes / dict_bytes:>6.0%}"
+            f" {dict_bytes // n:>12} {rec_bytes // n:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
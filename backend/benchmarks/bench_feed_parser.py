@@ -0,0 +1,85 @@
+"""
+Feed parser benchmark: feedparser vs. the streaming engine in lib/feed_parser.py.
+Synthetic RSS 2.0 and Atom feeds (with media, enclosures, categories, HTML summaries);
+reports per-feed parse time and whether both engines produce identical rows.
+Run: cd backend && python benchmarks/bench_feed_parser.py [--entries 200] [--rounds 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib.feed_parser import MAX_ENTRIES, _feedparser_rows, _stream_rows  # noqa: E402
+
+
+def rss_feed(n: int) -> bytes:
+    items = "".join(
+        f"<item><title>Lagos story {i}: markets rally</title>"
+        f"<link>https://example.com/news/{i}</link>"
+        f"<description><![CDATA[<p>Summary for story {i}. {'Body text. ' * 30}</p>]]></description>"
+        f"<pubDate>Tue, 0{1 + i % 9} Jun 2026 1{i % 10}:30:00 +0100</pubDate>"
+        f"<category>Business</category><category>Nigeria</category>"
+        f'<media:content url="https://cdn.example.com/{i}.jpg" medium="image"/>'
+        f"</item>"
+        for i in range(n)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        f"<title>Bench RSS</title><link>https://example.com</link>{items}</channel></rss>"
+    ).encode()
+
+
+def atom_feed(n: int) -> bytes:
+    entries = "".join(
+        f"<entry><title>Accra story {i}</title>"
+        f'<link rel="alternate" href="https://example.org/a/{i}"/>'
+        f'<link rel="enclosure" type="image/png" href="https://cdn.example.org/{i}.png"/>'
+        f"<id>urn:bench:{i}</id><updated>2026-06-0{1 + i % 9}T10:00:00Z</updated>"
+        f"<published>2026-06-0{1 + i % 9}T10:00:00Z</published>"
+        f"<summary>Plain summary {i}. {'More text. ' * 30}</summary>"
+        f'<category term="Politics"/></entry>'
+        for i in range(n)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<feed xmlns="http://www.w3.org/2005/Atom"><title>Bench Atom</title>{entries}</feed>'
+    ).encode()
+
+
+def timed(fn, content: bytes, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(content, MAX_ENTRIES)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--entries", type=int, default=200, help="entries per synthetic feed"
+    )
+    ap.add_argument("--rounds", type=int, default=50)
+    args = ap.parse_args()
+
+    print(
+        f"{'feed':<6} {'bytes':>9} {'feedparser ms':>14} {'stream ms':>10} {'speedup':>8}  parity"
+    )
+    for name, build in (("rss", rss_feed), ("atom", atom_feed)):
+        content = build(args.entries)
+        fp_ms = timed(_feedparser_rows, content, args.rounds)
+        st_ms = timed(_stream_rows, content, args.rounds)
+        same = _feedparser_rows(content, MAX_ENTRIES) == _stream_rows(
+            content, MAX_ENTRIES
+        )
+        verdict = "ok" if same else "DIFF"
+        print(
+            f"{name:<6} {len(content):>9} {fp_ms:>14.2f} {st_ms:>10.2f} {fp_ms / st_ms:>7.1f}x  {verdict}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Ingestion benchmark against the offline fixture server (benchmarks/fixture_feeds.py).
+For each feed count, drives the real pipeline with fresh per-feed state:
+  fetch_all_news cold   - every feed downloaded and parsed
+  fetch_all_news warm   - second pass (ETag 304s / open circuits)
+  get_cached_all_news   - cold snapshot build, then repeated cached reads
+and reports wall time, CPU time, peak RSS, event-loop lag and per-feed fetch percentiles.
+The fixture server runs in a child process, so CPU and RSS are the client's alone.
+Run: cd backend && python benchmarks/bench_ingestion.py [--feeds 40 400 4000] [--profile realistic]
+     [--recorded benchmarks/recorded]
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("FEED_SCHEDULER_ENABLED", "0")
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench")
+
+from fixture_feeds import PROFILES, FixtureServer  # noqa: E402
+
+import services.news_service as ns  # noqa: E402
+from lib.circuit_breaker import CircuitBreakers  # noqa: E402
+from lib.http_client import close_ingest_session  # noqa: E402
+from lib.telemetry import MetricRings  # noqa: E402
+from services.snapshot_service import SnapshotManager  # noqa: E402
+
+CACHED_READS = 1000
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def _peak_rss_mb() -> float:
+    return (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 / 1e6
+    )  # KiB on Linux
+
+
+class LoopLag:
+    """Samples how late a 10 ms sleep wakes up while the workload runs."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval) * 1000)
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+    def summary(self) -> str:
+        if not self.samples:
+            return "-"
+        s = sorted(self.samples)
+        return f"{s[len(s) // 2]:.1f}/{s[int(len(s) * 0.99)]:.1f}/{s[-1]:.0f}"
+
+
+async def measure(label: str, fn: Callable[[], Awaitable[int]]) -> Dict:
+    cpu, wall = time.process_time(), time.perf_counter()
+    with LoopLag() as lag:
+        count = await fn()
+    return {
+        "step": label,
+        "wall_s": time.perf_counter() - wall,
+        "cpu_s": time.process_time() - cpu,
+        "items": count,
+        "rss_mb": _rss_mb(),
+        "peak_mb": _peak_rss_mb(),
+        "lag": lag.summary(),
+    }
+
+
+def reset_pipeline(feeds: List[Dict]) -> None:
+    """Fresh per-feed state (validators, breakers, telemetry, snapshot) for the given feeds."""
+    ns.RSS_FEEDS[:] = feeds
+    ns._feed_validators.clear()
+    ns._feed_health.clear()
+    ns._feed_breakers = CircuitBreakers(
+        failure_threshold=ns.FEED_BREAKER_FAILURES,
+        base_backoff=ns.FEED_BREAKER_BACKOFF,
+        max_backoff=ns.FEED_BREAKER_MAX_BACKOFF,
+        budget_factor=ns.FEED_LATENCY_FACTOR,
+        min_budget=ns.FEED_MIN_BUDGET,
+    )
+    ns._ingest_telemetry = MetricRings(
+        ns._TELEMETRY_METRICS, capacity=ns.INGEST_TELEMETRY_SAMPLES
+    )
+    ns._news_snapshots = SnapshotManager(
+        ns._build_news_snapshot, ttl=3600, on_publish=ns._on_news_publish
+    )
+
+
+async def run_size(server: FixtureServer, limit: int) -> List[Dict]:
+    reset_pipeline(server.feed_configs())
+
+    async def fetch():
+        return len(await ns.fetch_all_news(limit=limit))
+
+    async def cached():
+        items = await ns.get_cached_all_news()
+        for _ in range(CACHED_READS):
+            await ns.get_cached_all_news()
+        return len(items)
+
+    rows = [
+        await measure("fetch_all_news cold", fetch),
+        await measure("fetch_all_news warm", fetch),
+    ]
+    ns._news_snapshots = SnapshotManager(
+        ns._build_news_snapshot, ttl=3600, on_publish=ns._on_news_publish
+    )
+    rows.append(await measure(f"get_cached_all_news +{CACHED_READS} reads", cached))
+    await close_ingest_session()
+    return rows
+
+
+def feed_percentiles() -> str:
+    feeds = ns.get_ingest_telemetry()["feeds"]
+    totals = sorted(f["total_ms"]["p50"] for f in feeds)
+    if not totals:
+        return "-"
+    return f"{totals[len(totals) // 2]:.0f}/{totals[int(len(totals) * 0.95)]:.0f}/{totals[-1]:.0f} ms"
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--feeds", type=int, nargs="+", default=[40, 400, 4000])
+    ap.add_argument("--profile", choices=sorted(PROFILES), default="realistic")
+    ap.add_argument(
+        "--entries", type=int, default=20, help="entries per synthetic feed"
+    )
+    ap.add_argument(
+        "--hosts",
+        type=int,
+        default=32,
+        help="local ports standing in for publisher hosts",
+    )
+    ap.add_argument(
+        "--recorded",
+        metavar="DIR",
+        help="replay bodies saved by fixture_feeds.py --record",
+    )
+    args = ap.parse_args()
+
+    print(
+        f"profile={args.profile} entries={args.entries} hosts={args.hosts} recorded={args.recorded or '-'}"
+    )
+    print(
+        f"{'feeds':>6} {'step':<34} {'wall s':>8} {'cpu s':>7} {'items':>7} {'rss MB':>7} {'peak MB':>8}"
+        f"  loop lag p50/p99/max ms"
+    )
+    for n in sorted(args.feeds):
+        with FixtureServer(
+            n, args.profile, args.entries, args.hosts, args.recorded
+        ) as server:
+            kinds = {k: server.kinds.count(k) for k in ("ok", "slow", "fail", "hang")}
+            rows = asyncio.run(run_size(server, limit=n * args.entries))
+        for r in rows:
+            print(
+                f"{n:>6} {r['step']:<34} {r['wall_s']:>8.2f} {r['cpu_s']:>7.2f} {r['items']:>7}"
+                f" {r['rss_mb']:>7.0f} {r['peak_mb']:>8.0f}  {r['lag']}"
+            )
+        print(
+            f"{'':>6} feeds {kinds}; per-feed fetch p50 across feeds (median/p95/max): {feed_percentiles()}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Offline RSS fixture server for ingestion benchmarks.
+Serves N feeds from several local ports (ports stand in for publisher hosts, so the
+ingest session's per-host connection limits apply as they do in production). Bodies
+are replayed from recorded feed files when a directory is given, otherwise generated.
+Each feed gets a deterministic behaviour from the profile: normal, slow, failing
+(HTTP 503) or hanging (sleeps past any client timeout). ETag / If-None-Match is honoured.
+
+Record real bodies once (needs network):
+    cd backend && python benchmarks/fixture_feeds.py --record benchmarks/recorded
+Serve standalone (prints the feed URLs' base):
+    cd backend && python benchmarks/fixture_feeds.py --feeds 400 --profile realistic
+"""
+
+import argparse
+import asyncio
+import glob
+import hashlib
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# latency_ms: (min, max) for normal feeds; rates are fractions of all feeds
+PROFILES: Dict[str, Dict] = {
+    "fast": {
+        "latency_ms": (5, 20),
+        "slow": 0.0,
+        "slow_ms": (0, 0),
+        "fail": 0.0,
+        "hang": 0.0,
+    },
+    "realistic": {
+        "latency_ms": (40, 400),
+        "slow": 0.05,
+        "slow_ms": (2000, 4000),
+        "fail": 0.03,
+        "hang": 0.02,
+    },
+    "degraded": {
+        "latency_ms": (100, 800),
+        "slow": 0.15,
+        "slow_ms": (3000, 8000),
+        "fail": 0.10,
+        "hang": 0.10,
+    },
+}
+HANG_SECONDS = 30
+
+
+def synthetic_body(feed: int, entries: int) -> bytes:
+    items = "".join(
+        f"<item><title>Feed {feed} story {i}: Lagos markets and Abuja policy update</title>"
+        f"<link>https://publisher{feed}.example.com/news/{i}</link>"
+        f"<description><![CDATA[<p>Summary for story {i} of feed {feed}. {'Body text. ' * 12}</p>]]></description>"
+        f"<pubDate>Tue, 0{1 + i % 9} Jun 2026 1{i % 10}:30:00 +0100</pubDate>"
+        f"<category>News</category>"
+        f'<media:content url="https://cdn.example.com/{feed}/{i}.jpg" medium="image"/>'
+        f"</item>"
+        for i in range(entries)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        f"<title>Fixture feed {feed}</title>{items}</channel></rss>"
+    ).encode()
+
+
+def load_recorded(directory: str) -> List[bytes]:
+    bodies = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.xml"))):
+        with open(path, "rb") as f:
+            bodies.append(f.read())
+    return bodies
+
+
+def feed_behaviour(feed: int, profile: Dict, seed: int = 1) -> Tuple[str, float]:
+    """(kind, latency seconds) for one feed; the same for every run with the same seed."""
+    rng = random.Random(f"{seed}:{feed}")
+    roll = rng.random()
+    if roll < profile["hang"]:
+        return "hang", HANG_SECONDS
+    if roll < profile["hang"] + profile["fail"]:
+        return "fail", rng.uniform(*profile["latency_ms"]) / 1000
+    if roll < profile["hang"] + profile["fail"] + profile["slow"]:
+        return "slow", rng.uniform(*profile["slow_ms"]) / 1000
+    return "ok", rng.uniform(*profile["latency_ms"]) / 1000
+
+
+def build_app(
+    feeds: int,
+    profile: Dict,
+    entries: int,
+    recorded: Optional[List[bytes]] = None,
+    seed: int = 1,
+):
+    from aiohttp import web
+
+    bodies: Dict[int, Tuple[bytes, str]] = {}
+
+    def body_for(feed: int) -> Tuple[bytes, str]:
+        cached = bodies.get(feed)
+        if cached is None:
+            content = (
+                recorded[feed % len(recorded)]
+                if recorded
+                else synthetic_body(feed, entries)
+            )
+            cached = bodies[feed] = (
+                content,
+                '"%s"' % hashlib.md5(content).hexdigest()[:16],
+            )
+        return cached
+
+    behaviours = [feed_behaviour(i, profile, seed) for i in range(feeds)]
+
+    async def handle(request):
+        feed = int(request.match_info["feed"])
+        if feed >= feeds:
+            return web.Response(status=404)
+        kind, delay = behaviours[feed]
+        await asyncio.sleep(delay)
+        if kind == "fail":
+            return web.Response(status=503)
+        content, etag = body_for(feed)
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            body=content, content_type="application/rss+xml", headers={"ETag": etag}
+        )
+
+    app = web.Application()
+    app.router.add_get("/feed/{feed}", handle)
+    return app, behaviours
+
+
+async def _serve(
+    hosts: int,
+    feeds: int,
+    profile: Dict,
+    entries: int,
+    recorded,
+    seed: int,
+    ready,
+    stop,
+) -> None:
+    from aiohttp import web
+
+    app, behaviours = build_app(feeds, profile, entries, recorded, seed)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    ports = []
+    for _ in range(hosts):
+        site = web.TCPSite(runner, "127.0.0.1", 0, backlog=4096)
+        await site.start()
+        ports.append(runner.addresses[-1][1])
+    ready.put((ports, [kind for kind, _ in behaviours]))
+    while not stop.is_set():
+        await asyncio.sleep(0.2)
+    await runner.cleanup()
+
+
+def _server_process(
+    hosts, feeds, profile, entries, recorded_dir, seed, ready, stop
+) -> None:
+    recorded = load_recorded(recorded_dir) if recorded_dir else None
+    asyncio.run(_serve(hosts, feeds, profile, entries, recorded, seed, ready, stop))
+
+
+class FixtureServer:
+    """Runs the fixture app in a child process, so it does not skew the client's CPU/RSS numbers."""
+
+    def __init__(
+        self,
+        feeds: int,
+        profile: str = "realistic",
+        entries: int = 20,
+        hosts: int = 32,
+        recorded_dir: Optional[str] = None,
+        seed: int = 1,
+    ):
+        self.feeds = feeds
+        self.hosts = min(hosts, feeds)
+        self.args = (self.hosts, feeds, PROFILES[profile], entries, recorded_dir, seed)
+        self.ports: List[int] = []
+        self.kinds: List[str] = []
+        self._proc: Optional[multiprocessing.Process] = None
+
+    def __enter__(self) -> "FixtureServer":
+        ctx = multiprocessing.get_context("spawn")
+        ready, self._stop = ctx.Queue(), ctx.Event()
+        self._proc = ctx.Process(
+            target=_server_process, args=(*self.args, ready, self._stop), daemon=True
+        )
+        self._proc.start()
+        self.ports, self.kinds = ready.get(timeout=60)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._proc.join(timeout=10)
+        if self._proc.is_alive():
+            self._proc.kill()
+
+    def feed_configs(self) -> List[Dict]:
+        """RSS_FEEDS-shaped entries; feed i is served from port i % hosts."""
+        regions = ("local", "continental", "international")
+        return [
+            {
+                "url": f"http://127.0.0.1:{self.ports[i % len(self.ports)]}/feed/{i}",
+                "source": f"Fixture {i}",
+                "category": "General",
+                "region": regions[i % 3],
+            }
+            for i in range(self.feeds)
+        ]
+
+
+async def record(directory: str) -> None:
+    """Save the current body of every configured RSS feed (one-off; needs network)."""
+    from lib.http_client import close_ingest_session, get_ingest_session
+    from services.news_service import RSS_FEEDS
+
+    os.makedirs(directory, exist_ok=True)
+    session = get_ingest_session()
+
+    async def one(i: int, feed: Dict) -> bool:
+        try:
+            async with session.get(feed["url"]) as resp:
+                if resp.status != 200:
+                    return False
+                with open(os.path.join(directory, f"{i:03d}.xml"), "wb") as f:
+                    f.write(await resp.read())
+                return True
+        except Exception:
+            return False
+
+    ok = await asyncio.gather(*(one(i, f) for i, f in enumerate(RSS_FEEDS)))
+    await close_ingest_session()
+    print(f"recorded {sum(ok)}/{len(RSS_FEEDS)} feeds into {directory}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--record", metavar="DIR", help="save real feed bodies to DIR and exit"
+    )
+    ap.add_argument("--feeds", type=int, default=40)
+    ap.add_argument("--hosts", type=int, default=32)
+    ap.add_argument("--entries", type=int, default=20)
+    ap.add_argument("--profile", choices=sorted(PROFILES), default="realistic")
+    ap.add_argument(
+        "--recorded", metavar="DIR", help="replay bodies recorded with --record"
+    )
+    args = ap.parse_args()
+    if args.record:
+        asyncio.run(record(args.record))
+        return
+    with FixtureServer(
+        args.feeds, args.profile, args.entries, args.hosts, args.recorded
+    ) as server:
+        print(
+            f"serving {args.feeds} feeds on ports {server.ports[0]}..{server.ports[-1]} (Ctrl-C to stop)"
+        )
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
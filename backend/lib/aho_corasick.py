@@ -0,0 +1,84 @@
+"""
+Aho-Corasick multi-pattern matcher: every keyword set is compiled into one automaton,
+so classifying a text is a single pass regardless of how many keywords there are.
+
+Matching is case-insensitive and word-aware: a match must start at a word boundary,
+and patterns of `short_len` characters or fewer must also end at one (so "ai" does not
+match "said", while the stem "sport" still matches "sports").
+"""
+
+from collections import deque
+from typing import Dict, Hashable, Iterator, List, Tuple
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum()
+
+
+class Automaton:
+    def __init__(self, short_len: int = 3):
+        self.short_len = short_len
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Hashable]]] = [[]]  # (pattern length, value)
+        self._built = False
+
+    def add(self, pattern: str, value: Hashable) -> None:
+        node = 0
+        for ch in pattern.lower():
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), value))
+        self._built = False
+
+    def build(self) -> "Automaton":
+        """Compute failure links (BFS) and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            self._fail[child] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, Hashable]]:
+        """Yield (start index, value) for every word-aware match in `text`."""
+        if not self._built:
+            self.build()
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in out[node]:
+                start = i - length + 1
+                if start > 0 and _is_word(text[start - 1]) and _is_word(text[start]):
+                    continue
+                if (
+                    length <= self.short_len
+                    and i + 1 < n
+                    and _is_word(text[i + 1])
+                    and _is_word(ch)
+                ):
+                    continue
+                yield start, value
+
+    def values(self, text: str) -> set:
+        """Distinct values matched anywhere in `text`."""
+        return {value for _, value in self.iter_matches(text)}
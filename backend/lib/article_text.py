@@ -0,0 +1,164 @@
+"""
+Readable-text extraction from article HTML, stdlib only (html.parser), so it runs in the
+feed-parse worker processes without extra imports.
+
+Heuristic (a small readability): collect the text of every <p> (and <h2>/<h3>/<li>
+directly under the same block), skipping script/style/nav/header/footer/aside/form and
+elements whose class or id marks them as chrome (share bars, related links, comments).
+Paragraphs are grouped by their parent element; the parent holding the most paragraph
+text is the article body. Returns plain paragraphs separated by blank lines.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+_SKIP_TAGS = {
+    "script",
+    "style",
+    "noscript",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "form",
+    "svg",
+    "figure",
+    "iframe",
+    "button",
+}
+_VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "source",
+    "track",
+    "wbr",
+}
+_TEXT_TAGS = {"p", "h2", "h3", "li", "blockquote"}
+_CHROME_RE = re.compile(
+    r"comment|share|social|related|promo|newsletter|subscribe|sidebar|advert|\bad-|cookie|breadcrumb|footer|menu",
+    re.I,
+)
+_WS_RE = re.compile(r"\s+")
+# Paragraphs shorter than this are usually captions, bylines or buttons
+MIN_PARAGRAPH_CHARS = 40
+MAX_TEXT_CHARS = 20000
+
+
+class _Extractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._stack: List[Tuple[str, int]] = []  # (tag, node id)
+        self._next_id = 0
+        self._skip_depth = 0  # >0 while inside a skipped subtree
+        self._text: Optional[List[str]] = None
+        self._text_parent = 0
+        self._text_tag = ""
+        self.blocks: Dict[int, List[Tuple[str, str]]] = (
+            {}
+        )  # parent node id -> [(tag, text)]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+        if tag in ("p", "li") and self._text_tag == tag and self._text is not None:
+            self.handle_endtag(
+                tag
+            )  # an unclosed <p>/<li> ends where the next one starts
+        self._next_id += 1
+        self._stack.append((tag, self._next_id))
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        marker = " ".join(v or "" for k, v in attrs if k in ("class", "id", "role"))
+        if tag in _SKIP_TAGS or (
+            marker
+            and _CHROME_RE.search(marker)
+            and tag not in ("body", "article", "main")
+        ):
+            self._skip_depth = 1
+            return
+        if tag in _TEXT_TAGS and self._text is None:
+            self._text = []
+            self._text_tag = tag
+            self._text_parent = self._stack[-2][1] if len(self._stack) > 1 else 0
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS or not any(t == tag for t, _ in self._stack):
+            return  # stray end tag
+        while self._stack:
+            open_tag, _ = self._stack.pop()
+            if self._skip_depth:
+                self._skip_depth -= 1
+            elif self._text is not None and open_tag == self._text_tag:
+                self._close_text()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._text is not None and not self._skip_depth:
+            self._text.append(data)
+
+    def _close_text(self):
+        text = _WS_RE.sub(" ", "".join(self._text)).strip()
+        self._text = None
+        if text:
+            self.blocks.setdefault(self._text_parent, []).append((self._text_tag, text))
+
+    def close(self):
+        super().close()
+        if self._text is not None:
+            self._close_text()
+
+
+def _block_score(parts: List[Tuple[str, str]]) -> int:
+    return sum(
+        len(text)
+        for tag, text in parts
+        if tag == "p" and len(text) >= MIN_PARAGRAPH_CHARS
+    )
+
+
+def extract_article_text(
+    html: bytes, encoding: Optional[str] = None, max_chars: int = MAX_TEXT_CHARS
+) -> str:
+    """Main readable text of an article page ("" when nothing article-like is found)."""
+    if isinstance(html, bytes):
+        try:
+            doc = html.decode(encoding or "utf-8", errors="replace")
+        except LookupError:  # unknown charset label
+            doc = html.decode("utf-8", errors="replace")
+    else:
+        doc = html
+    parser = _Extractor()
+    try:
+        parser.feed(doc)
+        parser.close()
+    except (
+        Exception
+    ):  # html.parser is lenient; anything raised here means unusable markup
+        return ""
+    if not parser.blocks:
+        return ""
+    best = max(parser.blocks.values(), key=_block_score)
+    if not _block_score(best):
+        return ""
+    paragraphs = [
+        text for tag, text in best if tag != "p" or len(text) >= MIN_PARAGRAPH_CHARS
+    ]
+    out: List[str] = []
+    size = 0
+    for text in paragraphs:
+        if size + len(text) > max_chars:
+            break
+        out.append(text)
+        size += len(text) + 2
+    return "\n\n".join(out)
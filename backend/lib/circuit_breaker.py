@@ -0,0 +1,112 @@
+"""
+Per-key circuit breakers for upstream hosts (one key per feed).
+closed -> open after `failure_threshold` consecutive failures; while open, calls are
+skipped until a backoff (exponential per trip, with jitter) expires; then one call is
+let through half-open: success closes the circuit, failure re-opens it for longer.
+Each key also gets a latency budget derived from its recent successful latencies.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+@dataclass
+class BreakerState:
+    state: str = CLOSED
+    failures: int = 0  # consecutive
+    trips: int = 0  # consecutive openings, drives the backoff exponent
+    open_until: float = 0.0
+    probing: bool = False
+    latency_ewma_ms: Optional[float] = None
+    skipped: int = 0
+
+
+class CircuitBreakers:
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_backoff: float = 60.0,
+        max_backoff: float = 1800.0,
+        jitter: float = 0.2,
+        budget_factor: float = 3.0,
+        min_budget: float = 2.0,
+        max_budget: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget_factor = budget_factor
+        self.min_budget = min_budget
+        self.max_budget = max_budget
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._states: Dict[str, BreakerState] = {}
+
+    def get(self, key: str) -> BreakerState:
+        st = self._states.get(key)
+        if st is None:
+            st = self._states[key] = BreakerState()
+        return st
+
+    def allow(self, key: str) -> bool:
+        """Whether a call to `key` may go out now (an open circuit past its backoff admits one probe)."""
+        st = self.get(key)
+        if st.state == CLOSED:
+            return True
+        if st.state == OPEN and self._clock() >= st.open_until:
+            st.state, st.probing = HALF_OPEN, True
+            return True
+        st.skipped += 1
+        return False
+
+    def budget(self, key: str) -> float:
+        """Timeout (seconds) for the next call: a multiple of the usual latency, within bounds."""
+        ewma = self.get(key).latency_ewma_ms
+        if ewma is None:
+            return self.max_budget
+        return min(
+            self.max_budget, max(self.min_budget, self.budget_factor * ewma / 1000)
+        )
+
+    def record(self, key: str, ok: bool, latency_ms: Optional[float] = None) -> None:
+        st = self.get(key)
+        if ok:
+            if latency_ms is not None and latency_ms >= 0:
+                previous = st.latency_ewma_ms
+                st.latency_ewma_ms = (
+                    latency_ms
+                    if previous is None
+                    else 0.7 * previous + 0.3 * latency_ms
+                )
+            st.state, st.failures, st.trips, st.probing = CLOSED, 0, 0, False
+            return
+        st.failures += 1
+        if st.state == HALF_OPEN or st.failures >= self.failure_threshold:
+            self._open(st)
+
+    def _open(self, st: BreakerState) -> None:
+        backoff = min(self.max_backoff, self.base_backoff * (2**st.trips))
+        backoff *= 1 + self._rng.uniform(-self.jitter, self.jitter)
+        st.state, st.probing = OPEN, False
+        st.trips += 1
+        st.open_until = self._clock() + backoff
+
+    def status(self, key: str) -> Dict:
+        st = self.get(key)
+        out = {
+            "state": st.state,
+            "failures": st.failures,
+            "trips": st.trips,
+            "skipped": st.skipped,
+            "budget_s": round(self.budget(key), 2),
+        }
+        if st.state == OPEN:
+            out["retry_in_s"] = max(0, round(st.open_until - self._clock()))
+        return out
@@ -0,0 +1,121 @@
+"""
+Size-bounded on-disk LRU of immutable blobs (used for proxied images).
+
+One file per key under a two-level fan-out (ab/abcdef...). Recency lives in an in-memory
+OrderedDict, rebuilt from file mtimes on open; hits bump the mtime so the order survives
+restarts. Writes go to a temp file and are os.replace()d into place, so readers never see
+a partial blob. When the total size passes `max_bytes`, least recently used files are
+deleted. Blocking file I/O: call from a worker thread.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(*parts: str) -> str:
+    return hashlib.blake2b("\x00".join(parts).encode(), digest_size=16).hexdigest()
+
+
+class DiskLRU:
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = (
+            OrderedDict()
+        )  # key -> size, oldest first
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _load(self) -> None:
+        found = []
+        for sub in os.listdir(self.directory):
+            sub_path = os.path.join(self.directory, sub)
+            if not os.path.isdir(sub_path):
+                continue
+            for name in os.listdir(sub_path):
+                path = os.path.join(sub_path, name)
+                if name.endswith(".tmp"):  # left behind by a crash mid-write
+                    os.remove(path)
+                    continue
+                st = os.stat(path)
+                found.append((st.st_mtime, name, st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._size += size
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            with self._lock:
+                self._size -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        with self._lock:
+            self._size += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,279 @@
+"""
+Off-loop RSS/Atom parsing. `parse_feed_bytes` runs inside a worker process (or thread)
+and returns compact item tuples; the event loop only attaches feed-level fields.
+Kept free of app imports so spawned workers start cheaply.
+
+Two engines: a streaming pull parser (xml.etree XMLPullParser) that stops after the
+first N entries and reads only the fields the app uses, and feedparser as the fallback
+for anything it cannot handle (HTML entities, broken markup, exotic formats).
+"""
+
+import os
+import re
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import xml.etree.ElementTree as ET
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Tuple
+
+import feedparser
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for feed parsing; 0 = parse in a thread pool instead
+FEED_PARSE_WORKERS = int(
+    os.environ.get("FEED_PARSE_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+# "stream" (pull parser, feedparser fallback) or "feedparser"
+FEED_PARSER_ENGINE = os.environ.get("FEED_PARSER_ENGINE", "stream")
+# Stop downloading a feed body after this many bytes
+FEED_MAX_BYTES = int(os.environ.get("FEED_MAX_BYTES", str(2 * 1024 * 1024)))
+MAX_ENTRIES = 15
+
+# (id, title, summary, source_url, image_url, published, tags)
+ItemRow = Tuple[
+    str, str, str, Optional[str], Optional[str], Optional[str], Tuple[str, ...]
+]
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_FEED_ROOTS = {"rss", "RDF", "feed"}
+_ENTRY_TAGS = {"item", "entry"}
+_ENTRY_CLOSE = (b"</item>", b"</entry>")
+_MEDIA_NS = "{http://search.yahoo.com/mrss/}"
+_DATE_TAGS = {"pubDate", "published", "date", "issued"}
+_CHUNK = 64 * 1024
+
+
+def _make_row(link, title, summary, image_url, published, tags) -> ItemRow:
+    item_id = hashlib.md5(f"{link or ''}{title or ''}".encode()).hexdigest()[:12]
+    if title is None:
+        title = "Untitled"
+    summary = (summary or "")[:500]
+    if "<" in summary:
+        summary = _TAG_RE.sub("", summary)
+    return (item_id, title[:200], summary, link, image_url, published, tuple(tags[:5]))
+
+
+# ── feedparser engine ─────────────────────────────────────────────────
+
+
+def _feedparser_rows(content: bytes, max_entries: int) -> List[ItemRow]:
+    parsed = feedparser.parse(content)
+    rows = []
+    for entry in parsed.entries[:max_entries]:
+        published = None
+        if entry.get("published_parsed"):
+            try:
+                published = datetime(*entry.published_parsed[:6]).isoformat()
+            except (TypeError, ValueError):
+                pass
+
+        image_url = None
+        if entry.get("media_content"):
+            image_url = entry.media_content[0].get("url")
+        elif entry.get("enclosures"):
+            for enc in entry.enclosures:
+                if enc.get("type", "").startswith("image"):
+                    image_url = enc.get("href")
+                    break
+
+        rows.append(
+            _make_row(
+                entry.get("link"),
+                entry.get("title"),
+                entry.get("summary", entry.get("description", "")),
+                image_url,
+                published,
+                [t.get("term", "") for t in entry.get("tags", [])],
+            )
+        )
+    return rows
+
+
+# ── streaming engine ──────────────────────────────────────────────────
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_date(text: str) -> Optional[str]:
+    """RFC 822 (RSS) or ISO 8601 (Atom, dc:date) -> naive UTC ISO string, like feedparser."""
+    if not text:
+        return None
+    try:
+        dt = parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.replace(microsecond=0).isoformat()
+
+
+def _entry_row(elem: ET.Element) -> ItemRow:
+    title = link = summary = content = published = enclosure = None
+    tags = []
+    for child in elem:
+        name = _local(child.tag)
+        if name == "title":
+            title = (child.text or "").strip()
+        elif name == "link":
+            href = child.get("href")
+            if href is None:
+                link = link or (child.text or "").strip()
+            elif child.get("rel", "alternate") == "alternate":
+                link = link or href
+            elif child.get("rel") == "enclosure" and child.get("type", "").startswith(
+                "image"
+            ):
+                enclosure = enclosure or href
+        elif name in ("description", "summary"):
+            if summary is None:
+                summary = (child.text or "").strip()
+        elif name in ("encoded", "content") and not child.tag.startswith(_MEDIA_NS):
+            content = content or (child.text or "").strip()
+        elif name in _DATE_TAGS:
+            published = published or _parse_date((child.text or "").strip())
+        elif name == "enclosure":
+            if enclosure is None and child.get("type", "").startswith("image"):
+                enclosure = child.get("url")
+        elif name == "category":
+            tags.append(child.get("term") or (child.text or "").strip())
+
+    image_url = None
+    for node in elem.iter(_MEDIA_NS + "content"):
+        image_url = node.get("url")
+        break
+    return _make_row(
+        link,
+        title,
+        summary if summary is not None else content,
+        image_url or enclosure,
+        published,
+        tags,
+    )
+
+
+def _stream_rows(content: bytes, max_entries: int) -> Optional[List[ItemRow]]:
+    """Pull-parse entries, stopping after `max_entries`. None means "use feedparser"."""
+    parser = ET.XMLPullParser(events=("start", "end"))
+    rows: List[ItemRow] = []
+    root_ok = False
+    try:
+        for offset in range(0, len(content), _CHUNK):
+            parser.feed(content[offset : offset + _CHUNK])
+            for event, elem in parser.read_events():
+                if event == "start":
+                    if not root_ok:
+                        if _local(elem.tag) not in _FEED_ROOTS:
+                            return None
+                        root_ok = True
+                    continue
+                if _local(elem.tag) in _ENTRY_TAGS:
+                    rows.append(_entry_row(elem))
+                    elem.clear()
+                    if len(rows) >= max_entries:
+                        return rows
+    except ET.ParseError:
+        # Malformed mid-body (e.g. an undeclared HTML entity): feedparser copes, so let it
+        return None
+    try:
+        parser.close()
+    except ET.ParseError:
+        # Every byte parsed but the document is unfinished (cut at the byte cap): keep the entries read
+        return rows or None
+    return rows if root_ok else None
+
+
+def parse_feed_bytes(content: bytes, max_entries: int = MAX_ENTRIES) -> List[ItemRow]:
+    """Parse a raw feed body and normalize its first entries (runs in a worker)."""
+    if FEED_PARSER_ENGINE == "stream":
+        rows = _stream_rows(content, max_entries)
+        if rows is not None:
+            return rows
+    return _feedparser_rows(content, max_entries)
+
+
+async def read_feed_body(
+    response, max_entries: int = MAX_ENTRIES, max_bytes: int = FEED_MAX_BYTES
+) -> Tuple[bytes, bool]:
+    """Read a feed response incrementally; stop after `max_entries` closed entries or `max_bytes`.
+
+    Returns (body, truncated). Only the bytes needed for the first entries are buffered.
+    """
+    chunks = []
+    total = 0
+    closed = 0
+    tail = b""
+    async for chunk in response.content.iter_chunked(_CHUNK):
+        chunks.append(chunk)
+        total += len(chunk)
+        window = tail + chunk
+        closed += sum(window.count(t) - tail.count(t) for t in _ENTRY_CLOSE)
+        tail = window[-8:]
+        if closed >= max_entries or total >= max_bytes:
+            return b"".join(chunks)[:max_bytes], True
+    return b"".join(chunks), False
+
+
+_executor: Optional[Executor] = None
+
+
+def _thread_executor() -> Executor:
+    return ThreadPoolExecutor(
+        max_workers=max(1, FEED_PARSE_WORKERS or 2), thread_name_prefix="feed-parse"
+    )
+
+
+def get_parse_executor() -> Executor:
+    """Process pool sized by FEED_PARSE_WORKERS; thread pool if disabled or unavailable."""
+    global _executor
+    if _executor is None:
+        if FEED_PARSE_WORKERS > 0:
+            try:
+                _executor = ProcessPoolExecutor(
+                    max_workers=FEED_PARSE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, NotImplementedError, ValueError) as e:
+                logger.warning(
+                    "[FeedParser] Process pool unavailable (%s); using threads", e
+                )
+        if _executor is None:
+            _executor = _thread_executor()
+    return _executor
+
+
+async def run_in_parse_executor(fn, *args):
+    """Run a CPU-bound, picklable top-level function in the parse worker pool."""
+    global _executor
+    loop = asyncio.get_running_loop()
+    executor = get_parse_executor()
+    try:
+        return await loop.run_in_executor(executor, fn, *args)
+    except BrokenProcessPool:
+        if _executor is executor:
+            logger.warning("[FeedParser] Process pool broke; falling back to threads")
+            _executor = _thread_executor()
+        return await loop.run_in_executor(_executor, fn, *args)
+
+
+async def parse_feed(content: bytes, max_entries: int = MAX_ENTRIES) -> List[ItemRow]:
+    """Parse a feed body off the event loop."""
+    return await run_in_parse_executor(parse_feed_bytes, content, max_entries)
+
+
+def shutdown_parse_executor() -> None:
+    """Stop parse workers (app shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
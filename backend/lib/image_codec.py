@@ -0,0 +1,178 @@
+"""
+Image resizing, re-encoding and placeholders for the /api/img proxy (Pillow + numpy).
+Runs inside the parse worker processes, so it is kept free of app imports.
+
+`prepare_image` decodes a fetched original once into a stored master (the largest width
+bucket, high-quality WebP) plus its placeholder. `render_variant` downsizes to a width
+bucket (never upscales) and encodes it as WebP, AVIF or JPEG. Placeholders are a BlurHash
+string and the dominant colour, computed from a tiny thumbnail.
+"""
+
+import io
+import math
+from typing import Dict, Tuple
+
+import numpy as np
+from PIL import Image, ImageOps, features
+
+# Originals larger than this (decoded pixels) are rejected rather than decoded
+MAX_SOURCE_PIXELS = 40_000_000
+
+FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "avif": ("AVIF", "image/avif"),
+    "jpeg": ("JPEG", "image/jpeg"),
+}
+
+
+def supported_formats() -> Tuple[str, ...]:
+    return tuple(f for f in FORMATS if f == "jpeg" or features.check(f))
+
+
+def _open(data: bytes, target: Tuple[int, int]) -> Tuple[Image.Image, Tuple[int, int]]:
+    """(decoded image, original size); JPEGs are decoded at a reduced scale when `target` allows."""
+    img = Image.open(io.BytesIO(data))
+    size = img.size
+    if size[0] * size[1] > MAX_SOURCE_PIXELS:
+        raise ValueError(f"image too large ({size[0]}x{size[1]})")
+    img.draft("RGB", target)
+    img = ImageOps.exif_transpose(img)
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert(
+            "RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB"
+        )
+    return img, size
+
+
+def _encode(img: Image.Image, width: int, fmt: str, quality: int) -> bytes:
+    pil_format = FORMATS[fmt][0]
+    if img.width > width:
+        img = img.resize(
+            (width, max(1, round(img.height * width / img.width))),
+            Image.Resampling.LANCZOS,
+        )
+    if pil_format == "JPEG" and img.mode == "RGBA":
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        img = background
+    out = io.BytesIO()
+    options = {"quality": quality}
+    if pil_format == "WEBP":
+        options["method"] = 4
+    elif pil_format == "JPEG":
+        options.update(optimize=True, progressive=True)
+    img.save(out, pil_format, **options)
+    return out.getvalue()
+
+
+def render_variant(
+    data: bytes, width: int, fmt: str, quality: int = 70
+) -> Tuple[bytes, int, int]:
+    """(encoded bytes, width, height) of `data` scaled down to at most `width` pixels wide."""
+    img, size = _open(data, (width, width * 4))
+    scale = min(1.0, width / size[0])
+    return (
+        _encode(img, width, fmt, quality),
+        round(size[0] * scale),
+        max(1, round(size[1] * scale)),
+    )
+
+
+def prepare_image(
+    data: bytes, master_width: int, quality: int = 90
+) -> Tuple[bytes, Dict]:
+    """(master bytes, placeholder) from one decode of a fetched original."""
+    img, size = _open(data, (master_width, master_width * 4))
+    placeholder = _placeholder(img, size)
+    fmt = "webp" if "webp" in supported_formats() else "jpeg"
+    return _encode(img, master_width, fmt, quality), placeholder
+
+
+# ── BlurHash (https://blurha.sh) ──
+
+_B83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _base83(value: int, length: int) -> str:
+    return "".join(_B83[(value // 83 ** (length - i - 1)) % 83] for i in range(length))
+
+
+def _to_linear(channel: np.ndarray) -> np.ndarray:
+    v = channel / 255.0
+    return np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+
+def _to_srgb(value: float) -> int:
+    v = min(max(value, 0.0), 1.0)
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(pixels: np.ndarray, x_components: int = 4, y_components: int = 3) -> str:
+    """BlurHash of an (h, w, 3) uint8 RGB array."""
+    height, width = pixels.shape[:2]
+    linear = _to_linear(pixels[:, :, :3].astype(np.float64))
+    xs, ys = np.arange(width), np.arange(height)
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            basis = np.outer(
+                np.cos(math.pi * j * ys / height), np.cos(math.pi * i * xs / width)
+            )
+            norm = 1.0 if i == j == 0 else 2.0
+            factors.append(
+                (linear * basis[:, :, None]).sum(axis=(0, 1)) * norm / (width * height)
+            )
+    dc, ac = factors[0], factors[1:]
+    out = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        actual_max = float(np.abs(np.array(ac)).max())
+        quantised_max = int(max(0, min(82, math.floor(actual_max * 166 - 0.5))))
+        max_value = (quantised_max + 1) / 166
+    else:
+        quantised_max, max_value = 0, 1.0
+    out += _base83(quantised_max, 1)
+    out += _base83(
+        (_to_srgb(dc[0]) << 16) + (_to_srgb(dc[1]) << 8) + _to_srgb(dc[2]), 4
+    )
+    for factor in ac:
+        q = [
+            int(
+                max(
+                    0,
+                    min(
+                        18,
+                        math.floor(
+                            math.copysign(abs(c / max_value) ** 0.5, c) * 9 + 9.5
+                        ),
+                    ),
+                )
+            )
+            for c in factor
+        ]
+        out += _base83(q[0] * 19 * 19 + q[1] * 19 + q[2], 2)
+    return out
+
+
+def image_placeholder(data: bytes) -> Dict:
+    """BlurHash, dominant colour (#rrggbb) and original size of an image."""
+    return _placeholder(*_open(data, (64, 64)))
+
+
+def _placeholder(img: Image.Image, size: Tuple[int, int]) -> Dict:
+    thumb = img.convert("RGB")
+    thumb.thumbnail((32, 32))
+    pixels = np.asarray(thumb)
+    # Dominant colour: the most common bucket of a 5-colour palette
+    quantized = thumb.quantize(colors=5)
+    counts = sorted(quantized.getcolors() or [], reverse=True)
+    palette = quantized.getpalette()
+    index = counts[0][1] if counts else 0
+    r, g, b = palette[index * 3 : index * 3 + 3]
+    return {
+        "blurhash": blurhash(pixels),
+        "color": f"#{r:02x}{g:02x}{b:02x}",
+        "width": size[0],
+        "height": size[1],
+    }
@@ -0,0 +1,117 @@
+"""
+MinHash signatures and LSH banding for near-duplicate text detection.
+Shingles are word unigrams + bigrams (stopwords dropped); signatures are NUM_PERM
+32-bit minimums of universal hashes, so the fraction of equal positions estimates
+Jaccard similarity. LSH files signatures that agree on a whole band in the same bucket,
+so near-duplicates of a new signature are found without comparing it to every other.
+"""
+
+import re
+import zlib
+from typing import Dict, Hashable, Iterable, List, Set
+
+import numpy as np
+
+NUM_PERM = 128
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, (1 << 61) - 1, NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, (1 << 61) - 1, NUM_PERM, dtype=np.uint64)
+_EMPTY = np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    (
+        "a an and are as at be by for from has have in is it its of on or "
+        "said says that the this to was were will with"
+    ).split()
+)
+
+
+def shingles(text: str) -> Set[str]:
+    tokens = [
+        t
+        for t in _TOKEN_RE.findall((text or "").lower())
+        if t not in _STOPWORDS and len(t) > 1
+    ]
+    out = set(tokens)
+    out.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return out
+
+
+def signature(shingle_set: Iterable[str]) -> np.ndarray:
+    values = list(shingle_set)
+    if not values:
+        return _EMPTY
+    hv = np.fromiter(
+        (zlib.crc32(s.encode()) for s in values), dtype=np.uint64, count=len(values)
+    )
+    # uint64 products wrap; that is fine for hashing (same scheme as datasketch)
+    hashed = ((np.outer(hv, _A) + _B) % _MERSENNE) & _MAX_HASH
+    return hashed.min(axis=0)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class LSHIndex:
+    """LSH buckets that take one signature at a time (rows per band = NUM_PERM // bands).
+
+    `add` files a key under each of its band buckets and returns the keys already there,
+    so a new signature is compared only with its candidates, never with the whole set.
+    A singleton bucket holds the key itself; only shared buckets get a list.
+    """
+
+    def __init__(self, bands: int = 64, max_bucket: int = 50):
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.max_bucket = max_bucket
+        self._buckets: List[Dict[int, object]] = [{} for _ in range(bands)]
+        self._bucket_ids: Dict[Hashable, List[int]] = {}
+
+    def _band_ids(self, sig: np.ndarray) -> List[int]:
+        banded = sig[: self.bands * self.rows].reshape(self.bands, self.rows)
+        # Fold each band's rows into one 64-bit bucket id
+        ids = banded[:, 0].copy()
+        for r in range(1, self.rows):
+            ids = (ids * np.uint64(0x100000001B3)) ^ banded[:, r]
+        return ids.tolist()
+
+    def add(self, key: Hashable, sig: np.ndarray) -> Set[Hashable]:
+        """Index `key`; returns indexed keys sharing at least one band (up to max_bucket per band)."""
+        self.remove(key)
+        if sig is _EMPTY:
+            return set()
+        ids = self._band_ids(sig)
+        self._bucket_ids[key] = ids
+        found: Set[Hashable] = set()
+        for bucket, bucket_id in zip(self._buckets, ids):
+            held = bucket.get(bucket_id)
+            if held is None:
+                bucket[bucket_id] = key
+            elif isinstance(held, list):
+                found.update(held[: self.max_bucket])
+                held.append(key)
+            else:
+                found.add(held)
+                bucket[bucket_id] = [held, key]
+        return found
+
+    def remove(self, key: Hashable) -> None:
+        ids = self._bucket_ids.pop(key, None)
+        if ids is None:
+            return
+        for bucket, bucket_id in zip(self._buckets, ids):
+            held = bucket.get(bucket_id)
+            if isinstance(held, list):
+                held.remove(key)
+                if len(held) == 1:
+                    bucket[bucket_id] = held[0]
+            elif held == key:
+                del bucket[bucket_id]
+
+    def __len__(self) -> int:
+        return len(self._bucket_ids)
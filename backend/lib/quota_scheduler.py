@@ -0,0 +1,248 @@
+"""
+Spreads each provider's daily request quota over refreshes of cached upstream queries.
+
+Every tracked query has a popularity: its request count, halved every `popularity_half_life`
+seconds. A provider's quota is shared between its queries in proportion to popularity, so a
+query refreshes every quota-share-th of a day (clamped to [min_interval, max_interval]);
+pinned queries (the default feeds) always get at least `pinned_share`. Whatever the shares
+add up to, calls are metered by a token bucket refilling at quota/day and capped per UTC day,
+so a burst of new queries waits for tokens instead of spending the day's quota.
+Pure bookkeeping: the caller fetches what `take_due` hands out.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, List, Optional
+
+DAY = 86400.0
+
+
+@dataclass
+class TrackedQuery:
+    provider: str
+    pinned: bool = False
+    popularity: float = 0.0  # decayed request count as of `popularity_at`
+    popularity_at: float = 0.0
+    last_fetched: Optional[float] = None
+    fetches: int = 0
+
+
+@dataclass
+class ProviderQuota:
+    daily_quota: int
+    burst: float
+    tokens: float
+    tokens_at: float
+    day: str = ""
+    used_today: int = 0
+    keys: Dict[Hashable, None] = field(default_factory=dict)
+
+
+class QuotaScheduler:
+    def __init__(
+        self,
+        daily_quotas: Dict[str, int],
+        min_interval: float = 600.0,
+        max_interval: float = DAY,
+        popularity_half_life: float = 3600.0,
+        pinned_share: float = 0.5,
+        max_queries: int = 200,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.decay = math.log(2) / popularity_half_life
+        self.pinned_share = pinned_share
+        self.max_queries = max_queries
+        self._clock = clock
+        now = clock()
+        self._providers: Dict[str, ProviderQuota] = {}
+        for provider, quota in daily_quotas.items():
+            burst = max(1.0, quota / 48)  # about half an hour of quota
+            self._providers[provider] = ProviderQuota(quota, burst, burst, now)
+        self._queries: Dict[Hashable, TrackedQuery] = {}
+
+    # ── Queries ──
+
+    def track(
+        self, key: Hashable, provider: str, pinned: bool = False
+    ) -> List[Hashable]:
+        """Start scheduling `key`; returns keys evicted to stay within `max_queries` (least popular first)."""
+        query = self._queries.get(key)
+        if query is not None:
+            query.pinned = query.pinned or pinned
+            return []
+        self._queries[key] = TrackedQuery(provider, pinned, popularity_at=self._clock())
+        self._providers[provider].keys[key] = None
+        evicted = []
+        if len(self._queries) > self.max_queries:
+            now = self._clock()
+            unpinned = sorted(
+                (k for k, q in self._queries.items() if not q.pinned and k != key),
+                key=lambda k: self.popularity(k, now),
+            )
+            for k in unpinned[: len(self._queries) - self.max_queries]:
+                self.forget(k)
+                evicted.append(k)
+        return evicted
+
+    def forget(self, key: Hashable) -> None:
+        query = self._queries.pop(key, None)
+        if query is not None:
+            self._providers[query.provider].keys.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._queries
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._queries)
+
+    def requested(self, key: Hashable) -> None:
+        """Count one request for a tracked query (raises its share of the quota)."""
+        query = self._queries[key]
+        now = self._clock()
+        query.popularity = self.popularity(key, now) + 1
+        query.popularity_at = now
+
+    def popularity(self, key: Hashable, now: Optional[float] = None) -> float:
+        query = self._queries[key]
+        now = self._clock() if now is None else now
+        return query.popularity * math.exp(
+            -self.decay * max(0.0, now - query.popularity_at)
+        )
+
+    def _totals(self, now: float) -> Dict[str, float]:
+        """Summed popularity per provider (computed once per pass, not per query)."""
+        totals = dict.fromkeys(self._providers, 0.0)
+        for key, query in self._queries.items():
+            totals[query.provider] += self.popularity(key, now)
+        return totals
+
+    def interval(
+        self,
+        key: Hashable,
+        now: Optional[float] = None,
+        totals: Optional[Dict[str, float]] = None,
+    ) -> float:
+        """Seconds between refreshes of `key` given its current share of the provider's quota."""
+        now = self._clock() if now is None else now
+        query = self._queries[key]
+        quota = self._providers[query.provider]
+        if quota.daily_quota <= 0:
+            return self.max_interval
+        total = (totals or self._totals(now))[query.provider]
+        share = self.popularity(key, now) / total if total > 0 else 1 / len(quota.keys)
+        if query.pinned:
+            share = max(share, self.pinned_share)
+        if share <= 0:
+            return self.max_interval
+        return min(
+            self.max_interval, max(self.min_interval, DAY / (quota.daily_quota * share))
+        )
+
+    def due_in(
+        self,
+        key: Hashable,
+        now: Optional[float] = None,
+        totals: Optional[Dict[str, float]] = None,
+    ) -> float:
+        """Seconds until `key` is due for a refresh (0 when it never was fetched)."""
+        now = self._clock() if now is None else now
+        query = self._queries[key]
+        if query.last_fetched is None:
+            return 0.0
+        return max(0.0, query.last_fetched + self.interval(key, now, totals) - now)
+
+    def eta(self, key: Hashable) -> float:
+        """Seconds until `key` will next be refreshed: when it is due and its provider has quota."""
+        now = self._clock()
+        return max(
+            self.due_in(key, now), self._token_wait(self._queries[key].provider, now)
+        )
+
+    def fetched(self, key: Hashable, at: Optional[float] = None) -> None:
+        query = self._queries.get(key)
+        if query is not None:
+            query.last_fetched = self._clock() if at is None else at
+            query.fetches += 1
+
+    # ── Quota ──
+
+    def _refill(self, quota: ProviderQuota, now: float) -> None:
+        day = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+        if day != quota.day:
+            quota.day, quota.used_today = day, 0
+        quota.tokens = min(
+            quota.burst,
+            quota.tokens + (now - quota.tokens_at) * quota.daily_quota / DAY,
+        )
+        quota.tokens_at = now
+
+    def _token_wait(self, provider: str, now: float) -> float:
+        quota = self._providers[provider]
+        self._refill(quota, now)
+        if quota.daily_quota <= 0:
+            return DAY
+        if quota.used_today >= quota.daily_quota:
+            midnight = datetime.fromtimestamp(now, timezone.utc).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+            return max(
+                midnight.timestamp() + DAY - now,
+                (1 - quota.tokens) * DAY / quota.daily_quota,
+            )
+        return max(0.0, (1 - quota.tokens) * DAY / quota.daily_quota)
+
+    def take_due(self) -> List[Hashable]:
+        """Due queries that quota allows now (pinned, then most popular first); each one taken spends one call."""
+        now = self._clock()
+        totals = self._totals(now)
+        due = [k for k in self._queries if self.due_in(k, now, totals) == 0]
+        due.sort(key=lambda k: (not self._queries[k].pinned, -self.popularity(k, now)))
+        taken = []
+        for key in due:
+            provider = self._queries[key].provider
+            if self._token_wait(provider, now) > 0:
+                continue
+            quota = self._providers[provider]
+            quota.tokens -= 1
+            quota.used_today += 1
+            taken.append(key)
+        return taken
+
+    def next_wakeup(self) -> float:
+        """Seconds until some query can be refreshed (max_interval when nothing is tracked)."""
+        now = self._clock()
+        totals = self._totals(now)
+        waits = [
+            max(self.due_in(k, now, totals), self._token_wait(q.provider, now))
+            for k, q in self._queries.items()
+        ]
+        return min(waits, default=self.max_interval)
+
+    def restore_usage(self, provider: str, day: str, used: int) -> None:
+        """Carry today's call count over a restart, so the daily cap still holds."""
+        quota = self._providers.get(provider)
+        if quota is not None:
+            self._refill(quota, self._clock())
+            if day == quota.day:
+                quota.used_today = max(quota.used_today, used)
+
+    def usage(self) -> Dict[str, Dict]:
+        now = self._clock()
+        out = {}
+        for provider, quota in self._providers.items():
+            self._refill(quota, now)
+            out[provider] = {
+                "daily_quota": quota.daily_quota,
+                "day": quota.day,
+                "used_today": quota.used_today,
+                "tokens": round(quota.tokens, 2),
+                "queries": len(quota.keys),
+            }
+        return out
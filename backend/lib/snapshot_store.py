@@ -0,0 +1,127 @@
+"""
+On-disk cache snapshots for warm restarts. One file per snapshot name:
+
+    magic "NRVS" | format version (1 byte) | codec (1 byte) | payload length (4) | crc32 (4) | payload
+
+The payload is compact JSON, zstd-compressed (zlib when zstandard is unavailable).
+Writes go to a temp file in the same directory, are fsynced, then os.replace()d over the
+old file, so a crash mid-write leaves the previous snapshot intact. A file with a bad
+header, checksum or format version is ignored rather than loaded.
+"""
+
+import os
+import json
+import zlib
+import struct
+import logging
+import tempfile
+from collections.abc import Mapping
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # optional: fall back to zlib
+    zstandard = None
+
+_MAGIC = b"NRVS"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct(">4sBBII")
+_CODEC_ZLIB = 1
+_CODEC_ZSTD = 2
+
+
+def _compress(raw: bytes) -> tuple:
+    if zstandard is not None:
+        return _CODEC_ZSTD, zstandard.ZstdCompressor(level=6).compress(raw)
+    return _CODEC_ZLIB, zlib.compress(raw, 6)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == _CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd snapshot but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == _CODEC_ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"unknown codec {codec}")
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Mapping):  # read-only snapshot items
+        return dict(obj)
+    return str(obj)
+
+
+def encode_snapshot(obj: Any) -> bytes:
+    """Serialize to JSON (call on the event loop, where the cached dicts are not being mutated)."""
+    return json.dumps(
+        obj, separators=(",", ":"), ensure_ascii=False, default=_default
+    ).encode()
+
+
+def write_snapshot(path: str, raw: bytes) -> int:
+    """Compress `raw` (from encode_snapshot) and atomically replace `path`. Returns bytes written."""
+    codec, payload = _compress(raw)
+    header = _HEADER.pack(
+        _MAGIC, FORMAT_VERSION, codec, len(payload), zlib.crc32(payload)
+    )
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass  # directory fsync is not supported everywhere
+    return _HEADER.size + len(payload)
+
+
+def read_snapshot(path: str) -> Optional[Any]:
+    """Load a snapshot written by write_snapshot; None if missing, corrupt or another format version."""
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning("[SnapshotStore] Cannot read %s: %s", path, e)
+        return None
+    try:
+        if len(blob) < _HEADER.size:
+            raise ValueError("truncated header")
+        magic, version, codec, length, crc = _HEADER.unpack_from(blob)
+        if magic != _MAGIC:
+            raise ValueError("bad magic")
+        if version != FORMAT_VERSION:
+            logger.info(
+                "[SnapshotStore] Ignoring %s: format v%s (expected v%s)",
+                path,
+                version,
+                FORMAT_VERSION,
+            )
+            return None
+        payload = blob[_HEADER.size :]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            raise ValueError("checksum mismatch")
+        return json.loads(_decompress(codec, payload))
+    except Exception as e:
+        logger.warning("[SnapshotStore] Ignoring corrupt snapshot %s: %s", path, e)
+        return None
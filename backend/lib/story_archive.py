@@ -0,0 +1,295 @@
+"""
+Append-only, day-partitioned story archive on disk.
+
+Each UTC day (by published time) has two files:
+  YYYY-MM-DD.seg  records: 4-byte big-endian length + UTF-8 JSON, appended only
+  YYYY-MM-DD.idx  fixed 24-byte entries (id hash, offset, length, published epoch)
+Segments are read through read-only mmaps, so record bytes stay in the page cache
+rather than the Python heap. The in-memory id index is a sorted numpy array of
+(id hash, day, offset, length): 24 bytes per story, with a small dict for recent
+appends that is merged in periodically.
+
+Single writer: one process appends (the API process running the archiver task).
+Reads may come from several threads; mmaps are swapped and sliced under a lock.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from datetime import date, datetime, timezone
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_LEN = struct.Struct(">I")
+INDEX_DTYPE = np.dtype(
+    [("key", "<u8"), ("offset", "<u8"), ("length", "<u4"), ("ts", "<u4")]
+)
+_LOOKUP_DTYPE = np.dtype(
+    [("key", "<u8"), ("day", "<u4"), ("offset", "<u8"), ("length", "<u4")]
+)
+# Recent appends are merged into the sorted lookup array once this many accumulate
+_MERGE_AFTER = 4096
+
+
+def story_key(story_id: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(story_id.encode(), digest_size=8).digest(), "little"
+    )
+
+
+def published_ts(item: Mapping, default: float) -> float:
+    published = item.get("published")
+    if published:
+        try:
+            dt = datetime.fromisoformat(str(published).replace("Z", "+00:00"))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.timestamp()
+        except ValueError:
+            pass
+    return default
+
+
+def _json_default(obj):
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+class StoryArchive:
+    def __init__(self, directory: str, retention_days: int = 0):
+        self.directory = directory
+        self.retention_days = retention_days
+        self._lookup = np.zeros(0, dtype=_LOOKUP_DTYPE)
+        # key -> (day ordinal, offset, length)
+        self._recent: Dict[int, Tuple[int, int, int]] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._lock = threading.Lock()  # guards _maps: a remap closes the old mmap
+        self.appended = 0
+        os.makedirs(directory, exist_ok=True)
+        self.prune()
+        self._load_index()
+
+    # ── paths / days ──
+
+    def _path(self, day: int, ext: str) -> str:
+        return os.path.join(
+            self.directory, f"{date.fromordinal(day).isoformat()}.{ext}"
+        )
+
+    def days(self) -> List[int]:
+        out = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".idx"):
+                try:
+                    out.append(date.fromisoformat(name[:-4]).toordinal())
+                except ValueError:
+                    continue
+        return sorted(out)
+
+    def _read_index(self, day: int) -> np.ndarray:
+        path = self._path(day, "idx")
+        entries = np.fromfile(
+            path, dtype=INDEX_DTYPE, count=os.path.getsize(path) // INDEX_DTYPE.itemsize
+        )
+        # Drop entries a crash left pointing past the end of the segment
+        seg_size = (
+            os.path.getsize(self._path(day, "seg"))
+            if os.path.exists(self._path(day, "seg"))
+            else 0
+        )
+        return entries[entries["offset"] + entries["length"] <= seg_size]
+
+    def prune(self) -> int:
+        """Delete day segments older than `retention_days`; returns how many days were removed."""
+        if self.retention_days <= 0:
+            return 0
+        cutoff = datetime.now(timezone.utc).date().toordinal() - self.retention_days
+        expired = [day for day in self.days() if day < cutoff]
+        if not expired:
+            return 0
+        with self._lock:
+            for day in expired:
+                m = self._maps.pop(day, None)
+                if m is not None:
+                    m.close()
+                for ext in ("seg", "idx"):
+                    try:
+                        os.remove(self._path(day, ext))
+                    except FileNotFoundError:
+                        pass
+                logger.info(
+                    "[Archive] Pruned segment %s", date.fromordinal(day).isoformat()
+                )
+        self._lookup = self._lookup[self._lookup["day"] >= cutoff]
+        for key, (day, _, _) in list(self._recent.items()):
+            if day < cutoff:
+                self._recent.pop(key, None)
+        return len(expired)
+
+    def _load_index(self) -> None:
+        parts = []
+        for day in self.days():
+            entries = self._read_index(day)
+            part = np.empty(len(entries), dtype=_LOOKUP_DTYPE)
+            part["key"], part["offset"], part["length"] = (
+                entries["key"],
+                entries["offset"],
+                entries["length"],
+            )
+            part["day"] = day
+            parts.append(part)
+        lookup = np.concatenate(parts) if parts else np.zeros(0, dtype=_LOOKUP_DTYPE)
+        self._lookup = lookup[np.argsort(lookup["key"], kind="stable")]
+
+    def _merge_recent(self) -> None:
+        recent = np.array(
+            [(k, d, o, n) for k, (d, o, n) in self._recent.items()], dtype=_LOOKUP_DTYPE
+        )
+        lookup = np.concatenate([self._lookup, recent])
+        self._lookup = lookup[np.argsort(lookup["key"], kind="stable")]
+        self._recent.clear()
+
+    def __len__(self) -> int:
+        return len(self._lookup) + len(self._recent)
+
+    def __contains__(self, story_id: str) -> bool:
+        return self._locate(story_key(story_id)) is not None
+
+    def _locate(self, key: int) -> Optional[Tuple[int, int, int]]:
+        hit = self._recent.get(key)
+        if hit is not None:
+            return hit
+        lookup = self._lookup  # one array even if a merge or prune swaps it meanwhile
+        i = int(np.searchsorted(lookup["key"], np.uint64(key)))
+        if i < len(lookup) and int(lookup["key"][i]) == key:
+            row = lookup[i]
+            return int(row["day"]), int(row["offset"]), int(row["length"])
+        return None
+
+    # ── writes ──
+
+    def append(self, items: List[Mapping], now: Optional[float] = None) -> int:
+        """Archive stories not already present; returns how many were written."""
+        now = now if now is not None else datetime.now(timezone.utc).timestamp()
+        written = 0
+        handles: Dict[int, tuple] = {}  # day -> (seg, idx), open for this batch only
+        try:
+            written = self._append(items, now, handles)
+        finally:
+            for seg, idx in handles.values():
+                seg.close()
+                idx.close()
+        if len(self._recent) >= _MERGE_AFTER:
+            self._merge_recent()
+        self.appended += written
+        return written
+
+    def _append(
+        self, items: List[Mapping], now: float, handles: Dict[int, tuple]
+    ) -> int:
+        written = 0
+        for item in items:
+            story_id = item.get("id")
+            if not story_id:
+                continue
+            key = story_key(story_id)
+            if self._locate(key) is not None:
+                continue
+            ts = published_ts(item, now)
+            day = datetime.fromtimestamp(ts, timezone.utc).date().toordinal()
+            payload = json.dumps(
+                item, default=_json_default, ensure_ascii=False
+            ).encode()
+            if day not in handles:
+                handles[day] = (
+                    open(self._path(day, "seg"), "ab"),
+                    open(self._path(day, "idx"), "ab"),
+                )
+            seg, idx = handles[day]
+            offset = seg.seek(0, os.SEEK_END) + _LEN.size
+            seg.write(_LEN.pack(len(payload)) + payload)
+            entry = np.array(
+                [(key, offset, len(payload), int(max(ts, 0)))], dtype=INDEX_DTYPE
+            )
+            seg.flush()  # record bytes reach the file before the index points at them
+            idx.write(entry.tobytes())
+            self._recent[key] = (day, offset, len(payload))
+            written += 1
+        return written
+
+    def close(self) -> None:
+        with self._lock:
+            for m in self._maps.values():
+                m.close()
+            self._maps.clear()
+
+    # ── reads ──
+
+    def _map(self, day: int, end: int) -> Optional[mmap.mmap]:
+        """The day's segment mapped to at least `end` bytes (caller holds the lock)."""
+        m = self._maps.get(day)
+        if m is None or len(m) < end:
+            if m is not None:
+                m.close()
+            path = self._path(day, "seg")
+            if not os.path.exists(path) or os.path.getsize(path) < end:
+                return None
+            with open(path, "rb") as f:
+                m = self._maps[day] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return m
+
+    def _read(self, day: int, offset: int, length: int) -> Optional[Dict]:
+        with self._lock:
+            m = self._map(day, offset + length)
+            if m is None:
+                return None
+            record = m[offset : offset + length]
+        try:
+            return json.loads(record)
+        except ValueError:
+            return None
+
+    def get(self, story_id: str) -> Optional[Dict]:
+        hit = self._locate(story_key(story_id))
+        if hit is None:
+            return None
+        item = self._read(*hit)
+        return item if item is not None and item.get("id") == story_id else None
+
+    def iter_range(self, start: date, end: date) -> Iterator[Dict]:
+        """Stories published between `start` and `end` (inclusive), newest first, one day at a time."""
+        lo, hi = start.toordinal(), end.toordinal()
+        for day in reversed(self.days()):
+            if day < lo or day > hi:
+                continue
+            entries = self._read_index(day)
+            for e in entries[
+                np.argsort(-entries["ts"].astype(np.int64), kind="stable")
+            ]:
+                item = self._read(day, int(e["offset"]), int(e["length"]))
+                if item is not None:
+                    yield item
+
+    def stats(self) -> Dict:
+        days = self.days()
+        paths = [self._path(d, ext) for d in days for ext in ("seg", "idx")]
+        size = sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+        return {
+            "stories": len(self),
+            "segments": len(days),
+            "first_day": date.fromordinal(days[0]).isoformat() if days else None,
+            "last_day": date.fromordinal(days[-1]).isoformat() if days else None,
+            "bytes_on_disk": size,
+            "index_bytes_in_memory": int(self._lookup.nbytes) + len(self._recent) * 64,
+            "appended_this_process": self.appended,
+        }
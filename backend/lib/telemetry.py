@@ -0,0 +1,88 @@
+"""
+Fixed-size ring buffers of per-key metric samples, with percentile summaries.
+Each key (e.g. a feed) gets a preallocated numpy array of `capacity` rows; new samples
+overwrite the oldest, so memory is bounded and recording is O(1).
+"""
+
+import time
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class RingBuffer:
+    """Fixed-capacity ring of float rows (one column per metric); oldest rows are overwritten."""
+
+    def __init__(self, capacity: int, width: int):
+        self._data = np.zeros((capacity, width), dtype=np.float64)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._data.shape[0]
+
+    def append(self, row: Sequence[float]) -> None:
+        self._data[self._next] = row
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def values(self) -> np.ndarray:
+        """Filled rows, oldest first (a copy)."""
+        if self._size < self.capacity:
+            return self._data[: self._size].copy()
+        return np.roll(self._data, -self._next, axis=0)
+
+
+class MetricRings:
+    """One RingBuffer per key for a fixed set of metric names."""
+
+    def __init__(self, metrics: Iterable[str], capacity: int = 256):
+        self.metrics = tuple(metrics)
+        self.capacity = capacity
+        self._rings: Dict[str, RingBuffer] = {}
+        self._last_at: Dict[str, float] = {}
+        self.recorded = 0
+
+    def record(self, key: str, sample: Mapping[str, float]) -> None:
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = RingBuffer(self.capacity, len(self.metrics))
+        ring.append([float(sample.get(m) or 0) for m in self.metrics])
+        self._last_at[key] = time.time()
+        self.recorded += 1
+
+    def keys(self) -> List[str]:
+        return list(self._rings)
+
+    def summary(self, key: str) -> Dict:
+        """Sample count plus p50/p95/p99/max and total per metric for one key."""
+        ring = self._rings.get(key)
+        if ring is None or not len(ring):
+            return {"samples": 0}
+        values = ring.values()
+        pcts = np.percentile(values, PERCENTILES, axis=0)
+        out = {"samples": len(ring), "last_at": self._last_at.get(key)}
+        for i, name in enumerate(self.metrics):
+            column = {
+                f"p{p}": round(float(pcts[j, i]), 1) for j, p in enumerate(PERCENTILES)
+            }
+            column["max"] = round(float(values[:, i].max()), 1)
+            column["sum"] = round(float(values[:, i].sum()), 1)
+            out[name] = column
+        return out
+
+    def histogram(self, key: str, metric: str, edges: Sequence[float]) -> List[int]:
+        """Counts of `metric` samples per bucket (<= edges[0], ..., > edges[-1])."""
+        ring = self._rings.get(key)
+        if ring is None or not len(ring):
+            return [0] * (len(edges) + 1)
+        column = ring.values()[:, self.metrics.index(metric)]
+        return np.bincount(
+            np.searchsorted(edges, column, side="left"), minlength=len(edges) + 1
+        ).tolist()
@@ -0,0 +1,135 @@
+# Compact, read-only cache records for stories and podcast episodes
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+_MISSING = object()
+_intern = sys.intern
+
+
+def _interned(value: Any) -> Any:
+    return _intern(value) if type(value) is str else value
+
+
+def _interned_tags(tags: Any) -> Tuple[str, ...]:
+    return tuple(_intern(t) if type(t) is str else t for t in (tags or ()))
+
+
+class Record(Mapping):
+    """Immutable `__slots__` record that reads like the dict it replaces.
+
+    Only keys that were set are present, so JSON output keeps each source's original shape.
+    Enum-like fields (`_INTERNED`) share one string object across all records; `to_dict()`
+    materializes a plain dict at the response edge. Keys outside `_FIELDS` go into `_extra`.
+    """
+
+    __slots__ = ("_extra",)
+    _FIELDS: Tuple[str, ...] = ()
+    _KEYS: frozenset = frozenset()
+    _INTERNED: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._KEYS = frozenset(cls._FIELDS)
+
+    def __init__(self, data: Optional[Mapping] = None, **fields):
+        setattr_ = object.__setattr__
+        if data:
+            fields = {**data, **fields}
+        for name in self._FIELDS:
+            value = fields.pop(name, _MISSING)
+            if name in self._INTERNED:
+                value = _interned(value)
+            elif name == "tags" and value is not _MISSING:
+                value = _interned_tags(value)
+            setattr_(self, name, value)
+        setattr_(self, "_extra", tuple(fields.items()) if fields else ())
+
+    @classmethod
+    def from_mapping(cls, data: Mapping) -> "Record":
+        return data if isinstance(data, cls) else cls(data)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._KEYS:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        else:
+            for k, v in self._extra:
+                if k == key:
+                    return v
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._FIELDS:
+            if getattr(self, name) is not _MISSING:
+                yield name
+        for k, _ in self._extra:
+            yield k
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._KEYS:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        for k, v in self._extra:
+            if k == key:
+                return v
+        return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (type(self), (self.to_dict(),))
+
+
+class Article(Record):
+    """A news story (RSS or aggregator) in the shared caches."""
+
+    __slots__ = (
+        "id",
+        "title",
+        "summary",
+        "narrative",
+        "source",
+        "source_url",
+        "image_url",
+        "published",
+        "category",
+        "region",
+        "truth_score",
+        "audio_url",
+        "listen_count",
+        "tags",
+        "aggregator",
+        "is_breaking",
+    )
+    _FIELDS = __slots__
+    _INTERNED = frozenset({"source", "category", "region", "aggregator"})
+
+
+class Episode(Record):
+    """A podcast episode in the podcast cache."""
+
+    __slots__ = (
+        "id",
+        "episode",
+        "title",
+        "duration",
+        "description",
+        "category",
+        "published",
+        "audio_url",
+        "source",
+    )
+    _FIELDS = __slots__
+    _INTERNED = frozenset({"category", "source"})
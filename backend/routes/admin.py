@@ -12,6 +12,7 @@ from services.admin_service import (
     get_curation_stories,
     perform_curation_action
 )
+from services.news_service import get_ingest_telemetry
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -34,6 +35,12 @@ async def stream_status():
     return get_stream_status()
 
 
+@router.get("/ingest/telemetry")
+async def ingest_telemetry():
+    """Per-feed fetch/parse timing percentiles and item counts from recent ingestion runs"""
+    return get_ingest_telemetry()
+
+
 @router.get("/voices")
 async def voice_metrics():
     """Get voice synthesis metrics"""
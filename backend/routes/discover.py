@@ -4,6 +4,8 @@ from fastapi.responses import StreamingResponse
 from typing import List
 import httpx
 
+from services.news_service import get_news_snapshot
+from services.trending_service import get_trending_terms
 from services.podcast_service import get_podcasts, get_podcast_by_id, get_podcast_audio_url, search_podcasts
 from services.radio_service import get_countries, get_stations
 
@@ -67,18 +69,18 @@ async def stream_podcast_audio(podcast_id: str):
 
 
 @router.get("/discover/trending")
-async def get_trending_topics():
-    """Get trending topics from news analysis"""
-    # In production, this would analyze real news data
-    trending = [
-        {"topic": "ELECTION_2027", "count": "2.4K", "trend": "up", "category": "Politics"},
-        {"topic": "NAIRA_FOREX", "count": "1.8K", "trend": "up", "category": "Economy"},
-        {"topic": "TECH_STARTUPS", "count": "1.2K", "trend": "stable", "category": "Technology"},
-        {"topic": "AFCON_2025", "count": "980", "trend": "up", "category": "Sports"},
-        {"topic": "CLIMATE_SAHEL", "count": "756", "trend": "down", "category": "Environment"},
-        {"topic": "HEALTH_INITIATIVE", "count": "654", "trend": "stable", "category": "Health"},
+async def get_trending_topics(limit: int = Query(8, ge=1, le=50)):
+    """Get trending topics from news analysis (fastest-rising headline terms)."""
+    await get_news_snapshot()
+    return [
+        {
+            "topic": t["term"].upper().replace(" ", "_"),
+            "count": t["count"],
+            "trend": t["trend"],
+            "velocity": t["velocity"],
+        }
+        for t in get_trending_terms(limit)
     ]
-    return trending
 
 
 @router.get("/radio/countries")
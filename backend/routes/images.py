@@ -0,0 +1,56 @@
+# Image routes - resized, re-encoded story images and station logos
+import hashlib
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import RedirectResponse
+
+from services.image_service import (
+    choose_format,
+    choose_width,
+    get_image_variant,
+    is_known_image,
+)
+
+router = APIRouter(prefix="/api", tags=["images"])
+
+# Variants are keyed by URL, width and format, so a response never changes
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+@router.get("/img")
+async def get_image(
+    request: Request,
+    url: str = Query(
+        ..., description="Original image URL (story image_url or station favicon)"
+    ),
+    w: Optional[int] = Query(
+        None, ge=1, le=4096, description="Display width; rounded up to a width bucket"
+    ),
+    fmt: Optional[str] = Query(
+        None, description="webp, avif or jpeg; default from the Accept header"
+    ),
+):
+    """Proxy an image resized to a width bucket as WebP/AVIF, fetched once and cached on disk.
+
+    Only URLs the app has served (story images, station logos) are proxied; others are 404.
+    A registered image that cannot be fetched or decoded redirects to the original.
+    """
+    if not url.startswith(("http://", "https://")):
+        raise HTTPException(status_code=400, detail="url must be http(s)")
+    if not is_known_image(url):
+        raise HTTPException(status_code=404, detail="Unknown image")
+    fmt_chosen = choose_format(request.headers.get("accept", ""), fmt)
+    width = choose_width(w)
+    result = await get_image_variant(url, width, fmt_chosen)
+    if result is None:
+        return RedirectResponse(
+            url, status_code=302, headers={"Cache-Control": "no-store"}
+        )
+    body, media_type = result
+    etag = f'"{width}-{fmt_chosen}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"Cache-Control": IMMUTABLE, "ETag": etag}
+    if fmt is None:
+        headers["Vary"] = "Accept"
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
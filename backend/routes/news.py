@@ -1,21 +1,51 @@
 # News API — single RSS source via services.news_service
+import asyncio
+import heapq
 import logging
+from datetime import date
+from itertools import islice
 from typing import Optional
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Request, Response
 
 from services.news_service import (
-    get_cached_all_news,
-    get_breaking_news_list,
+    find_story,
+    get_news_snapshot,
+    get_news_snapshot_status,
+    get_news_view,
+    get_news_view_versions,
+    get_story_enrichment,
+    set_story_enrichment,
 )
+from services.archive_service import list_archived_stories
+from services.fulltext_service import get_full_text, narrative_source
+from services.headline_service import localize_items
+from services.image_service import get_image_placeholder, with_image_placeholders
+from services.ranking_service import get_top_stories
 from services.narrative_service import generate_narrative
+from services.cluster_service import get_cluster_key, get_story_clusters
+from services.translation_service import SUPPORTED_LANGUAGES
 from lib.text_utils import sanitize_ai_text
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["news"])
 
 
+def _set_snapshot_headers(response: Response, snap) -> None:
+    response.headers["X-Snapshot-Version"] = str(snap.version)
+    response.headers["X-Snapshot-Age"] = str(int(snap.age_seconds))
+
+
+def view_response(request: Request, view) -> Response:
+    """Serve a materialized view's pre-encoded body, or 304 when the client already has it."""
+    headers = {"ETag": view.etag, "X-View-Version": str(view.version), "Cache-Control": "no-cache"}
+    if view.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=view.body, media_type="application/json", headers=headers)
+
+
 @router.get("/news")
 async def get_news(
+    response: Response,
     region: Optional[str] = Query(None, description="Filter by region"),
     category: Optional[str] = Query(None, description="Filter by category"),
     limit: int = Query(20, le=50, description="Number of items to return"),
@@ -23,55 +53,139 @@ async def get_news(
     aggregator_sources: Optional[str] = Query(
         None, description="Comma-separated aggregator sources: mediastack,newsdata"
     ),
+    lang: Optional[str] = Query(None, description="Headline language (en, pcm, yo, ha, ig); pre-translated"),
 ):
-    """Fetch aggregated news from RSS (single source) and optional aggregator APIs."""
-    all_news = await get_cached_all_news()
+    """Fetch aggregated news from RSS (single source) and optional aggregator APIs.
+
+    With `lang`, titles and summaries already translated in the background are served in that
+    language (with `original_title`); stories not translated yet are served in English.
+    """
+    if lang and lang not in SUPPORTED_LANGUAGES:
+        raise HTTPException(status_code=400, detail=f"Unsupported language: {lang}")
+    snap = await get_news_snapshot()
+    _set_snapshot_headers(response, snap)
+    news = snap.view(region, category)
 
     if include_aggregators:
         try:
-            from services.aggregator_service import get_normalized_aggregator_news
+            from services.aggregator_service import get_aggregator_view
             sources_list = aggregator_sources.split(",") if aggregator_sources else None
-            agg_news = await get_normalized_aggregator_news(sources=sources_list)
-            all_news = list(all_news) + list(agg_news)
+            agg_news = get_aggregator_view(sources_list, region, category)
+            if agg_news:
+                merged = heapq.merge(news, agg_news, key=lambda x: x.get("published") or "", reverse=True)
+                news = list(islice(merged, limit))
         except Exception as e:
             logger.error("[News] Aggregator fetch error: %s", e)
 
-    if region:
-        all_news = [n for n in all_news if n.get("region", "").lower() == region.lower()]
-    if category:
-        all_news = [n for n in all_news if n.get("category", "").lower() == category.lower()]
+    page = news[:limit]
+    if lang and lang != "en":
+        response.headers["Content-Language"] = lang
+        page = localize_items(page, lang)
+    return with_image_placeholders(page)
+
+
+@router.get("/news/top")
+async def get_news_top(
+    response: Response,
+    region: Optional[str] = Query(None, description="Filter by region"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    limit: int = Query(20, ge=1, le=50, description="Number of items to return"),
+):
+    """Top stories by precomputed score (recency, source authority, cross-source coverage, breaking, listens)."""
+    snap = await get_news_snapshot()
+    _set_snapshot_headers(response, snap)
+    return with_image_placeholders(await get_top_stories(limit, region, category))
+
 
-    all_news.sort(key=lambda x: x.get("published", ""), reverse=True)
-    return all_news[:limit]
+@router.get("/news/status")
+async def get_news_status():
+    """Version, age and refresh state of the served news snapshot."""
+    return get_news_snapshot_status()
+
+
+@router.get("/news/clusters")
+async def get_news_clusters(
+    region: Optional[str] = Query(None, description="Filter by the lead story's region"),
+    category: Optional[str] = Query(None, description="Filter by the lead story's category"),
+    min_size: int = Query(1, ge=1, description="Only clusters reported by at least this many stories"),
+    limit: int = Query(20, ge=1, le=50, description="Number of clusters to return"),
+):
+    """Near-duplicate stories across RSS and aggregator sources, grouped per event."""
+    index = await get_story_clusters()
+    region_l, category_l = (region or "").lower(), (category or "").lower()
+    clusters = []
+    for cluster in index.clusters:
+        if cluster.size < min_size:
+            continue
+        if region_l and (cluster.lead.get("region") or "").lower() != region_l:
+            continue
+        if category_l and (cluster.lead.get("category") or "").lower() != category_l:
+            continue
+        clusters.append(cluster.to_dict())
+        if len(clusters) >= limit:
+            break
+    return {
+        "clusters": clusters,
+        "total_clusters": len(index.clusters),
+        "total_stories": len(index.by_item),
+        "duplication_rate": index.duplication_rate,
+    }
+
+
+@router.get("/news/archive")
+async def get_news_archive(
+    start: Optional[date] = Query(None, description="First UTC day (YYYY-MM-DD); default end - 6 days"),
+    end: Optional[date] = Query(None, description="Last UTC day (YYYY-MM-DD); default today"),
+    source: Optional[str] = Query(None, description="Filter by source"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    """Archived stories published in a date range (newest first), served from the on-disk archive."""
+    return await asyncio.to_thread(list_archived_stories, start, end, source, category, limit, offset)
+
+
+@router.get("/news/views")
+async def get_news_views():
+    """Version stamps of the materialized breaking/digest views (poll this, or use If-None-Match)."""
+    return await get_news_view_versions()
 
 
 @router.get("/news/breaking")
-async def get_breaking():
+async def get_breaking(request: Request):
     """Get breaking/urgent news stories."""
     try:
-        return await get_breaking_news_list(max_items=3)
+        view = await get_news_view("breaking")
     except Exception:
         return []
+    return view_response(request, view)
 
 
 @router.get("/news/{news_id}")
 async def get_news_detail(news_id: str):
-    """Get detailed news item with narrative."""
-    all_news = await get_cached_all_news()
-    news_item = next((n for n in all_news if n.get("id") == news_id), None)
+    """Get detailed news item with narrative (written from the prefetched article text when cached)."""
+    news_item = await find_story(news_id)
 
     if not news_item:
         raise HTTPException(status_code=404, detail="News item not found")
 
-    if not news_item.get("narrative"):
-        narrative_data = await generate_narrative(
-            f"{news_item.get('title', '')}\n\n{news_item.get('summary', '')}"
-        )
+    # Generated content is shared by every story about the same event
+    cluster_key = await get_cluster_key(news_id)
+    extra = get_story_enrichment(cluster_key)
+    if not (news_item.get("narrative") or extra.get("narrative")):
+        narrative_data = await generate_narrative(narrative_source(news_item))
         raw_narrative = narrative_data.get("narrative", news_item.get("summary", ""))
         raw_takeaways = narrative_data.get("key_takeaways", [])
-        news_item["narrative"] = sanitize_ai_text(raw_narrative)
-        news_item["key_takeaways"] = [
-            sanitize_ai_text(kt) for kt in raw_takeaways if sanitize_ai_text(kt)
-        ]
+        extra = set_story_enrichment(
+            cluster_key,
+            narrative=sanitize_ai_text(raw_narrative),
+            key_takeaways=[sanitize_ai_text(kt) for kt in raw_takeaways if sanitize_ai_text(kt)],
+        )
 
-    return news_item
+    return {
+        **news_item,
+        **extra,
+        "cluster_id": cluster_key,
+        "full_text": get_full_text(news_id),
+        "image_placeholder": get_image_placeholder(news_item.get("image_url")),
+    }
@@ -32,6 +32,7 @@ class OfflineArticleResponse(BaseModel):
     source: Optional[str] = ""
     category: Optional[str] = "General"
     image_url: Optional[str] = None
+    full_text: Optional[str] = ""
     saved_at: str
 
 
@@ -9,6 +9,9 @@ from services.translation_service import (
     translate_text,
     translate_and_narrate
 )
+from services.fulltext_service import get_full_text
+from services.cluster_service import get_cluster_key
+from services.news_service import get_story_enrichment, set_story_enrichment
 
 router = APIRouter(prefix="/api/translate", tags=["translation"])
 
@@ -23,6 +26,7 @@ class NarrateRequest(BaseModel):
     title: str
     summary: str
     target_language: str
+    story_id: Optional[str] = None  # narrate from the prefetched article text; shared per story cluster
 
 
 @router.get("/languages")
@@ -63,16 +67,27 @@ async def translate_narrate(request: NarrateRequest):
     """
     Translate news content and generate broadcast narrative in target language.
     Combines translation + narrative generation for TTS delivery.
+    With a story_id the result is generated once per story cluster and language.
     """
+    cache_key = None
+    if request.story_id:
+        cache_key = f"{await get_cluster_key(request.story_id)}:narrate:{request.target_language}"
+        cached = get_story_enrichment(cache_key)
+        if cached:
+            return cached
+
     result = await translate_and_narrate(
         title=request.title,
         summary=request.summary,
-        target_language=request.target_language
+        target_language=request.target_language,
+        full_text=get_full_text(request.story_id),
     )
     
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error", "Translation failed"))
     
+    if cache_key:
+        set_story_enrichment(cache_key, **result)
     return result
 
 
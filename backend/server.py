@@ -6,6 +6,7 @@ import asyncio
 import logging
 import uuid
 from datetime import datetime, timezone
+from itertools import chain
 from typing import List, Optional
 from dotenv import load_dotenv
 
@@ -153,6 +154,7 @@ from routes.factcheck import router as factcheck_router
 from routes.translation import router as translation_router
 from routes.news import router as news_router
 from routes.briefing import router as briefing_router
+from routes.images import router as images_router
 
 app.include_router(discover_router)
 app.include_router(offline_router)
@@ -162,6 +164,7 @@ app.include_router(factcheck_router)
 app.include_router(translation_router)
 app.include_router(news_router)
 app.include_router(briefing_router)
+app.include_router(images_router)
 
 from services.narrative_service import generate_narrative
 
@@ -169,23 +172,64 @@ from services.narrative_service import generate_narrative
 # Startup: run initial feed health check and schedule periodic refresh
 @app.on_event("startup")
 async def startup_feed_health():
-    from services.news_service import run_health_check
-    from services.aggregator_service import refresh_cache
+    from services.news_service import run_health_check, warm_news_snapshot, start_feed_scheduler
+    from services.aggregator_service import start_aggregator_scheduler
+    from services.cache_snapshot_service import load_cache_snapshot, run_cache_snapshot_saver
+    from services.archive_service import start_story_archiver
+    from services.fulltext_service import start_fulltext_prefetcher
+    from services.headline_service import start_headline_translator
+    from services.image_service import start_image_placeholders
+    from services.ranking_service import start_listen_refresher
 
     # Supabase indexes are defined in supabase_schema.sql
 
+    start_story_archiver()
+    start_fulltext_prefetcher()
+    start_headline_translator()
+    start_image_placeholders()
+    start_listen_refresher()
+    # Serve the last saved caches immediately; the warm-up below refreshes them in the background
+    await load_cache_snapshot()
+    warm_news_snapshot()
+    start_feed_scheduler()
+
     async def periodic_health_check():
+        # Ingestion records health for every feed it fetches; the pinger only covers the rest
         while True:
-            await run_health_check()
             await asyncio.sleep(300)  # Every 5 minutes
-
-    async def periodic_aggregator_refresh():
-        while True:
-            await refresh_cache()
-            await asyncio.sleep(600)  # Every 10 minutes
+            await run_health_check()
 
     asyncio.create_task(periodic_health_check())
-    asyncio.create_task(periodic_aggregator_refresh())
+    start_aggregator_scheduler()
+    asyncio.create_task(run_cache_snapshot_saver())
+
+
+@app.on_event("shutdown")
+async def shutdown_ingest_client():
+    """Stop the feed and aggregator schedulers and background workers (article prefetch, headline
+    translation, image placeholders, listen counts), save the cache snapshot and archive queue, close
+    the ingestion session and parse workers."""
+    from lib.http_client import close_ingest_session
+    from lib.feed_parser import shutdown_parse_executor
+    from services.news_service import stop_feed_scheduler
+    from services.aggregator_service import stop_aggregator_scheduler
+    from services.cache_snapshot_service import save_cache_snapshot
+    from services.archive_service import stop_story_archiver
+    from services.fulltext_service import stop_fulltext_prefetcher
+    from services.headline_service import stop_headline_translator
+    from services.image_service import stop_image_placeholders
+    from services.ranking_service import stop_listen_refresher
+
+    await stop_feed_scheduler()
+    await stop_aggregator_scheduler()
+    await stop_fulltext_prefetcher()
+    await stop_headline_translator()
+    await stop_image_placeholders()
+    await stop_listen_refresher()
+    await save_cache_snapshot()
+    await stop_story_archiver()
+    await close_ingest_session()
+    shutdown_parse_executor()
 
 
 # Initialize clients
@@ -269,6 +313,7 @@ class TTSRequest(BaseModel):
     stability: float = 0.5
     similarity_boost: float = 0.75
     language: str = "en"
+    story_id: Optional[str] = None  # audio of a story's cluster narrative is shared by the whole cluster
 
 
 class TTSResponse(BaseModel):
@@ -384,8 +429,17 @@ async def generate_tts(request: TTSRequest):
     import hashlib
     from services.yarngpt_service import generate_tts as yarn_generate_tts
 
+    basis = request.text[:200]
+    if request.story_id:
+        from services.cluster_service import get_cluster_key
+        from services.news_service import get_story_enrichment
+
+        cluster_key = await get_cluster_key(request.story_id)
+        narrative = (get_story_enrichment(cluster_key).get("narrative") or "")[:4000]
+        if narrative and request.text == narrative:
+            basis = f"cluster:{cluster_key}:{hashlib.md5(narrative.encode()).hexdigest()[:8]}"
     cache_key = hashlib.md5(
-        f"{request.text[:200]}:{request.voice_id}:{request.language}".encode()
+        f"{basis}:{request.voice_id}:{request.language}".encode()
     ).hexdigest()
 
     db = get_supabase_db()
@@ -540,12 +594,76 @@ async def get_sources_health():
     return get_feed_health()
 
 
+@app.get("/api/sources/cache-stats")
+async def get_sources_cache_stats():
+    """Get per-feed conditional GET / unchanged-body hit ratios"""
+    from services.news_service import get_feed_cache_stats
+
+    return get_feed_cache_stats()
+
+
+@app.get("/api/sources/schedule")
+async def get_sources_schedule():
+    """Get per-feed adaptive polling intervals and next poll times"""
+    from services.news_service import get_feed_schedule
+
+    return get_feed_schedule()
+
+
+@app.get("/api/sources/snapshot")
+async def get_sources_snapshot():
+    """Get on-disk warm-restart cache snapshot status"""
+    from services.cache_snapshot_service import get_cache_snapshot_status
+
+    return get_cache_snapshot_status()
+
+
+@app.get("/api/sources/archive")
+async def get_sources_archive():
+    """Get on-disk story archive status (segments, stories, index size)"""
+    from services.archive_service import get_archive_status
+
+    return await asyncio.to_thread(get_archive_status)
+
+
+@app.get("/api/sources/fulltext")
+async def get_sources_fulltext():
+    """Get article full-text prefetch status (cached bodies, fetch and extraction counts)"""
+    from services.fulltext_service import get_fulltext_status
+
+    return get_fulltext_status()
+
+
+@app.get("/api/sources/headlines")
+async def get_sources_headlines():
+    """Get headline translation status (translated stories per language, LLM calls)"""
+    from services.headline_service import get_headline_status
+
+    return get_headline_status()
+
+
+@app.get("/api/sources/images")
+async def get_sources_images():
+    """Get image proxy status (disk cache size and hit rate, placeholders, fetch counts)"""
+    from services.image_service import get_image_status
+
+    return get_image_status()
+
+
+@app.get("/api/sources/ranking")
+async def get_sources_ranking():
+    """Get top-stories ranking engine status (ranked stories, multi-source events, listen counts)"""
+    from services.ranking_service import get_ranking_status
+
+    return get_ranking_status()
+
+
 @app.post("/api/sources/health/refresh")
 async def refresh_sources_health(background_tasks: BackgroundTasks):
     """Trigger a fresh health check of all feeds"""
     from services.news_service import run_health_check
 
-    background_tasks.add_task(run_health_check)
+    background_tasks.add_task(run_health_check, force=True)
     return {"status": "started", "message": "Health check initiated"}
 
 
@@ -564,7 +682,7 @@ async def aggregators_status():
 async def fetch_aggregators(
     keywords: str = Query("Nigeria Africa", description="Search keywords"),
 ):
-    """Fetch news from all programmatic aggregators (Mediastack + NewsData.io)"""
+    """Cached news from all programmatic aggregators (Mediastack + NewsData.io), with refresh ETAs"""
     from services.aggregator_service import fetch_all_aggregators
 
     return await fetch_all_aggregators(keywords)
@@ -574,22 +692,20 @@ async def fetch_aggregators(
 async def fetch_mediastack_news(
     keywords: str = Query("Nigeria Africa"), limit: int = Query(20, ge=1, le=50)
 ):
-    """Fetch news from Mediastack API"""
-    from services.aggregator_service import fetch_mediastack
+    """Cached Mediastack results for a query (refreshed within the daily quota, never live)"""
+    from services.aggregator_service import get_cached_query
 
-    articles = await fetch_mediastack(keywords, limit)
-    return {"count": len(articles), "articles": articles}
+    return get_cached_query("mediastack", keywords, limit)
 
 
 @app.get("/api/aggregators/newsdata")
 async def fetch_newsdata_news(
     query: str = Query("Nigeria"), limit: int = Query(20, ge=1, le=50)
 ):
-    """Fetch news from NewsData.io API"""
-    from services.aggregator_service import fetch_newsdata
+    """Cached NewsData.io results for a query (refreshed within the daily quota, never live)"""
+    from services.aggregator_service import get_cached_query
 
-    articles = await fetch_newsdata(query, limit)
-    return {"count": len(articles), "articles": articles}
+    return get_cached_query("newsdata", query, limit)
 
 
 @app.get("/api/trending")
@@ -610,6 +726,14 @@ async def get_trending():
         }
 
 
+def _search_source_type(item) -> str:
+    if item.get("aggregator") and item.get("aggregator") != "podcast":
+        return "aggregator"
+    if item.get("aggregator") == "podcast" or (item.get("category") or "").lower() == "podcast":
+        return "podcast"
+    return "rss"
+
+
 @app.get("/api/search")
 async def search_news(
     q: str = Query(..., description="Search query"),
@@ -629,10 +753,10 @@ async def search_news(
         from services.news_service import get_cached_all_news
 
         query_lower = q.lower()
-        all_items = []
 
-        # 1. Fetch RSS news (single source)
-        all_items = await get_cached_all_news()
+        # 1. Fetch RSS news (single source; read-only snapshot, not copied)
+        rss_items = await get_cached_all_news()
+        all_items = []
 
         # 2. Include cached aggregator articles
         if include_aggregators:
@@ -670,7 +794,7 @@ async def search_news(
 
         # 4. Filter by search query and source_type
         filtered = []
-        for item in all_items:
+        for item in chain(rss_items, all_items):
             # Source type filter
             if source_type:
                 is_agg = bool(
@@ -711,16 +835,6 @@ async def search_news(
             if item_id and item_id in seen_ids:
                 continue
             seen_ids.add(item_id)
-            # Tag source type for frontend
-            if item.get("aggregator") and item.get("aggregator") != "podcast":
-                item["source_type"] = "aggregator"
-            elif (
-                item.get("aggregator") == "podcast"
-                or item.get("category", "").lower() == "podcast"
-            ):
-                item["source_type"] = "podcast"
-            else:
-                item["source_type"] = "rss"
             deduped.append(item)
 
         # 6. Sort: title matches first, then by date
@@ -733,7 +847,11 @@ async def search_news(
         )
 
         total = len(deduped)
-        paginated = deduped[skip : skip + limit]
+        # Tag source type for frontend (on response copies; cached items are read-only)
+        paginated = [
+            {**item, "source_type": _search_source_type(item)}
+            for item in deduped[skip : skip + limit]
+        ]
 
         return {
             "results": paginated,
@@ -903,6 +1021,9 @@ async def add_listening_history(data: dict = Body(...)):
         "played_at": datetime.now(timezone.utc).isoformat(),
     }
     db.table("listening_history").insert(entry).execute()
+    from services.ranking_service import record_listen
+
+    record_listen(entry["track_id"])
     return {"status": "ok"}
 
 
@@ -946,9 +1067,11 @@ async def get_recommendations_endpoint(
 
     result = await get_recommendations(user_id, all_news, limit=limit)
 
-    # Strip any _id fields that might have snuck in
-    for rec in result.get("recommendations", []):
-        rec.pop("_id", None)
+    # Strip any _id fields that might have snuck in (without touching cached items)
+    result["recommendations"] = [
+        {k: v for k, v in rec.items() if k != "_id"} if "_id" in rec else rec
+        for rec in result.get("recommendations", [])
+    ]
 
     return result
 
@@ -1051,26 +1174,12 @@ async def unsubscribe_push(data: dict = Body(...)):
 
 
 @app.get("/api/notifications/digest")
-async def get_daily_digest():
-    """Get daily digest content for push notification (from aggregator, not DB)."""
-    from services.news_service import fetch_all_news
+async def get_daily_digest(request: Request):
+    """Get daily digest content for push notification (materialized once per news snapshot)."""
+    from routes.news import view_response
+    from services.news_service import get_news_view
 
-    all_news = await fetch_all_news(limit=5)
-    stories = [
-        {
-            "id": s.get("id"),
-            "title": s.get("title"),
-            "category": s.get("category"),
-            "source": s.get("source"),
-        }
-        for s in all_news[:5]
-    ]
-    return {
-        "title": "NARVO DAILY DIGEST",
-        "top_stories": stories,
-        "briefing_available": True,
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-    }
+    return view_response(request, await get_news_view("digest"))
 
 
 # ===========================================
@@ -1148,6 +1257,9 @@ async def get_radio_stations(
                     )
                 )
 
+            from services.image_service import register_images
+
+            register_images(s.favicon for s in stations)  # served small through /api/img
             return stations
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Radio API timeout")
@@ -1217,36 +1329,6 @@ class PodcastEpisode(BaseModel):
     published: Optional[str] = None
 
 
-@app.get("/api/discover/trending")
-async def get_trending_topics():
-    """Get trending topics and categories for the Discover page"""
-    try:
-        from services.news_service import get_cached_all_news
-        all_news = await get_cached_all_news()
-        all_news = all_news[:80]  # enough for category counts
-
-        # Count categories
-        category_counts = {}
-        for item in all_news:
-            cat = item.get("category", "General")
-            category_counts[cat] = category_counts.get(cat, 0) + 1
-
-        trending = sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:8]
-        return [
-            {"topic": cat, "count": count, "trend": "up" if count > 2 else "stable"}
-            for cat, count in trending
-        ]
-    except Exception as e:
-        logger.warning("Trending error: %s", e)
-        return [
-            {"topic": "Politics", "count": 12, "trend": "up"},
-            {"topic": "Economy", "count": 8, "trend": "up"},
-            {"topic": "Security", "count": 6, "trend": "stable"},
-            {"topic": "Technology", "count": 5, "trend": "up"},
-            {"topic": "Health", "count": 4, "trend": "stable"},
-        ]
-
-
 # ===========================================
 # OFFLINE ENDPOINTS (Article caching)
 # ===========================================
@@ -1570,9 +1652,8 @@ async def share_page(news_id: str, request: Request):
     """
     user_agent = request.headers.get("user-agent", "")
 
-    from services.news_service import get_cached_all_news
-    all_news = await get_cached_all_news()
-    story = next((item for item in all_news if item.get("id") == news_id), None)
+    from services.news_service import find_story
+    story = await find_story(news_id)
 
     if not story:
         # Redirect to homepage if story not found
@@ -1656,9 +1737,8 @@ async def share_page(news_id: str, request: Request):
 @app.get("/api/og/{news_id}", response_class=HTMLResponse)
 async def og_image_html(news_id: str):
     """Generate an HTML page that serves as OG image preview for social sharing"""
-    from services.news_service import get_cached_all_news
-    all_news = await get_cached_all_news()
-    story = next((item for item in all_news if item.get("id") == news_id), None)
+    from services.news_service import find_story
+    story = await find_story(news_id)
 
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
@@ -6,15 +6,31 @@ import aiohttp
 import hashlib
 import time
 from datetime import datetime, timezone
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple
+
+from lib.quota_scheduler import QuotaScheduler
+from models.article import Article
+from services.classification_service import classify
+from services.image_service import register_images
+from services.snapshot_service import EvictedItems, ViewKey, build_views, view_key
 
 logger = logging.getLogger(__name__)
 
 MEDIASTACK_KEY = os.environ.get("MEDIASTACK_API_KEY", "")
 NEWSDATA_KEY = os.environ.get("NEWSDATA_API_KEY", "")
 
-# Cache with TTL
+# Cache with TTL (also the shortest refresh interval of any query)
 CACHE_TTL = 600  # 10 minutes
+# Paid upstream calls per UTC day, spread over cached queries by popularity
+MEDIASTACK_DAILY_QUOTA = int(os.environ.get("MEDIASTACK_DAILY_QUOTA", "300"))
+NEWSDATA_DAILY_QUOTA = int(os.environ.get("NEWSDATA_DAILY_QUOTA", "200"))
+# Distinct queries kept (least popular dropped first)
+AGGREGATOR_MAX_QUERIES = int(os.environ.get("AGGREGATOR_MAX_QUERIES", "200"))
+# The default feed queries: their results are the cache merged into /api/news
+DEFAULT_QUERIES = {"mediastack": ("Nigeria Africa", 20), "newsdata": ("Nigeria", 10)}
+# Limits a query is fetched with (NewsData's free plan caps at 10)
+QUERY_LIMIT_BUCKETS = {"mediastack": (20, 50), "newsdata": (10,)}
+SCHEDULER_MIN_SLEEP = 5.0
 _aggregator_cache: Dict = {
     "mediastack": [],
     "newsdata": [],
@@ -22,6 +38,23 @@ _aggregator_cache: Dict = {
     "last_fetched_ts": 0,
 }
 _refresh_lock = False
+_refresh_task: Optional[asyncio.Task] = None
+# id -> normalized item, rebuilt only when the cached article lists are replaced
+_item_index: Dict[str, Dict] = {}
+_index_sources: Tuple = (None, None)
+_index_version = 0
+_evicted_items = EvictedItems(500)
+# sources filter -> {(region, category) -> newest-first normalized items}; reset with the index
+_views: Dict[Optional[frozenset], Dict[ViewKey, Sequence[Dict]]] = {}
+# (provider, normalized keywords, limit bucket) -> {"articles", "fetched_at"}
+_query_results: Dict[Tuple[str, str, int], Dict] = {}
+_scheduler = QuotaScheduler(
+    {"mediastack": MEDIASTACK_DAILY_QUOTA, "newsdata": NEWSDATA_DAILY_QUOTA},
+    min_interval=CACHE_TTL, max_queries=AGGREGATOR_MAX_QUERIES,
+)
+_scheduler_task: Optional[asyncio.Task] = None
+_wakeup: Optional[asyncio.Event] = None
+_stats = {"upstream_calls": 0, "cache_hits": 0, "cache_misses": 0}
 
 
 def _cache_is_stale() -> bool:
@@ -113,50 +146,182 @@ async def fetch_newsdata(query: str = "Nigeria", limit: int = 10) -> List[Dict]:
     return []
 
 
+# ── Per-query cache, refreshed within each provider's daily quota ──
+
+def normalize_keywords(keywords: Optional[str]) -> str:
+    """Cache key form of a keyword query: lower-case, de-duplicated, order-independent words."""
+    words = (keywords or "").lower().replace(",", " ").replace("+", " ").split()
+    return " ".join(sorted(set(words)))
+
+
+def query_key(provider: str, keywords: Optional[str], limit: int) -> Tuple[str, str, int]:
+    """(provider, normalized keywords, limit bucket); smaller limits are served from the bucket above."""
+    buckets = QUERY_LIMIT_BUCKETS[provider]
+    bucket = next((b for b in buckets if b >= limit), buckets[-1])
+    return provider, normalize_keywords(keywords) or normalize_keywords(DEFAULT_QUERIES[provider][0]), bucket
+
+
+def _default_key(provider: str) -> Tuple[str, str, int]:
+    return query_key(provider, *DEFAULT_QUERIES[provider])
+
+
+def _configured(provider: str) -> bool:
+    return bool(MEDIASTACK_KEY if provider == "mediastack" else NEWSDATA_KEY)
+
+
+def _track(key: Tuple[str, str, int], pinned: bool = False) -> None:
+    for evicted in _scheduler.track(key, key[0], pinned):
+        _query_results.pop(evicted, None)
+
+
+def _track_defaults() -> None:
+    for provider in DEFAULT_QUERIES:
+        if _configured(provider):
+            _track(_default_key(provider), pinned=True)
+
+
+def _cached_entry(key: Tuple[str, str, int]) -> Optional[Dict]:
+    entry = _query_results.get(key)
+    if entry is None and key == _default_key(key[0]) and _aggregator_cache[key[0]]:
+        # The default feed, restored from the cache snapshot before its first refresh
+        entry = {"articles": _aggregator_cache[key[0]], "fetched_at": _aggregator_cache["last_fetched"]}
+    return entry
+
+
+async def _refresh_query(key: Tuple[str, str, int]) -> int:
+    provider, keywords, limit = key
+    fetch = fetch_mediastack if provider == "mediastack" else fetch_newsdata
+    articles = await fetch(keywords, limit)
+    _scheduler.fetched(key)
+    _stats["upstream_calls"] += 1
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    if not articles and _cached_entry(key) is not None:
+        return 0  # upstream error or quota exhausted: keep serving the last results
+    _query_results[key] = {"articles": articles, "fetched_at": fetched_at}
+    if key == _default_key(provider):
+        _aggregator_cache[provider] = articles
+        _aggregator_cache["last_fetched"] = fetched_at
+        _aggregator_cache["last_fetched_ts"] = time.monotonic()
+    return len(articles)
+
+
 async def refresh_cache() -> Dict:
-    """Refresh the aggregator cache. Called by background task."""
+    """Refresh the queries that are due, as far as each provider's quota allows (one scheduler pass).
+
+    The default feed queries (merged into /api/news) are pinned to at least half of the quota.
+    """
     global _refresh_lock
     if _refresh_lock:
         return _aggregator_cache
     _refresh_lock = True
     try:
-        ms_task = fetch_mediastack("Nigeria Africa", 20)
-        nd_task = fetch_newsdata("Nigeria", 10)  # NewsData.io free plan caps at 10
-        ms_results, nd_results = await asyncio.gather(ms_task, nd_task)
-        _aggregator_cache["mediastack"] = ms_results
-        _aggregator_cache["newsdata"] = nd_results
-        _aggregator_cache["last_fetched"] = datetime.now(timezone.utc).isoformat()
-        _aggregator_cache["last_fetched_ts"] = time.monotonic()
-        logger.info("[Aggregator] Cache refreshed: %s mediastack, %s newsdata", len(ms_results), len(nd_results))
+        _track_defaults()
+        due = _scheduler.take_due()
+        if due:
+            counts = await asyncio.gather(*(_refresh_query(key) for key in due))
+            logger.info(
+                "[Aggregator] Refreshed %s queries (%s articles); quota %s",
+                len(due), sum(counts), {p: u["used_today"] for p, u in _scheduler.usage().items()},
+            )
     finally:
         _refresh_lock = False
     return _aggregator_cache
 
 
+def refresh_in_background() -> None:
+    """Schedule a refresh pass unless one is already running (never blocks the caller)."""
+    global _refresh_task
+    if not (MEDIASTACK_KEY or NEWSDATA_KEY):
+        return
+    if scheduler_running():
+        _wakeup.set()
+        return
+    if _refresh_lock or (_refresh_task is not None and not _refresh_task.done()):
+        return
+    _refresh_task = asyncio.get_running_loop().create_task(refresh_cache())
+
+
+def get_cached_query(provider: str, keywords: Optional[str], limit: int) -> Dict:
+    """Cached results of a provider query; never calls upstream.
+
+    Each request raises the query's share of the provider's quota; a query not cached yet is
+    fetched at the next scheduler pass with quota left (`refresh_eta_seconds` says when).
+    """
+    if not _configured(provider):
+        return {"count": 0, "articles": [], "cached": False, "fetched_at": None, "refresh_eta_seconds": None}
+    key = query_key(provider, keywords, limit)
+    _track(key, pinned=key == _default_key(provider))
+    _scheduler.requested(key)
+    entry = _cached_entry(key)
+    eta = _scheduler.eta(key)
+    if eta == 0:
+        refresh_in_background()
+    articles = entry["articles"][:limit] if entry is not None else []
+    _stats["cache_hits" if entry is not None else "cache_misses"] += 1
+    return {
+        "count": len(articles),
+        "articles": articles,
+        "cached": entry is not None,
+        "fetched_at": entry["fetched_at"] if entry is not None else None,
+        "refresh_eta_seconds": round(eta),
+    }
+
+
 async def fetch_all_aggregators(keywords: str = "Nigeria Africa") -> Dict:
-    """Fetch from all programmatic aggregators. Uses cache if fresh."""
-    if not _cache_is_stale() and (_aggregator_cache["mediastack"] or _aggregator_cache["newsdata"]):
-        ms = _aggregator_cache["mediastack"]
-        nd = _aggregator_cache["newsdata"]
-    else:
-        ms_task = fetch_mediastack(keywords)
-        nd_task = fetch_newsdata(keywords.split()[0] if keywords else "Nigeria")
-        ms, nd = await asyncio.gather(ms_task, nd_task)
-        _aggregator_cache["mediastack"] = ms
-        _aggregator_cache["newsdata"] = nd
-        _aggregator_cache["last_fetched"] = datetime.now(timezone.utc).isoformat()
-        _aggregator_cache["last_fetched_ts"] = time.monotonic()
+    """Cached results from all programmatic aggregators for `keywords` (no live upstream call)."""
+    ms = get_cached_query("mediastack", keywords, 20)
+    nd = get_cached_query("newsdata", keywords.split()[0] if keywords else "Nigeria", 10)
+    fetched = [r["fetched_at"] for r in (ms, nd) if r["fetched_at"]]
     return {
-        "mediastack": {"count": len(ms), "articles": ms},
-        "newsdata": {"count": len(nd), "articles": nd},
-        "total": len(ms) + len(nd),
-        "last_fetched": _aggregator_cache["last_fetched"],
-        "cached": not _cache_is_stale(),
+        "mediastack": {"count": ms["count"], "articles": ms["articles"]},
+        "newsdata": {"count": nd["count"], "articles": nd["articles"]},
+        "total": ms["count"] + nd["count"],
+        "last_fetched": max(fetched) if fetched else None,
+        "cached": ms["cached"] or nd["cached"],
+        "refresh_eta_seconds": {"mediastack": ms["refresh_eta_seconds"], "newsdata": nd["refresh_eta_seconds"]},
     }
 
 
+def scheduler_running() -> bool:
+    return _scheduler_task is not None and not _scheduler_task.done()
+
+
+async def _run_scheduler() -> None:
+    while True:
+        try:
+            await refresh_cache()
+        except Exception as e:
+            logger.error("[Aggregator] Refresh pass failed: %s", e)
+        delay = min(max(_scheduler.next_wakeup(), SCHEDULER_MIN_SLEEP), CACHE_TTL)
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+def start_aggregator_scheduler() -> None:
+    """Start refreshing cached aggregator queries as quota allows (app startup)."""
+    global _scheduler_task, _wakeup
+    if not scheduler_running():
+        _wakeup = asyncio.Event()
+        _scheduler_task = asyncio.get_running_loop().create_task(_run_scheduler())
+
+
+async def stop_aggregator_scheduler() -> None:
+    global _scheduler_task
+    if _scheduler_task is not None:
+        _scheduler_task.cancel()
+        try:
+            await _scheduler_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _scheduler_task = None
+
+
 def get_aggregator_status() -> Dict:
     """Return current aggregator cache status."""
+    top_queries = sorted(_scheduler.keys(), key=lambda k: -_scheduler.popularity(k))[:20]
     return {
         "mediastack": {
             "configured": bool(MEDIASTACK_KEY),
@@ -169,46 +334,148 @@ def get_aggregator_status() -> Dict:
         "last_fetched": _aggregator_cache.get("last_fetched"),
         "cache_ttl_seconds": CACHE_TTL,
         "cache_stale": _cache_is_stale(),
+        "scheduler_running": scheduler_running(),
+        "quota": _scheduler.usage(),
+        "cached_queries": len(_query_results),
+        "queries": [
+            {
+                "provider": k[0],
+                "keywords": k[1],
+                "limit": k[2],
+                "popularity": round(_scheduler.popularity(k), 2),
+                "refresh_interval_seconds": round(_scheduler.interval(k)),
+                "refresh_eta_seconds": round(_scheduler.eta(k)),
+            }
+            for k in top_queries
+        ],
+        **_stats,
     }
 
 
-def normalize_to_news_items(articles: List[Dict]) -> List[Dict]:
-    """Normalize aggregator articles to match NewsItem schema."""
+def export_aggregator_cache() -> Optional[Dict]:
+    """Cached articles as plain data for the on-disk warm-restart cache."""
+    if not (_aggregator_cache["mediastack"] or _aggregator_cache["newsdata"]):
+        return None
+    return {
+        "mediastack": _aggregator_cache["mediastack"],
+        "newsdata": _aggregator_cache["newsdata"],
+        "last_fetched": _aggregator_cache["last_fetched"],
+        "quota_used": {p: [u["day"], u["used_today"]] for p, u in _scheduler.usage().items()},
+    }
+
+
+def restore_aggregator_cache(data: Dict) -> int:
+    """Seed the cache from disk at startup, keeping its real age so TTL checks still apply."""
+    if _aggregator_cache["mediastack"] or _aggregator_cache["newsdata"]:
+        return 0
+    age = CACHE_TTL + 1
+    if data.get("last_fetched"):
+        try:
+            age = (datetime.now(timezone.utc) - datetime.fromisoformat(data["last_fetched"])).total_seconds()
+        except (TypeError, ValueError):
+            pass
+    _aggregator_cache["mediastack"] = data.get("mediastack") or []
+    _aggregator_cache["newsdata"] = data.get("newsdata") or []
+    _aggregator_cache["last_fetched"] = data.get("last_fetched")
+    _aggregator_cache["last_fetched_ts"] = time.monotonic() - max(0.0, age)
+    # Today's upstream calls still count against the quota, and the default feeds are as old as saved
+    for provider, (day, used) in (data.get("quota_used") or {}).items():
+        _scheduler.restore_usage(provider, day, used)
+    _track_defaults()
+    for provider in DEFAULT_QUERIES:
+        if _default_key(provider) in _scheduler and _aggregator_cache[provider]:
+            _scheduler.fetched(_default_key(provider), at=time.time() - max(0.0, age))
+    return len(_aggregator_cache["mediastack"]) + len(_aggregator_cache["newsdata"])
+
+
+def normalize_to_news_items(articles: List[Dict]) -> List[Article]:
+    """Normalize aggregator articles to match NewsItem schema (read-only Article records),
+    classified once here like RSS items are at parse time."""
     items = []
     for a in articles:
-        items.append({
-            "id": a.get("id", ""),
-            "title": a.get("title", "Untitled"),
-            "summary": a.get("summary", ""),
-            "narrative": None,
-            "source": a.get("source", "Unknown"),
-            "source_url": a.get("source_url", ""),
-            "published": a.get("published", ""),
-            "region": a.get("region", "Africa"),
-            "category": (a.get("category") or "General").title(),
-            "truth_score": 100,
-            "audio_url": None,
-            "listen_count": 0,
-            "tags": a.get("tags", []),
-            "image_url": a.get("image_url"),
-            "aggregator": a.get("aggregator", ""),
-        })
+        title = a.get("title", "Untitled")
+        summary = a.get("summary", "")
+        label = classify(title, summary, (a.get("category") or "General").title())
+        items.append(Article(
+            id=a.get("id", ""),
+            title=title,
+            summary=summary,
+            narrative=None,
+            source=a.get("source", "Unknown"),
+            source_url=a.get("source_url", ""),
+            published=a.get("published", ""),
+            region=a.get("region", "Africa"),
+            category=label.category,
+            truth_score=100,
+            audio_url=None,
+            listen_count=0,
+            tags=a.get("tags") or label.tags,
+            image_url=a.get("image_url"),
+            aggregator=a.get("aggregator", ""),
+            is_breaking=label.is_breaking,
+        ))
     return items
 
 
-async def get_normalized_aggregator_news(sources: List[str] = None) -> List[Dict]:
-    """Get cached aggregator news as normalized items. Optionally filter by source."""
-    # Use cache if fresh, else refresh
+def _aggregator_index() -> Dict[str, Article]:
+    global _item_index, _index_sources, _index_version
+    ms, nd = _aggregator_cache["mediastack"], _aggregator_cache["newsdata"]
+    if _index_sources[0] is not ms or _index_sources[1] is not nd:
+        index = {item["id"]: item for item in normalize_to_news_items(ms + nd) if item["id"]}
+        register_images(item.get("image_url") for item in index.values())
+        _evicted_items.retire(_item_index, index)
+        _item_index, _index_sources = index, (ms, nd)
+        _index_version += 1
+        _views.clear()
+    return _item_index
+
+
+def get_aggregator_index_version() -> int:
+    """Changes whenever the normalized aggregator items are rebuilt (for derived caches)."""
+    _aggregator_index()
+    return _index_version
+
+
+def get_aggregator_view(
+    sources: Optional[List[str]] = None, region: Optional[str] = None, category: Optional[str] = None
+) -> Sequence[Dict]:
+    """Cached aggregator items for a region/category, newest first (built once per cache refresh)."""
     if _cache_is_stale() or not (_aggregator_cache["mediastack"] or _aggregator_cache["newsdata"]):
-        await refresh_cache()
+        refresh_in_background()
+    index = _aggregator_index()
+    # Only known providers count, so arbitrary ?aggregator_sources values cannot grow the cache
+    wanted = frozenset(sources).intersection(DEFAULT_QUERIES) if sources is not None else None
+    views = _views.get(wanted)
+    if views is None:
+        items = [i for i in index.values() if wanted is None or i.get("aggregator") in wanted]
+        items.sort(key=lambda x: x.get("published") or "", reverse=True)
+        views = _views[wanted] = build_views(items)
+    return views.get(view_key(region, category), ())
 
-    all_articles = []
-    if sources is None or "mediastack" in sources:
-        all_articles.extend(_aggregator_cache.get("mediastack", []))
-    if sources is None or "newsdata" in sources:
-        all_articles.extend(_aggregator_cache.get("newsdata", []))
 
-    return normalize_to_news_items(all_articles)
+def get_aggregator_item(item_id: str) -> Optional[Article]:
+    """Look up a cached (or recently rotated-out) aggregator item by id."""
+    return _aggregator_index().get(item_id) or _evicted_items.get(item_id)
+
+
+def get_cached_aggregator_items() -> List[Article]:
+    """Normalized aggregator items as currently cached (never triggers a refresh)."""
+    return list(_aggregator_index().values())
+
+
+async def get_normalized_aggregator_news(sources: List[str] = None) -> List[Article]:
+    """Get cached aggregator news as normalized items. Optionally filter by source.
+
+    Serves whatever is cached; a stale or empty cache is refreshed in the background.
+    Items come from the index, so they are normalized once per cache refresh, not per call.
+    """
+    if _cache_is_stale() or not (_aggregator_cache["mediastack"] or _aggregator_cache["newsdata"]):
+        refresh_in_background()
+
+    items = _aggregator_index().values()
+    if sources is None:
+        return list(items)
+    return [i for i in items if i.get("aggregator") in sources]
 
 
 def search_cached_aggregators(query: str, sources: List[str] = None) -> List[Dict]:
@@ -0,0 +1,186 @@
+# Archive service - day-partitioned on-disk history of every ingested story
+import asyncio
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from typing import Dict, List, Mapping, Optional
+
+from lib.story_archive import StoryArchive
+
+logger = logging.getLogger(__name__)
+
+STORY_ARCHIVE_ENABLED = os.environ.get("STORY_ARCHIVE_ENABLED", "1") not in (
+    "0",
+    "false",
+    "False",
+)
+STORY_ARCHIVE_DIR = os.environ.get(
+    "STORY_ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "archive"),
+)
+# Day segments older than this are deleted when the archive opens and daily after (0 keeps everything)
+STORY_ARCHIVE_RETENTION_DAYS = int(
+    os.environ.get("STORY_ARCHIVE_RETENTION_DAYS", "365")
+)
+# New stories are queued by the snapshot hook and written in batches this often (seconds)
+STORY_ARCHIVE_FLUSH_INTERVAL = float(
+    os.environ.get("STORY_ARCHIVE_FLUSH_INTERVAL", "5")
+)
+# Listing requests may span at most this many days
+ARCHIVE_MAX_RANGE_DAYS = 31
+
+_archive: Optional[StoryArchive] = None
+_open_lock = threading.Lock()
+_pruned_on: Optional[date] = None  # UTC day retention was last applied
+_pending: List[Mapping] = []
+_archiver_task: Optional[asyncio.Task] = None
+
+
+def _get_archive(create: bool = False) -> Optional[StoryArchive]:
+    """Open the archive on first use; readers never create the directory.
+
+    Opening prunes and loads every day index, so call this off the event loop
+    (the archiver opens it in a worker thread at startup).
+    """
+    global _archive, _pruned_on
+    if _archive is not None or not STORY_ARCHIVE_ENABLED:
+        return _archive
+    with _open_lock:
+        if _archive is None and (create or os.path.isdir(STORY_ARCHIVE_DIR)):
+            try:
+                _archive = StoryArchive(
+                    STORY_ARCHIVE_DIR, retention_days=STORY_ARCHIVE_RETENTION_DAYS
+                )
+                _pruned_on = datetime.now(timezone.utc).date()
+                logger.info(
+                    "[Archive] Opened %s (%s stories)",
+                    STORY_ARCHIVE_DIR,
+                    len(_archive),
+                )
+            except OSError as e:
+                logger.error("[Archive] Cannot open %s: %s", STORY_ARCHIVE_DIR, e)
+    return _archive
+
+
+def archiving() -> bool:
+    return _archiver_task is not None and not _archiver_task.done()
+
+
+def queue_for_archive(items: List[Mapping]) -> None:
+    """Called by ingestion with stories that just entered the snapshot (no-op unless the archiver runs)."""
+    if archiving():
+        _pending.extend(items)
+
+
+async def flush_archive() -> int:
+    """Write queued stories to today's (or their published day's) segment, off the event loop."""
+    global _pending
+    if not _pending:
+        return 0
+    archive = _archive or await asyncio.to_thread(_get_archive, True)
+    if archive is None:
+        _pending = []
+        return 0
+    batch, _pending = _pending, []
+    written = await asyncio.to_thread(archive.append, batch)
+    if written:
+        logger.info("[Archive] Appended %s stories (%s total)", written, len(archive))
+    return written
+
+
+async def prune_archive() -> int:
+    """Apply STORY_ARCHIVE_RETENTION_DAYS once per UTC day, off the event loop."""
+    global _pruned_on
+    today = datetime.now(timezone.utc).date()
+    if _archive is None or _pruned_on == today:
+        return 0
+    _pruned_on = today
+    return await asyncio.to_thread(_archive.prune)
+
+
+async def _run_archiver() -> None:
+    try:
+        await asyncio.to_thread(_get_archive, True)
+    except Exception as e:
+        logger.error("[Archive] Open failed: %s", e)
+    while True:
+        await asyncio.sleep(STORY_ARCHIVE_FLUSH_INTERVAL)
+        try:
+            await flush_archive()
+            await prune_archive()
+        except Exception as e:
+            logger.error("[Archive] Flush failed: %s", e)
+
+
+def start_story_archiver() -> None:
+    """Start queueing and batch-writing ingested stories (app startup)."""
+    global _archiver_task
+    if STORY_ARCHIVE_ENABLED and not archiving():
+        _archiver_task = asyncio.get_running_loop().create_task(_run_archiver())
+
+
+async def stop_story_archiver() -> None:
+    """Stop the archiver and write whatever is still queued (app shutdown)."""
+    global _archiver_task
+    if _archiver_task is not None:
+        _archiver_task.cancel()
+        _archiver_task = None
+    try:
+        await flush_archive()
+    except Exception as e:
+        logger.error("[Archive] Final flush failed: %s", e)
+
+
+def get_archived_story(news_id: str) -> Optional[Dict]:
+    """Blocking disk read (mmap page faults); call through asyncio.to_thread."""
+    archive = _get_archive()
+    return archive.get(news_id) if archive is not None else None
+
+
+def list_archived_stories(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> Dict:
+    """Stories published in [start, end] (UTC days, newest first), read from disk page by page."""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=6)
+    if start > end:
+        start, end = end, start
+    start = max(start, end - timedelta(days=ARCHIVE_MAX_RANGE_DAYS - 1))
+    archive = _get_archive()
+    items: List[Dict] = []
+    if archive is not None:
+        source_l, category_l = (source or "").lower(), (category or "").lower()
+        matches = (
+            item
+            for item in archive.iter_range(start, end)
+            if (not source_l or (item.get("source") or "").lower() == source_l)
+            and (not category_l or (item.get("category") or "").lower() == category_l)
+        )
+        items = list(islice(matches, offset, offset + limit + 1))
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "offset": offset,
+        "limit": limit,
+        "has_more": len(items) > limit,
+        "items": items[:limit],
+    }
+
+
+def get_archive_status() -> Dict:
+    archive = _get_archive()
+    return {
+        "enabled": STORY_ARCHIVE_ENABLED,
+        "path": STORY_ARCHIVE_DIR,
+        "running": archiving(),
+        "pending": len(_pending),
+        "retention_days": STORY_ARCHIVE_RETENTION_DAYS,
+        **(archive.stats() if archive is not None else {}),
+    }
@@ -0,0 +1,150 @@
+# Cache snapshot service - persist news, podcast and aggregator caches (and headline translations) for warm restarts
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+from lib.snapshot_store import encode_snapshot, read_snapshot, write_snapshot
+from services.news_service import export_news_snapshot, restore_news_snapshot
+from services.podcast_service import export_podcast_cache, restore_podcast_cache
+from services.aggregator_service import (
+    export_aggregator_cache,
+    restore_aggregator_cache,
+)
+from services.headline_service import (
+    export_headline_translations,
+    restore_headline_translations,
+)
+
+logger = logging.getLogger(__name__)
+
+CACHE_SNAPSHOT_ENABLED = os.environ.get("CACHE_SNAPSHOT_ENABLED", "1") not in (
+    "0",
+    "false",
+    "False",
+)
+CACHE_SNAPSHOT_DIR = os.environ.get(
+    "CACHE_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "snapshots"),
+)
+CACHE_SNAPSHOT_INTERVAL = int(os.environ.get("CACHE_SNAPSHOT_INTERVAL", "60"))
+# Snapshots older than this are not restored (seconds)
+CACHE_SNAPSHOT_MAX_AGE = int(os.environ.get("CACHE_SNAPSHOT_MAX_AGE", str(24 * 3600)))
+
+# Bump when the shape of a cached item changes; older snapshots are then ignored
+SCHEMA_VERSION = 2
+
+# name -> (export, restore, change-stamp key)
+_SECTIONS: Dict[
+    str, Tuple[Callable[[], Optional[Dict]], Callable[[Dict], int], str]
+] = {
+    "news": (export_news_snapshot, restore_news_snapshot, "version"),
+    "podcasts": (export_podcast_cache, restore_podcast_cache, "cached_at"),
+    "aggregator": (export_aggregator_cache, restore_aggregator_cache, "last_fetched"),
+    "headlines": (
+        export_headline_translations,
+        restore_headline_translations,
+        "version",
+    ),
+}
+
+_stats: Dict = {
+    "loaded_from": None,
+    "restored": {},
+    "saves": 0,
+    "last_saved": None,
+    "last_bytes": 0,
+    "last_error": None,
+}
+_last_stamp: Optional[Tuple] = None
+_save_lock = asyncio.Lock()
+
+
+def _snapshot_path() -> str:
+    return os.path.join(CACHE_SNAPSHOT_DIR, "caches.snap")
+
+
+async def load_cache_snapshot() -> Dict[str, int]:
+    """Restore caches from the on-disk snapshot (app startup). Returns items restored per section."""
+    if not CACHE_SNAPSHOT_ENABLED:
+        return {}
+    data = await asyncio.to_thread(read_snapshot, _snapshot_path())
+    if not data:
+        return {}
+    if data.get("schema") != SCHEMA_VERSION:
+        logger.info(
+            "[CacheSnapshot] Ignoring snapshot with schema %s (expected %s)",
+            data.get("schema"),
+            SCHEMA_VERSION,
+        )
+        return {}
+    age = time.time() - data.get("saved_at", 0)
+    if age > CACHE_SNAPSHOT_MAX_AGE:
+        logger.info("[CacheSnapshot] Ignoring snapshot saved %.0fs ago", age)
+        return {}
+    restored = {}
+    for name, section in (data.get("sections") or {}).items():
+        if name not in _SECTIONS or not section:
+            continue
+        try:
+            restored[name] = _SECTIONS[name][1](section)
+        except Exception as e:
+            logger.warning("[CacheSnapshot] Could not restore %s: %s", name, e)
+    _stats["loaded_from"] = datetime.fromtimestamp(
+        data["saved_at"], tz=timezone.utc
+    ).isoformat()
+    _stats["restored"] = restored
+    logger.info("[CacheSnapshot] Restored %s (saved %.0fs ago)", restored, age)
+    return restored
+
+
+async def save_cache_snapshot(force: bool = False) -> bool:
+    """Write the caches to disk if anything changed since the last save."""
+    global _last_stamp
+    if not CACHE_SNAPSHOT_ENABLED:
+        return False
+    async with _save_lock:
+        sections = {name: export() for name, (export, _, _) in _SECTIONS.items()}
+        stamp = tuple(
+            (s or {}).get(key)
+            for s, (_, _, key) in zip(sections.values(), _SECTIONS.values())
+        )
+        if not any(sections.values()) or (stamp == _last_stamp and not force):
+            return False
+        # Encode on the loop (cached dicts may be mutated by handlers); compress and write off it
+        raw = encode_snapshot(
+            {"schema": SCHEMA_VERSION, "saved_at": time.time(), "sections": sections}
+        )
+        try:
+            nbytes = await asyncio.to_thread(write_snapshot, _snapshot_path(), raw)
+        except OSError as e:
+            _stats["last_error"] = str(e)
+            logger.error("[CacheSnapshot] Save failed: %s", e)
+            return False
+        _last_stamp = stamp
+        _stats["saves"] += 1
+        _stats["last_saved"] = datetime.now(timezone.utc).isoformat()
+        _stats["last_bytes"] = nbytes
+        return True
+
+
+async def run_cache_snapshot_saver() -> None:
+    """Periodically persist the caches (runs for the lifetime of the app)."""
+    while True:
+        await asyncio.sleep(CACHE_SNAPSHOT_INTERVAL)
+        try:
+            await save_cache_snapshot()
+        except Exception as e:
+            logger.error("[CacheSnapshot] Periodic save failed: %s", e)
+
+
+def get_cache_snapshot_status() -> Dict:
+    return {
+        "enabled": CACHE_SNAPSHOT_ENABLED,
+        "path": _snapshot_path(),
+        "interval_seconds": CACHE_SNAPSHOT_INTERVAL,
+        "schema": SCHEMA_VERSION,
+        **_stats,
+    }
@@ -0,0 +1,115 @@
+# Classification service - ingest-time category / breaking / tag annotation (one Aho-Corasick pass)
+from typing import NamedTuple, Tuple
+
+from lib.aho_corasick import Automaton
+
+# First category (in this order) with a keyword hit wins; "General" otherwise
+CATEGORY_KEYWORDS = {
+    "Politics": [
+        "election",
+        "government",
+        "president",
+        "minister",
+        "policy",
+        "parliament",
+        "senate",
+    ],
+    "Economy": [
+        "economy",
+        "market",
+        "stock",
+        "naira",
+        "inflation",
+        "trade",
+        "gdp",
+        "fiscal",
+    ],
+    "Tech": [
+        "tech",
+        "digital",
+        "app",
+        "startup",
+        "innovation",
+        "software",
+        "ai",
+        "internet",
+    ],
+    "Sports": ["sport", "football", "match", "player", "league", "afcon", "olympics"],
+    "Health": [
+        "health",
+        "hospital",
+        "disease",
+        "medical",
+        "doctor",
+        "vaccine",
+        "pandemic",
+    ],
+    "Environment": [
+        "climate",
+        "environment",
+        "weather",
+        "flood",
+        "drought",
+        "pollution",
+    ],
+}
+BREAKING_KEYWORDS = ["breaking", "urgent", "flash", "just in", "developing"]
+TAG_KEYWORDS = {"Nigeria": ["nigeria"], "Africa": ["africa"]}
+
+_CATEGORY_ORDER = {name: rank for rank, name in enumerate(CATEGORY_KEYWORDS)}
+_BREAKING = ("breaking", None)
+
+
+def _build_automaton() -> Automaton:
+    automaton = Automaton()
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        for kw in keywords:
+            automaton.add(kw, ("category", category))
+    for kw in BREAKING_KEYWORDS:
+        automaton.add(kw, _BREAKING)
+    for tag, keywords in TAG_KEYWORDS.items():
+        for kw in keywords:
+            automaton.add(kw, ("tag", tag))
+    return automaton.build()
+
+
+_automaton = _build_automaton()
+
+
+class Classification(NamedTuple):
+    category: str
+    is_breaking: bool
+    tags: Tuple[str, ...]  # plain words, e.g. ("Politics", "Nigeria", "Breaking")
+
+
+def _category(matches: set) -> str:
+    found = [value for kind, value in matches if kind == "category"]
+    return min(found, key=_CATEGORY_ORDER.__getitem__) if found else "General"
+
+
+def classify_text(title: str, summary: str = "") -> Classification:
+    """Category from title + summary; breaking and tags from the title only."""
+    title_hits = _automaton.values(title or "")
+    body_hits = _automaton.values(summary or "") if summary else set()
+    category = _category(title_hits | body_hits)
+    is_breaking = _BREAKING in title_hits
+    tags = [category]
+    tags.extend(value for kind, value in sorted(title_hits) if kind == "tag")
+    if is_breaking:
+        tags.append("Breaking")
+    return Classification(category, is_breaking, tuple(tags[:3]))
+
+
+def classify(
+    title: str, summary: str, feed_category: str = "General"
+) -> Classification:
+    """Annotate one ingested story; a feed's own (non-General) category always wins."""
+    result = classify_text(title, summary)
+    if (
+        feed_category
+        and feed_category != "General"
+        and feed_category != result.category
+    ):
+        tags = (feed_category,) + result.tags[1:]
+        return Classification(feed_category, result.is_breaking, tags)
+    return result
@@ -0,0 +1,225 @@
+# Cluster service - cross-source near-duplicate story clustering (MinHash + LSH)
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from lib.minhash import LSHIndex, shingles, signature, similarity
+
+logger = logging.getLogger(__name__)
+
+# Estimated Jaccard similarity (title + summary shingles) at which two stories are the same event
+STORY_CLUSTER_THRESHOLD = float(os.environ.get("STORY_CLUSTER_THRESHOLD", "0.3"))
+
+
+def _published_key(item: Mapping) -> str:
+    return item.get("published") or ""
+
+
+@dataclass
+class StoryCluster:
+    """Stories about the same event; `lead` is the first report.
+
+    `id` is the key generated content is cached under: named after the lead when the
+    cluster forms, then kept for as long as any member that carried it is served.
+    """
+
+    id: str
+    lead: Mapping
+    members: List[Mapping]  # newest first
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+    @property
+    def published(self) -> str:
+        return _published_key(self.members[0])
+
+    @property
+    def sources(self) -> List[str]:
+        return list(dict.fromkeys(m.get("source") for m in self.members))
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "size": self.size,
+            "published": self.published,
+            "sources": self.sources,
+            "lead": self.lead,
+            "items": [
+                {
+                    k: m.get(k)
+                    for k in (
+                        "id",
+                        "title",
+                        "source",
+                        "source_url",
+                        "published",
+                        "aggregator",
+                    )
+                    if k in m
+                }
+                for m in self.members
+            ],
+        }
+
+
+@dataclass
+class ClusterIndex:
+    clusters: List[StoryCluster]  # newest activity first
+    by_item: Dict[str, StoryCluster] = field(default_factory=dict)
+    build_ms: float = 0.0
+
+    @property
+    def duplication_rate(self) -> float:
+        """Share of stories that are not the first report of their event."""
+        total = len(self.by_item)
+        return round(1 - len(self.clusters) / total, 3) if total else 0.0
+
+
+class StoryClusterer:
+    """Incremental clustering: a story is signed and filed in the LSH buckets once, when it
+    arrives, and compared only with its bucket mates; verified near-duplicate pairs are kept
+    as edges, and clusters are their connected components (union of pairs, as before).
+    """
+
+    def __init__(self, threshold: Optional[float] = None):
+        self.threshold = STORY_CLUSTER_THRESHOLD if threshold is None else threshold
+        self._lsh = LSHIndex()
+        self._items: Dict[str, Mapping] = {}
+        self._sigs: Dict[str, np.ndarray] = {}
+        self._edges: Dict[str, Set[str]] = {}
+        # story id -> (order the key was first handed out, cluster key)
+        self._keys: Dict[str, Tuple[int, str]] = {}
+        self._key_seq = 0
+
+    def _add(self, item_id: str, item: Mapping) -> None:
+        text = f"{item.get('title') or ''} {(item.get('summary') or '')[:300]}"
+        sig = self._sigs[item_id] = signature(shingles(text))
+        self._edges[item_id] = set()
+        for other in self._lsh.add(item_id, sig):
+            if similarity(sig, self._sigs[other]) >= self.threshold:
+                self._edges[item_id].add(other)
+                self._edges[other].add(item_id)
+
+    def _remove(self, item_id: str) -> None:
+        self._lsh.remove(item_id)
+        del self._items[item_id], self._sigs[item_id]
+        for other in self._edges.pop(item_id):
+            self._edges[other].discard(item_id)
+        self._keys.pop(item_id, None)
+
+    def _components(self) -> List[List[str]]:
+        seen: Set[str] = set()
+        out = []
+        for root in self._items:
+            if root in seen:
+                continue
+            seen.add(root)
+            stack, group = [root], []
+            while stack:
+                node = stack.pop()
+                group.append(node)
+                for other in self._edges[node]:
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+            out.append(group)
+        return out
+
+    def update(self, items: Sequence[Mapping]) -> ClusterIndex:
+        """Cluster exactly `items`: only stories not seen last time are signed and compared."""
+        start = time.perf_counter()
+        by_id = {i["id"]: i for i in items if i.get("id")}
+        for gone in [k for k in self._items if k not in by_id]:
+            self._remove(gone)
+        for item_id, item in by_id.items():
+            if item_id not in self._items:
+                self._add(item_id, item)
+            self._items[item_id] = item
+
+        groups = []
+        for ids in self._components():
+            members = sorted(
+                (self._items[i] for i in ids), key=_published_key, reverse=True
+            )
+            lead = min(members, key=lambda m: (_published_key(m) or "~", m["id"]))
+            groups.append((lead, members))
+        # Oldest events claim their keys first, so when a cluster splits the older half keeps its key
+        groups.sort(key=lambda g: (_published_key(g[0]) or "~", g[0]["id"]))
+        taken: Set[str] = set()
+        in_use = {key for _, key in self._keys.values()}
+        index = ClusterIndex(clusters=[])
+        for lead, members in groups:
+            held = sorted(
+                {self._keys[m["id"]] for m in members if m["id"] in self._keys}
+            )
+            seq, key = next(((q, k) for q, k in held if k not in taken), (None, None))
+            if key is None:
+                key = f"cl-{lead['id']}"
+                n = 1
+                while key in in_use or key in taken:
+                    n += 1
+                    key = f"cl-{lead['id']}-{n}"
+                self._key_seq += 1
+                seq = self._key_seq
+            taken.add(key)
+            for m in members:
+                self._keys[m["id"]] = (seq, key)
+            cluster = StoryCluster(id=key, lead=lead, members=members)
+            index.clusters.append(cluster)
+            for m in members:
+                index.by_item[m["id"]] = cluster
+        index.clusters.sort(key=lambda c: c.published, reverse=True)
+        index.build_ms = round((time.perf_counter() - start) * 1000, 1)
+        return index
+
+
+def cluster_items(items: Sequence[Mapping]) -> ClusterIndex:
+    """Group near-duplicate stories from scratch (LSH candidates verified by estimated Jaccard)."""
+    return StoryClusterer().update(items)
+
+
+_clusterer = StoryClusterer()
+_cached: Optional[ClusterIndex] = None
+_cached_snap = None  # held (not its id), so a later snapshot cannot be mistaken for it
+_cached_key: tuple = ()
+
+
+def clusters_for(snap, aggregator_items: Sequence[Mapping]) -> ClusterIndex:
+    """Clusters over a news snapshot plus aggregator items, updated incrementally when either changes."""
+    global _cached, _cached_snap, _cached_key
+    from services.aggregator_service import get_aggregator_index_version
+
+    key = (snap.version, get_aggregator_index_version())
+    if _cached is None or snap is not _cached_snap or key != _cached_key:
+        _cached = _clusterer.update(list(snap.items) + list(aggregator_items))
+        _cached_snap, _cached_key = snap, key
+        logger.info(
+            "[Clusters] %s stories -> %s clusters in %sms",
+            len(_cached.by_item),
+            len(_cached.clusters),
+            _cached.build_ms,
+        )
+    return _cached
+
+
+async def get_story_clusters() -> ClusterIndex:
+    """Clusters over the current RSS snapshot plus cached aggregator items (rebuilt when either changes)."""
+    from services.news_service import get_news_snapshot
+    from services.aggregator_service import get_normalized_aggregator_news
+
+    snap = await get_news_snapshot()
+    return clusters_for(snap, await get_normalized_aggregator_news())
+
+
+async def get_cluster_key(news_id: str) -> str:
+    """Key for generated content (narrative, translated narration, TTS audio) shared by every
+    story in the same cluster; stable while any story that carried it is still served.
+    """
+    cluster = (await get_story_clusters()).by_item.get(news_id)
+    return cluster.id if cluster is not None else news_id
@@ -0,0 +1,227 @@
+# Feed scheduler - adaptive per-feed polling with bounded concurrency
+import asyncio
+import heapq
+import logging
+import os
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FEED_POLL_MIN = float(os.environ.get("FEED_POLL_MIN", "60"))
+FEED_POLL_MAX = float(os.environ.get("FEED_POLL_MAX", "1800"))
+FEED_POLL_DEFAULT = float(os.environ.get("FEED_POLL_DEFAULT", "120"))
+FEED_POLL_JITTER = float(os.environ.get("FEED_POLL_JITTER", "0.1"))
+FEED_POLL_CONCURRENCY = int(os.environ.get("FEED_POLL_CONCURRENCY", "8"))
+
+# Poll at this fraction of the observed publish gap, so new stories wait at most ~half a cadence
+_CADENCE_FRACTION = 0.5
+# Multiplicative backoff when a poll finds nothing new
+_IDLE_BACKOFF = 1.5
+
+
+def _published_ts(items: List[Dict]) -> List[float]:
+    out = []
+    for item in items:
+        published = item.get("published")
+        if not published:
+            continue
+        try:
+            dt = datetime.fromisoformat(published)
+        except (TypeError, ValueError):
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        out.append(dt.timestamp())
+    return out
+
+
+@dataclass
+class FeedCadence:
+    """Learned polling interval for one feed."""
+
+    interval: float = FEED_POLL_DEFAULT
+    newest_ts: Optional[float] = None
+    polls: int = 0
+    new_items: int = 0
+    last_poll: Optional[float] = None
+    last_new: int = 0
+
+    def learn(self, items: List[Dict], new_count: int) -> float:
+        """Update the interval from entry timestamps and whether the poll found new items."""
+        self.polls += 1
+        self.last_poll = time.time()
+        self.last_new = new_count
+        self.new_items += new_count
+        stamps = sorted(_published_ts(items), reverse=True)
+        if stamps:
+            self.newest_ts = max(stamps[0], self.newest_ts or 0)
+        gaps = [a - b for a, b in zip(stamps, stamps[1:]) if a - b > 0]
+        if new_count and gaps:
+            target = statistics.median(gaps) * _CADENCE_FRACTION
+            # Smooth toward the observed cadence rather than jumping on one sample
+            self.interval = 0.5 * self.interval + 0.5 * target
+        elif not new_count:
+            self.interval *= _IDLE_BACKOFF
+        self.interval = min(FEED_POLL_MAX, max(FEED_POLL_MIN, self.interval))
+        return self.interval
+
+    def next_delay(self) -> float:
+        spread = self.interval * FEED_POLL_JITTER
+        return max(1.0, self.interval + random.uniform(-spread, spread))
+
+
+@dataclass(order=True)
+class _Due:
+    due: float
+    seq: int
+    url: str = field(compare=False)
+
+
+class FeedScheduler:
+    """Poll each feed on its own learned interval from a min-heap of due times.
+
+    A single dispatcher pops due feeds and runs them under a semaphore, so the cost
+    per scheduling decision is O(log n) and thousands of feeds need no extra tasks
+    while idle. Results are handed to `on_items(feed, items)` for incremental merging;
+    a fetch that returns None (failed) is skipped, so the feed's current items stay put.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Dict], Awaitable[Optional[List[Dict]]]],
+        on_items: Callable[[Dict, List[Dict]], int],
+        concurrency: int = FEED_POLL_CONCURRENCY,
+    ):
+        self._fetch = fetch
+        self._on_items = on_items
+        self._concurrency = concurrency
+        self._feeds: Dict[str, Dict] = {}
+        self._cadence: Dict[str, FeedCadence] = {}
+        self._heap: List[_Due] = []
+        self._seq = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _push(self, url: str, delay: float) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, _Due(time.monotonic() + delay, self._seq, url))
+        if self._wake is not None:
+            self._wake.set()
+
+    def sync_feeds(self, feeds: List[Dict], stagger: Optional[float] = None) -> None:
+        """Track new feeds (first poll spread over `stagger` seconds) and drop removed ones."""
+        stagger = FEED_POLL_DEFAULT if stagger is None else stagger
+        urls = {f["url"] for f in feeds}
+        for url in list(self._feeds):
+            if url not in urls:
+                del self._feeds[url]
+                self._cadence.pop(url, None)
+        for feed in feeds:
+            if feed["url"] not in self._feeds:
+                self._feeds[feed["url"]] = feed
+                self._cadence[feed["url"]] = FeedCadence()
+                self._push(feed["url"], random.uniform(0, stagger))
+
+    def start(self) -> None:
+        if not self.running:
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            for task in list(self._inflight.values()):
+                task.cancel()
+            await asyncio.gather(
+                self._task, *self._inflight.values(), return_exceptions=True
+            )
+        self._task = None
+        self._inflight.clear()
+
+    async def _dispatch(self) -> None:
+        sem = asyncio.Semaphore(self._concurrency)
+        while True:
+            self._wake.clear()
+            now = time.monotonic()
+            while self._heap and self._heap[0].due <= now:
+                entry = heapq.heappop(self._heap)
+                if entry.url not in self._feeds or entry.url in self._inflight:
+                    continue  # removed feed, or stale duplicate entry
+                await sem.acquire()
+                task = asyncio.get_running_loop().create_task(self._poll(entry.url))
+                self._inflight[entry.url] = task
+                task.add_done_callback(
+                    lambda t, url=entry.url: (
+                        sem.release(),
+                        self._inflight.pop(url, None),
+                    )
+                )
+            timeout = (self._heap[0].due - time.monotonic()) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, url: str) -> None:
+        feed = self._feeds.get(url)
+        if feed is None:
+            return
+        cadence = self._cadence[url]
+        try:
+            items = await self._fetch(feed)
+            if items is not None:
+                new_count = self._on_items(feed, items)
+                cadence.learn(items, new_count)
+        except Exception as e:
+            logger.error(
+                "[Scheduler] Poll failed for %s: %s", feed.get("source", url), e
+            )
+        if url in self._feeds:
+            self._push(url, cadence.next_delay())
+
+    def status(self) -> Dict:
+        now_mono = time.monotonic()
+        due = {}
+        for entry in self._heap:
+            if entry.url in self._feeds and (
+                entry.url not in due or entry.due < due[entry.url]
+            ):
+                due[entry.url] = entry.due
+        feeds = []
+        for url, feed in self._feeds.items():
+            c = self._cadence[url]
+            feeds.append(
+                {
+                    "name": feed.get("source", url),
+                    "interval_seconds": round(c.interval, 1),
+                    "next_poll_in": (
+                        round(due[url] - now_mono, 1) if url in due else None
+                    ),
+                    "polls": c.polls,
+                    "new_items": c.new_items,
+                    "last_new": c.last_new,
+                    "last_poll": (
+                        datetime.fromtimestamp(c.last_poll, tz=timezone.utc).isoformat()
+                        if c.last_poll
+                        else None
+                    ),
+                    "polling": url in self._inflight,
+                }
+            )
+        return {
+            "running": self.running,
+            "feeds": len(self._feeds),
+            "in_flight": len(self._inflight),
+            "concurrency": self._concurrency,
+            "schedule": sorted(feeds, key=lambda f: f["interval_seconds"]),
+        }
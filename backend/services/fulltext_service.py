@@ -0,0 +1,261 @@
+# Full-text service - background prefetch of article pages for the top stories
+import asyncio
+import logging
+import os
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Sequence
+from urllib.parse import urlparse
+
+import aiohttp
+
+from lib.article_text import extract_article_text
+from lib.feed_parser import run_in_parse_executor
+from lib.http_client import get_ingest_session, read_limited
+
+try:
+    import zstandard
+except ImportError:  # optional: fall back to zlib
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+FULLTEXT_PREFETCH_ENABLED = os.environ.get("FULLTEXT_PREFETCH_ENABLED", "1") not in (
+    "0",
+    "false",
+    "False",
+)
+# After each snapshot publish, the newest N stories without a cached body are fetched
+FULLTEXT_PREFETCH_TOP = int(os.environ.get("FULLTEXT_PREFETCH_TOP", "40"))
+# Concurrent article fetches per publisher host, and overall
+FULLTEXT_PER_HOST = int(os.environ.get("FULLTEXT_PER_HOST", "2"))
+FULLTEXT_CONCURRENCY = int(os.environ.get("FULLTEXT_CONCURRENCY", "8"))
+FULLTEXT_TIMEOUT = float(os.environ.get("FULLTEXT_TIMEOUT", "8"))
+# Article pages are read up to this many bytes
+FULLTEXT_MAX_BYTES = int(os.environ.get("FULLTEXT_MAX_BYTES", str(1024 * 1024)))
+# Compressed bodies kept in memory (least recently used dropped first)
+FULLTEXT_CACHE_BYTES = int(os.environ.get("FULLTEXT_CACHE_MB", "32")) * 1024 * 1024
+# Extracted text shorter than this adds nothing over the feed summary
+FULLTEXT_MIN_CHARS = 600
+# Stories whose page failed are not retried for this long (seconds)
+FULLTEXT_RETRY_AFTER = 1800
+# Narrative prompts get at most this much article text
+FULLTEXT_PROMPT_CHARS = 6000
+
+_bodies: "OrderedDict[str, bytes]" = OrderedDict()  # story id -> compressed UTF-8 text
+_bodies_size = 0
+_failed: "OrderedDict[str, float]" = (
+    OrderedDict()
+)  # story id -> monotonic time of the failure
+_pending: "OrderedDict[str, Mapping]" = OrderedDict()
+_wakeup: Optional[asyncio.Event] = None
+_prefetch_task: Optional[asyncio.Task] = None
+_stats = {
+    "fetched": 0,
+    "stored": 0,
+    "failed": 0,
+    "too_short": 0,
+    "bytes_downloaded": 0,
+    "text_chars": 0,
+}
+
+
+def _compress(text: str) -> bytes:
+    raw = text.encode()
+    if zstandard is not None:
+        return b"Z" + zstandard.ZstdCompressor(level=6).compress(raw)
+    return b"L" + zlib.compress(raw, 6)
+
+
+def _decompress(data: bytes) -> str:
+    if data[:1] == b"Z":
+        return zstandard.ZstdDecompressor().decompress(data[1:]).decode()
+    return zlib.decompress(data[1:]).decode()
+
+
+def store_full_text(news_id: str, text: str) -> None:
+    global _bodies_size
+    data = _compress(text)
+    old = _bodies.pop(news_id, None)
+    if old is not None:
+        _bodies_size -= len(old)
+    _bodies[news_id] = data
+    _bodies_size += len(data)
+    while _bodies_size > FULLTEXT_CACHE_BYTES and len(_bodies) > 1:
+        _, dropped = _bodies.popitem(last=False)
+        _bodies_size -= len(dropped)
+
+
+def get_full_text(news_id: Optional[str]) -> Optional[str]:
+    """Prefetched article text for a story, or None (never fetches)."""
+    data = _bodies.get(news_id) if news_id else None
+    if data is None:
+        return None
+    _bodies.move_to_end(news_id)
+    return _decompress(data)
+
+
+def has_full_text(news_id: str) -> bool:
+    return news_id in _bodies
+
+
+def narrative_source(item: Mapping) -> str:
+    """Title plus the best text we have for a story: the prefetched article, else the feed summary."""
+    body = get_full_text(item.get("id")) or item.get("summary") or ""
+    return f"{item.get('title', '')}\n\n{body[:FULLTEXT_PROMPT_CHARS]}"
+
+
+# ── Prefetch ──
+
+
+def _wanted(item: Mapping, now: float) -> bool:
+    news_id = item.get("id")
+    if not news_id or news_id in _bodies or news_id in _pending:
+        return False
+    if not str(item.get("source_url") or "").startswith(("http://", "https://")):
+        return False
+    failed_at = _failed.get(news_id)
+    return failed_at is None or now - failed_at > FULLTEXT_RETRY_AFTER
+
+
+def prefetching() -> bool:
+    return _prefetch_task is not None and not _prefetch_task.done()
+
+
+def queue_for_prefetch(items: Sequence[Mapping]) -> int:
+    """Called by ingestion with the top stories after each publish (no-op unless the prefetcher runs)."""
+    if not prefetching():
+        return 0
+    now = time.monotonic()
+    queued = 0
+    for item in items[:FULLTEXT_PREFETCH_TOP]:
+        if _wanted(item, now):
+            _pending[item["id"]] = item
+            queued += 1
+    if queued and _wakeup is not None:
+        _wakeup.set()
+    return queued
+
+
+async def _fetch_one(
+    session: aiohttp.ClientSession,
+    item: Mapping,
+    overall: asyncio.Semaphore,
+    per_host: asyncio.Semaphore,
+) -> bool:
+    news_id, url = item["id"], item["source_url"]
+    async with per_host, overall:
+        try:
+            async with session.get(
+                url,
+                headers={"Accept": "text/html,application/xhtml+xml"},
+                timeout=aiohttp.ClientTimeout(total=FULLTEXT_TIMEOUT),
+            ) as resp:
+                if resp.status != 200 or "html" not in resp.headers.get(
+                    "Content-Type", "html"
+                ):
+                    raise ValueError(f"HTTP {resp.status} {resp.content_type}")
+                body, _ = await read_limited(resp, FULLTEXT_MAX_BYTES)
+                charset = resp.charset
+        except Exception as e:
+            _failed[news_id] = time.monotonic()
+            _stats["failed"] += 1
+            logger.debug("[FullText] %s: %s", url, e)
+            return False
+    _stats["fetched"] += 1
+    _stats["bytes_downloaded"] += len(body)
+    text = await run_in_parse_executor(extract_article_text, body, charset)
+    if len(text) < max(FULLTEXT_MIN_CHARS, len(item.get("summary") or "")):
+        _failed[news_id] = time.monotonic()
+        _stats["too_short"] += 1
+        return False
+    store_full_text(news_id, text)
+    _stats["stored"] += 1
+    _stats["text_chars"] += len(text)
+    return True
+
+
+async def prefetch_stories(
+    items: List[Mapping], session: Optional[aiohttp.ClientSession] = None
+) -> int:
+    """Fetch and extract article text for `items` (bounded per host); returns how many were stored."""
+    now = time.monotonic()
+    items = [item for item in items if _wanted(item, now)]
+    if not items:
+        return 0
+    session = session or get_ingest_session()
+    overall = asyncio.Semaphore(FULLTEXT_CONCURRENCY)
+    hosts: Dict[str, asyncio.Semaphore] = {}
+    for item in items:
+        hosts.setdefault(
+            urlparse(item["source_url"]).hostname or "",
+            asyncio.Semaphore(FULLTEXT_PER_HOST),
+        )
+    results = await asyncio.gather(
+        *(
+            _fetch_one(
+                session,
+                item,
+                overall,
+                hosts[urlparse(item["source_url"]).hostname or ""],
+            )
+            for item in items
+        )
+    )
+    while len(_failed) > 4 * FULLTEXT_PREFETCH_TOP:
+        _failed.popitem(last=False)
+    stored = sum(results)
+    if stored:
+        logger.info(
+            "[FullText] Prefetched %s/%s articles (%s cached)",
+            stored,
+            len(items),
+            len(_bodies),
+        )
+    return stored
+
+
+async def _run_prefetcher() -> None:
+    while True:
+        await _wakeup.wait()
+        _wakeup.clear()
+        batch = list(_pending.values())
+        _pending.clear()
+        try:
+            await prefetch_stories(batch)
+        except Exception as e:
+            logger.error("[FullText] Prefetch failed: %s", e)
+
+
+def start_fulltext_prefetcher() -> None:
+    """Start the background article prefetcher (app startup)."""
+    global _prefetch_task, _wakeup
+    if FULLTEXT_PREFETCH_ENABLED and not prefetching():
+        _wakeup = asyncio.Event()
+        _prefetch_task = asyncio.get_running_loop().create_task(_run_prefetcher())
+
+
+async def stop_fulltext_prefetcher() -> None:
+    global _prefetch_task
+    if _prefetch_task is not None:
+        _prefetch_task.cancel()
+        try:
+            await _prefetch_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _prefetch_task = None
+    _pending.clear()
+
+
+def get_fulltext_status() -> Dict:
+    return {
+        "enabled": FULLTEXT_PREFETCH_ENABLED,
+        "running": prefetching(),
+        "top_n": FULLTEXT_PREFETCH_TOP,
+        "pending": len(_pending),
+        "cached": len(_bodies),
+        "cached_bytes": _bodies_size,
+        "cache_limit_bytes": FULLTEXT_CACHE_BYTES,
+        **_stats,
+    }
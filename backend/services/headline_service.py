@@ -0,0 +1,258 @@
+# Headline service - titles and summaries of new stories pre-translated per language, many per LLM call
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from services.llm_gemini import GEMINI_API_KEY
+from services.translation_service import SUPPORTED_LANGUAGES, translate_headlines
+
+logger = logging.getLogger(__name__)
+
+HEADLINE_TRANSLATION_ENABLED = os.environ.get(
+    "HEADLINE_TRANSLATION_ENABLED", "1"
+) not in ("0", "false", "False")
+# Languages served pre-translated by /api/news?lang= (default: every supported language but English)
+HEADLINE_LANGUAGES = tuple(
+    code
+    for code in os.environ.get(
+        "HEADLINE_LANGUAGES", ",".join(c for c in SUPPORTED_LANGUAGES if c != "en")
+    ).split(",")
+    if code in SUPPORTED_LANGUAGES and code != "en"
+)
+# After each snapshot publish, the newest N stories are translated (older ones are served in English)
+HEADLINE_TRANSLATE_TOP = int(os.environ.get("HEADLINE_TRANSLATE_TOP", "200"))
+# Headlines per LLM call, and concurrent calls across languages
+HEADLINE_BATCH_SIZE = int(os.environ.get("HEADLINE_BATCH_SIZE", "20"))
+HEADLINE_CONCURRENCY = int(os.environ.get("HEADLINE_CONCURRENCY", "2"))
+# Summaries are translated up to this many characters (enough for a headline card)
+HEADLINE_SUMMARY_CHARS = 300
+# Translations kept per language (oldest dropped first)
+HEADLINE_CACHE_LIMIT = 2000
+# Stories the model failed to translate are not retried for this long (seconds)
+HEADLINE_RETRY_AFTER = 900
+
+# language -> story id -> (title, summary)
+_translations: Dict[str, "OrderedDict[str, Tuple[str, str]]"] = {
+    lang: OrderedDict() for lang in HEADLINE_LANGUAGES
+}
+_failed: Dict[str, "OrderedDict[str, float]"] = {
+    lang: OrderedDict() for lang in HEADLINE_LANGUAGES
+}
+_pending: "OrderedDict[str, Mapping]" = OrderedDict()
+_version = 0  # bumped whenever translations are stored (cache snapshot change stamp)
+_wakeup: Optional[asyncio.Event] = None
+_translator_task: Optional[asyncio.Task] = None
+_stats = {"calls": 0, "failed_calls": 0, "translated": 0, "skipped": 0}
+
+
+def _store(lang: str, news_id: str, title: str, summary: str) -> None:
+    table = _translations[lang]
+    table[news_id] = (title, summary)
+    table.move_to_end(news_id)
+    while len(table) > HEADLINE_CACHE_LIMIT:
+        table.popitem(last=False)
+
+
+def localize_items(items: Sequence[Mapping], lang: str) -> List[Mapping]:
+    """Items with title and summary in `lang` where translated; others are passed through in English.
+
+    Translated items carry `language` and `original_title`, so clients can tell them apart.
+    """
+    table = _translations.get(lang)
+    if not table:
+        return list(items)
+    out = []
+    for item in items:
+        translated = table.get(item.get("id"))
+        if translated is None:
+            out.append(item)
+            continue
+        title, summary = translated
+        out.append(
+            {
+                **item,
+                "title": title,
+                "summary": summary or item.get("summary"),
+                "language": lang,
+                "original_title": item.get("title"),
+            }
+        )
+    return out
+
+
+# ── Batch translation ──
+
+
+def _wanted(item: Mapping, lang: str, now: float) -> bool:
+    news_id = item.get("id")
+    if not news_id or not item.get("title") or news_id in _translations[lang]:
+        return False
+    failed_at = _failed[lang].get(news_id)
+    return failed_at is None or now - failed_at > HEADLINE_RETRY_AFTER
+
+
+def translating() -> bool:
+    return _translator_task is not None and not _translator_task.done()
+
+
+def queue_for_translation(items: Sequence[Mapping]) -> int:
+    """Called by ingestion with the newest stories after each publish (no-op unless the translator runs)."""
+    if not translating():
+        return 0
+    now = time.monotonic()
+    queued = 0
+    for item in items[:HEADLINE_TRANSLATE_TOP]:
+        if item.get("id") not in _pending and any(
+            _wanted(item, lang, now) for lang in HEADLINE_LANGUAGES
+        ):
+            _pending[item["id"]] = item
+            queued += 1
+    if queued and _wakeup is not None:
+        _wakeup.set()
+    return queued
+
+
+async def _translate_batch(
+    lang: str, items: List[Mapping], limit: asyncio.Semaphore
+) -> int:
+    headlines = [
+        {
+            "title": item["title"],
+            "summary": (item.get("summary") or "")[:HEADLINE_SUMMARY_CHARS],
+        }
+        for item in items
+    ]
+    async with limit:
+        results = await translate_headlines(headlines, lang)
+    _stats["calls"] += 1
+    now = time.monotonic()
+    if results is None:
+        _stats["failed_calls"] += 1
+        results = [None] * len(items)
+    stored = 0
+    for item, result in zip(items, results):
+        if result is None:
+            _failed[lang][item["id"]] = now
+            _stats["skipped"] += 1
+            continue
+        _store(lang, item["id"], result["title"], result["summary"])
+        stored += 1
+    while len(_failed[lang]) > 2 * HEADLINE_TRANSLATE_TOP:
+        _failed[lang].popitem(last=False)
+    return stored
+
+
+async def translate_stories(items: Sequence[Mapping]) -> int:
+    """Translate `items` into every headline language still missing them, HEADLINE_BATCH_SIZE per call.
+
+    Returns the number of translations stored.
+    """
+    global _version
+    now = time.monotonic()
+    limit = asyncio.Semaphore(HEADLINE_CONCURRENCY)
+    batches = []
+    for lang in HEADLINE_LANGUAGES:
+        wanted = [item for item in items if _wanted(item, lang, now)]
+        for start in range(0, len(wanted), HEADLINE_BATCH_SIZE):
+            batches.append(
+                _translate_batch(
+                    lang, wanted[start : start + HEADLINE_BATCH_SIZE], limit
+                )
+            )
+    if not batches:
+        return 0
+    stored = sum(await asyncio.gather(*batches))
+    if stored:
+        _version += 1
+        _stats["translated"] += stored
+        logger.info(
+            "[Headlines] Translated %s headlines in %s calls", stored, len(batches)
+        )
+    return stored
+
+
+async def _run_translator() -> None:
+    while True:
+        await _wakeup.wait()
+        _wakeup.clear()
+        # Newest first, so the top of every localized feed is ready soonest
+        batch = sorted(
+            _pending.values(),
+            key=lambda item: item.get("published") or "",
+            reverse=True,
+        )
+        _pending.clear()
+        try:
+            await translate_stories(batch)
+        except Exception as e:
+            logger.error("[Headlines] Translation failed: %s", e)
+
+
+def start_headline_translator() -> None:
+    """Start translating new headlines in the background (app startup; needs GEMINI_API_KEY)."""
+    global _translator_task, _wakeup
+    if (
+        HEADLINE_TRANSLATION_ENABLED
+        and GEMINI_API_KEY
+        and HEADLINE_LANGUAGES
+        and not translating()
+    ):
+        _wakeup = asyncio.Event()
+        _translator_task = asyncio.get_running_loop().create_task(_run_translator())
+
+
+async def stop_headline_translator() -> None:
+    global _translator_task
+    if _translator_task is not None:
+        _translator_task.cancel()
+        try:
+            await _translator_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _translator_task = None
+    _pending.clear()
+
+
+# ── Warm restarts (cache snapshot section) ──
+
+
+def export_headline_translations() -> Optional[Dict]:
+    """Translations as plain data for the on-disk warm-restart cache."""
+    if not any(_translations.values()):
+        return None
+    return {
+        "version": _version,
+        "languages": {
+            lang: {i: list(t) for i, t in table.items()}
+            for lang, table in _translations.items()
+        },
+    }
+
+
+def restore_headline_translations(data: Dict) -> int:
+    """Seed translations from disk at startup, so a restart does not pay for them again."""
+    restored = 0
+    for lang, table in (data.get("languages") or {}).items():
+        if lang not in _translations:
+            continue
+        for news_id, (title, summary) in table.items():
+            if news_id not in _translations[lang]:
+                _store(lang, news_id, title, summary)
+                restored += 1
+    return restored
+
+
+def get_headline_status() -> Dict:
+    return {
+        "enabled": HEADLINE_TRANSLATION_ENABLED,
+        "running": translating(),
+        "languages": list(HEADLINE_LANGUAGES),
+        "top_n": HEADLINE_TRANSLATE_TOP,
+        "batch_size": HEADLINE_BATCH_SIZE,
+        "pending": len(_pending),
+        "cached": {lang: len(table) for lang, table in _translations.items()},
+        **_stats,
+    }
@@ -0,0 +1,340 @@
+# Image service - caching /api/img proxy (resized WebP/AVIF variants) and ingest-time placeholders
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import aiohttp
+
+from lib.disk_cache import DiskLRU, cache_key
+from lib.feed_parser import run_in_parse_executor
+from lib.http_client import get_ingest_session, read_limited
+from lib.image_codec import (
+    FORMATS,
+    image_placeholder,
+    prepare_image,
+    render_variant,
+    supported_formats,
+)
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CACHE_DIR = os.environ.get(
+    "IMAGE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "images"),
+)
+IMAGE_CACHE_BYTES = int(os.environ.get("IMAGE_CACHE_MB", "512")) * 1024 * 1024
+# Served widths; requests are rounded up to the next bucket (the largest is also the stored master)
+IMAGE_WIDTHS = tuple(
+    sorted(
+        int(w) for w in os.environ.get("IMAGE_WIDTHS", "160,320,640,1024").split(",")
+    )
+)
+IMAGE_QUALITY = int(os.environ.get("IMAGE_QUALITY", "70"))
+# Originals larger than this are not proxied (the client is redirected to them instead)
+IMAGE_MAX_SOURCE_BYTES = int(os.environ.get("IMAGE_MAX_SOURCE_MB", "10")) * 1024 * 1024
+IMAGE_FETCH_TIMEOUT = float(os.environ.get("IMAGE_FETCH_TIMEOUT", "10"))
+# Placeholders (blurhash + dominant colour) are computed in the background for newly ingested images
+IMAGE_PLACEHOLDERS_ENABLED = os.environ.get("IMAGE_PLACEHOLDERS_ENABLED", "1") not in (
+    "0",
+    "false",
+    "False",
+)
+IMAGE_PLACEHOLDER_CONCURRENCY = int(
+    os.environ.get("IMAGE_PLACEHOLDER_CONCURRENCY", "4")
+)
+# Images that could not be fetched or decoded are not retried for this long (seconds)
+IMAGE_RETRY_AFTER = 1800
+# Only image URLs seen at ingest are proxied (others redirect), so /api/img is not an open proxy
+IMAGE_KNOWN_LIMIT = 20000
+
+_cache: Optional[DiskLRU] = None
+_known: "OrderedDict[str, None]" = OrderedDict()
+_placeholders: "OrderedDict[str, Dict]" = OrderedDict()
+_failed: "OrderedDict[str, float]" = (
+    OrderedDict()
+)  # url -> monotonic time of the failure
+_pending: "OrderedDict[str, None]" = OrderedDict()
+_inflight: Dict[str, asyncio.Future] = {}
+_wakeup: Optional[asyncio.Event] = None
+_placeholder_task: Optional[asyncio.Task] = None
+_stats = {
+    "fetched": 0,
+    "fetch_failed": 0,
+    "variants_rendered": 0,
+    "placeholders": 0,
+    "bytes_downloaded": 0,
+}
+
+
+def _get_cache() -> Optional[DiskLRU]:
+    global _cache
+    if _cache is None:
+        try:
+            _cache = DiskLRU(IMAGE_CACHE_DIR, IMAGE_CACHE_BYTES)
+            logger.info(
+                "[Images] Opened cache %s (%s files)", IMAGE_CACHE_DIR, len(_cache)
+            )
+        except OSError as e:
+            logger.error("[Images] Cannot open cache %s: %s", IMAGE_CACHE_DIR, e)
+    return _cache
+
+
+def _bounded_put(table: OrderedDict, key: str, value) -> None:
+    table[key] = value
+    table.move_to_end(key)
+    while len(table) > IMAGE_KNOWN_LIMIT:
+        table.popitem(last=False)
+
+
+def register_images(urls: Iterable[Optional[str]]) -> int:
+    """Called by ingestion with image URLs from new stories / stations; queues their placeholders."""
+    added = 0
+    for url in urls:
+        if not url or url in _known or not url.startswith(("http://", "https://")):
+            continue
+        _bounded_put(_known, url, None)
+        added += 1
+        if (
+            placeholders_running()
+            and url not in _placeholders
+            and not _recently_failed(url)
+        ):
+            _pending[url] = None
+    if _pending and _wakeup is not None:
+        _wakeup.set()
+    return added
+
+
+def is_known_image(url: str) -> bool:
+    return url in _known
+
+
+def _recently_failed(url: str) -> bool:
+    failed_at = _failed.get(url)
+    return failed_at is not None and time.monotonic() - failed_at < IMAGE_RETRY_AFTER
+
+
+def get_image_placeholder(url: Optional[str]) -> Optional[Dict]:
+    return _placeholders.get(url) if url else None
+
+
+def with_image_placeholders(items: Sequence[Mapping]) -> List[Mapping]:
+    """Items with `image_placeholder` attached where one is ready (others are passed through uncopied)."""
+    out = []
+    for item in items:
+        placeholder = (
+            _placeholders.get(item.get("image_url")) if item.get("image_url") else None
+        )
+        out.append({**item, "image_placeholder": placeholder} if placeholder else item)
+    return out
+
+
+def choose_width(width: Optional[int]) -> int:
+    if not width:
+        return IMAGE_WIDTHS[-1]
+    return next((w for w in IMAGE_WIDTHS if w >= width), IMAGE_WIDTHS[-1])
+
+
+def choose_format(accept: str, requested: Optional[str] = None) -> str:
+    """Explicit `fmt=` if supported, else the best format the client accepts (AVIF, WebP, JPEG)."""
+    available = supported_formats()
+    if requested in available:
+        return requested
+    for fmt in ("avif", "webp"):
+        if fmt in available and f"image/{fmt}" in accept:
+            return fmt
+    return "jpeg"
+
+
+async def _single_flight(key: str, make: Callable[[], Awaitable]):
+    """Concurrent requests for the same key share one fetch/render."""
+    future = _inflight.get(key)
+    if future is not None:
+        return await asyncio.shield(future)
+    future = _inflight[key] = asyncio.get_running_loop().create_future()
+    try:
+        result = await make()
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # retrieved here, so waiter-less failures are not logged as unhandled
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+async def _download(url: str, session: aiohttp.ClientSession) -> bytes:
+    async with session.get(
+        url, timeout=aiohttp.ClientTimeout(total=IMAGE_FETCH_TIMEOUT)
+    ) as resp:
+        if resp.status != 200:
+            raise ValueError(f"HTTP {resp.status}")
+        if resp.content_type.startswith(("text/", "application/json")):
+            raise ValueError(f"not an image ({resp.content_type})")
+        if (resp.content_length or 0) > IMAGE_MAX_SOURCE_BYTES:
+            raise ValueError(f"too large ({resp.content_length} bytes)")
+        data, truncated = await read_limited(resp, IMAGE_MAX_SOURCE_BYTES)
+        if truncated:
+            raise ValueError("too large")
+        return data
+
+
+async def _master(
+    url: str, session: Optional[aiohttp.ClientSession] = None
+) -> Optional[bytes]:
+    """The stored master (largest width bucket) for an image, fetched and prepared once."""
+    cache = _get_cache()
+    key = cache_key("master", url)
+    if cache is not None:
+        data = await asyncio.to_thread(cache.get, key)
+        if data is not None:
+            if url not in _placeholders:  # cached before this process started
+                _bounded_put(
+                    _placeholders,
+                    url,
+                    await run_in_parse_executor(image_placeholder, data),
+                )
+            return data
+    if _recently_failed(url):
+        return None
+
+    async def fetch() -> Optional[bytes]:
+        try:
+            original = await _download(url, session or get_ingest_session())
+            master, placeholder = await run_in_parse_executor(
+                prepare_image, original, IMAGE_WIDTHS[-1], min(100, IMAGE_QUALITY + 20)
+            )
+        except Exception as e:
+            _bounded_put(_failed, url, time.monotonic())
+            _stats["fetch_failed"] += 1
+            logger.debug("[Images] %s: %s", url, e)
+            return None
+        _stats["fetched"] += 1
+        _stats["bytes_downloaded"] += len(original)
+        _bounded_put(_placeholders, url, placeholder)
+        _stats["placeholders"] += 1
+        if cache is not None:
+            await asyncio.to_thread(cache.put, key, master)
+        return master
+
+    return await _single_flight(key, fetch)
+
+
+async def get_image_variant(
+    url: str, width: int, fmt: str
+) -> Optional[Tuple[bytes, str]]:
+    """(body, media type) of `url` at a width bucket and format; None when it cannot be proxied."""
+    if not is_known_image(url) or fmt not in FORMATS:
+        return None
+    width = choose_width(width)
+    cache = _get_cache()
+    key = cache_key("variant", url, str(width), fmt, str(IMAGE_QUALITY))
+    if cache is not None:
+        data = await asyncio.to_thread(cache.get, key)
+        if data is not None:
+            return data, FORMATS[fmt][1]
+
+    async def render() -> Optional[bytes]:
+        master = await _master(url)
+        if master is None:
+            return None
+        data, _, _ = await run_in_parse_executor(
+            render_variant, master, width, fmt, IMAGE_QUALITY
+        )
+        _stats["variants_rendered"] += 1
+        if cache is not None:
+            await asyncio.to_thread(cache.put, key, data)
+        return data
+
+    data = await _single_flight(key, render)
+    return (data, FORMATS[fmt][1]) if data is not None else None
+
+
+# ── Placeholder precompute ──
+
+
+async def compute_placeholders(
+    urls: List[str], session: Optional[aiohttp.ClientSession] = None
+) -> int:
+    """Fetch (once) and prepare the given images; returns how many placeholders are now ready."""
+    urls = [u for u in urls if u not in _placeholders and not _recently_failed(u)]
+    if not urls:
+        return 0
+    limit = asyncio.Semaphore(IMAGE_PLACEHOLDER_CONCURRENCY)
+
+    async def one(url: str) -> bool:
+        async with limit:
+            return await _master(url, session) is not None and url in _placeholders
+
+    ready = sum(await asyncio.gather(*(one(u) for u in urls)))
+    logger.info("[Images] Placeholders ready for %s/%s new images", ready, len(urls))
+    return ready
+
+
+def placeholders_running() -> bool:
+    return _placeholder_task is not None and not _placeholder_task.done()
+
+
+async def _run_placeholders() -> None:
+    while True:
+        await _wakeup.wait()
+        _wakeup.clear()
+        batch = list(_pending)
+        _pending.clear()
+        try:
+            await compute_placeholders(batch)
+        except Exception as e:
+            logger.error("[Images] Placeholder batch failed: %s", e)
+
+
+def start_image_placeholders() -> None:
+    """Start precomputing placeholders for newly ingested images (app startup)."""
+    global _placeholder_task, _wakeup
+    if IMAGE_PLACEHOLDERS_ENABLED and not placeholders_running():
+        _wakeup = asyncio.Event()
+        _placeholder_task = asyncio.get_running_loop().create_task(_run_placeholders())
+        if _known:
+            _pending.update((u, None) for u in _known if u not in _placeholders)
+            _wakeup.set()
+
+
+async def stop_image_placeholders() -> None:
+    global _placeholder_task
+    if _placeholder_task is not None:
+        _placeholder_task.cancel()
+        try:
+            await _placeholder_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _placeholder_task = None
+    _pending.clear()
+
+
+def get_image_status() -> Dict:
+    cache = _get_cache()
+    return {
+        "widths": list(IMAGE_WIDTHS),
+        "formats": list(supported_formats()),
+        "known_images": len(_known),
+        "placeholders": len(_placeholders),
+        "placeholders_running": placeholders_running(),
+        "pending": len(_pending),
+        "failed": len(_failed),
+        "cache": cache.stats() if cache is not None else None,
+        **_stats,
+    }
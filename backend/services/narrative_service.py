@@ -3,6 +3,7 @@ import json
 import logging
 from typing import Dict, List
 
+from services.classification_service import classify_text
 from services.llm_gemini import generate_gemini
 
 logger = logging.getLogger(__name__)
@@ -48,34 +49,10 @@ Respond in JSON format:
 
 def extract_category(title: str, summary: str) -> str:
     """Simple category extraction based on keywords"""
-    text = (title + " " + summary).lower()
-
-    category_keywords = {
-        "Politics": ["election", "government", "president", "minister", "policy", "parliament", "senate"],
-        "Economy": ["economy", "market", "stock", "naira", "inflation", "trade", "gdp", "fiscal"],
-        "Tech": ["tech", "digital", "app", "startup", "innovation", "software", "ai", "internet"],
-        "Sports": ["sport", "football", "match", "player", "league", "afcon", "olympics"],
-        "Health": ["health", "hospital", "disease", "medical", "doctor", "vaccine", "pandemic"],
-        "Environment": ["climate", "environment", "weather", "flood", "drought", "pollution"],
-    }
-
-    for category, keywords in category_keywords.items():
-        if any(word in text for word in keywords):
-            return category
-
-    return "General"
+    return classify_text(title, summary).category
 
 
 def extract_tags(title: str, category: str) -> List[str]:
     """Extract hashtags from content"""
-    tags = [f"#{category.upper()}"]
-
-    title_lower = title.lower()
-    if "nigeria" in title_lower:
-        tags.append("#NIGERIA")
-    if "africa" in title_lower:
-        tags.append("#AFRICA")
-    if "breaking" in title_lower:
-        tags.append("#BREAKING")
-
-    return tags[:3]
+    tags = [category] + list(classify_text(title).tags[1:])
+    return [f"#{t.upper()}" for t in tags][:3]
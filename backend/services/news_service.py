@@ -1,11 +1,30 @@
 # News service for RSS feed fetching and processing
 import asyncio
 import hashlib
+import json
+import heapq
+import os
 import logging
 import aiohttp
-import feedparser
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from typing import Any, List, Dict, Mapping, Optional, Sequence, Tuple
+
+from lib.circuit_breaker import CircuitBreakers
+from lib.http_client import get_ingest_session
+from lib.telemetry import MetricRings
+from lib.feed_parser import ItemRow, parse_feed, read_feed_body
+from models.article import Article
+from services.archive_service import archiving, get_archived_story, queue_for_archive
+from services.classification_service import classify
+from services.fulltext_service import queue_for_prefetch
+from services.headline_service import queue_for_translation
+from services.image_service import register_images
+from services.ranking_service import update_ranking
+from services.snapshot_service import EvictedItems, NewsSnapshot, SnapshotManager
+from services.trending_service import get_trending_categories, get_trending_terms, update_trending
+from services.feed_scheduler import FeedScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -61,32 +80,233 @@ RSS_FEEDS = [
     {"url": "https://www.skysports.com/rss/12040", "source": "Sky Sports Football", "category": "Sports", "region": "international"},
 ]
 
-# ── Response cache (120s TTL) for list endpoints ───────────────────────
-_news_cache: Dict = {"data": None, "timestamp": None, "ttl": 120}
+# ── News snapshot (120s TTL, stale-while-revalidate) for list endpoints ─
+SNAPSHOT_LIMIT = 500
+FEED_SCHEDULER_ENABLED = os.environ.get("FEED_SCHEDULER_ENABLED", "1") == "1"
+# Rotated-out stories kept resolvable for detail/share/OG links
+EVICTED_STORY_LIMIT = int(os.environ.get("EVICTED_STORY_LIMIT", "2000"))
+
+
+def _published_key(item: Dict) -> str:
+    return item.get("published") or ""
+
+
+async def _build_news_snapshot() -> List[Dict]:
+    all_news = await fetch_all_news(limit=SNAPSHOT_LIMIT, category=None)
+    all_news.sort(key=_published_key, reverse=True)
+    return all_news
+
+
+def _scheduler_running() -> bool:
+    return _feed_scheduler.running
+
+
+_evicted_stories = EvictedItems(EVICTED_STORY_LIMIT)
+
+
+def _on_news_publish(previous: Optional[NewsSnapshot], snap: NewsSnapshot) -> None:
+    """Retire stories that left the snapshot, archive new ones and register their images, queue the
+    top stories for full-text prefetch and headline translation, update trending and the ranking,
+    rebuild materialized views."""
+    if previous is not None:
+        _evicted_stories.retire(previous.by_id, snap.by_id)
+    seen = previous.by_id if previous is not None else {}
+    fresh = [item for item_id, item in snap.by_id.items() if item_id not in seen]
+    if archiving():
+        queue_for_archive(fresh)
+    register_images(item.get("image_url") for item in fresh)
+    queue_for_prefetch(snap.items)
+    queue_for_translation(snap.items)
+    update_trending(snap.by_id)
+    update_ranking(snap)
+    _materialize_views(snap)
+
+
+_news_snapshots = SnapshotManager(
+    _build_news_snapshot, ttl=120, maintained=_scheduler_running, on_publish=_on_news_publish
+)
+
+
+def merge_feed_items(feed_config: Dict, items: List[Dict]) -> int:
+    """Merge one feed's latest items into the live snapshot; returns the number of new stories.
+
+    Drops this feed's stories that left the feed, and merges new ones into the
+    already-sorted list (O(n + k log k)) instead of refetching and re-sorting everything.
+    """
+    if not items:
+        return 0  # an empty poll says nothing about which stories left the feed
+    snap = _news_snapshots.current
+    current = snap.items if snap else []
+    source = feed_config["source"]
+    ids = {item["id"] for item in items}
+    kept = [n for n in current if n.get("source") != source or n["id"] in ids]
+    seen_ids = {n["id"] for n in kept}
+    seen_titles = {n["title"][:50].lower() for n in kept}
+    fresh = []
+    for item in sorted(items, key=_published_key, reverse=True):
+        title_key = item["title"][:50].lower()
+        if item["id"] in seen_ids or title_key in seen_titles:
+            continue
+        seen_titles.add(title_key)
+        fresh.append(item)
+    if not fresh and len(kept) == len(current):
+        return 0
+    merged = list(heapq.merge(kept, fresh, key=_published_key, reverse=True))[:SNAPSHOT_LIMIT]
+    _news_snapshots.publish(merged)
+    return len(fresh)
+
+
+async def _poll_feed(feed_config: Dict) -> Optional[List[Dict]]:
+    """None when the fetch failed, so the scheduler leaves the feed's current stories alone."""
+    items, ok = await _fetch_feed(feed_config)
+    return items if ok else None
+
+
+_feed_scheduler = FeedScheduler(_poll_feed, merge_feed_items)
+
+
+def start_feed_scheduler() -> None:
+    """Start adaptive per-feed polling (app startup); the snapshot is then maintained by merges."""
+    if not FEED_SCHEDULER_ENABLED:
+        return
+    _feed_scheduler.sync_feeds(RSS_FEEDS)
+    _feed_scheduler.start()
+
+
+async def stop_feed_scheduler() -> None:
+    await _feed_scheduler.stop()
+
+
+def get_feed_schedule() -> Dict:
+    """Per-feed learned intervals and next poll times."""
+    return _feed_scheduler.status()
+
+
+async def get_news_snapshot() -> NewsSnapshot:
+    """Current RSS snapshot; stale snapshots are served while one shared refresh runs."""
+    return await _news_snapshots.get()
+
+
+def warm_news_snapshot() -> None:
+    """Kick off the first snapshot build in the background (app startup)."""
+    _news_snapshots.refresh_in_background()
 
 
-async def get_cached_all_news() -> List[Dict]:
-    """Return full news list, using cache if fresh (120s TTL). Single source for RSS list."""
-    now = datetime.now(timezone.utc)
-    if (
-        _news_cache["data"] is not None
-        and _news_cache["timestamp"]
-        and (now - _news_cache["timestamp"]).total_seconds() < _news_cache["ttl"]
-    ):
-        return list(_news_cache["data"])
-    all_news = await fetch_all_news(limit=500, category=None)
-    all_news.sort(key=lambda x: x.get("published") or "", reverse=True)
-    _news_cache["data"] = all_news
-    _news_cache["timestamp"] = now
-    return list(all_news)
+def get_news_snapshot_status() -> Dict:
+    """Version, age and refresh state of the RSS snapshot."""
+    return _news_snapshots.status()
+
+
+def export_news_snapshot() -> Optional[Dict]:
+    """Current snapshot as plain data for the on-disk warm-restart cache."""
+    snap = _news_snapshots.current
+    if snap is None or not snap.items:
+        return None
+    return {"version": snap.version, "created_at": snap.created_at, "items": snap.items}
+
+
+def restore_news_snapshot(data: Dict) -> int:
+    """Seed the snapshot from disk at startup (keeps its original age, so it refreshes in the background)."""
+    if _news_snapshots.current is not None or not data.get("items"):
+        return 0
+    _news_snapshots.publish(list(data["items"]), created_at=data.get("created_at"))
+    return len(data["items"])
+
+
+async def find_story(news_id: str) -> Optional[Dict]:
+    """Story lookup: current RSS snapshot, aggregator items and recently rotated-out stories (all O(1)),
+    then the on-disk archive (read in a worker thread)."""
+    from services.aggregator_service import get_aggregator_item
+
+    snap = await _news_snapshots.get()
+    return (
+        snap.by_id.get(news_id)
+        or get_aggregator_item(news_id)
+        or _evicted_stories.get(news_id)
+        or await asyncio.to_thread(get_archived_story, news_id)
+    )
+
+
+async def get_cached_all_news() -> Sequence[Mapping]:
+    """Return full news list from the snapshot (never waits on feeds once warm). Single source for RSS list.
+
+    Zero-copy: the snapshot's own tuple of read-only items. Use story enrichment for per-story additions.
+    """
+    snap = await _news_snapshots.get()
+    return snap.items
+
+
+# ── Story enrichment (side table; snapshot items are never mutated) ───
+STORY_ENRICHMENT_LIMIT = 5000
+_story_enrichment: "OrderedDict[str, Dict]" = OrderedDict()
+
+
+def get_story_enrichment(news_id: str) -> Dict:
+    """Generated fields (narrative, key_takeaways, ...) recorded for a story, or {}."""
+    return _story_enrichment.get(news_id, {})
+
+
+def set_story_enrichment(news_id: str, **fields) -> Dict:
+    entry = {**_story_enrichment.pop(news_id, {}), **fields}
+    _story_enrichment[news_id] = entry
+    while len(_story_enrichment) > STORY_ENRICHMENT_LIMIT:
+        _story_enrichment.popitem(last=False)
+    return entry
 
 
 # ── Feed Health Monitoring ────────────────────────────────────────────
 
 import time
 
-_feed_health: Dict = {}  # { source_name: { status, latency_ms, last_checked } }
+# { source_name: { status, latency_ms, http, bytes, parsed, via, last_checked, checked_at } }
+_feed_health: Dict = {}
 _health_check_running = False
+_HEALTH_TIMEOUT = aiohttp.ClientTimeout(total=8)
+# Feeds fetched by ingestion within this window are not probed again by the pinger
+HEALTH_PROBE_AFTER = int(os.environ.get("HEALTH_PROBE_AFTER", "300"))
+
+
+# ── Per-feed circuit breakers (driven by ingest health) ──
+# Consecutive non-green fetches that open a feed's circuit
+FEED_BREAKER_FAILURES = int(os.environ.get("FEED_BREAKER_FAILURES", "3"))
+# First open period (seconds); doubles per consecutive trip up to the max, +/-20% jitter
+FEED_BREAKER_BACKOFF = float(os.environ.get("FEED_BREAKER_BACKOFF", "60"))
+FEED_BREAKER_MAX_BACKOFF = float(os.environ.get("FEED_BREAKER_MAX_BACKOFF", "1800"))
+# Per-feed timeout: this multiple of its usual latency, at least FEED_MIN_BUDGET seconds
+FEED_LATENCY_FACTOR = float(os.environ.get("FEED_LATENCY_FACTOR", "3"))
+FEED_MIN_BUDGET = float(os.environ.get("FEED_MIN_BUDGET", "2"))
+
+_feed_breakers = CircuitBreakers(
+    failure_threshold=FEED_BREAKER_FAILURES,
+    base_backoff=FEED_BREAKER_BACKOFF,
+    max_backoff=FEED_BREAKER_MAX_BACKOFF,
+    budget_factor=FEED_LATENCY_FACTOR,
+    min_budget=FEED_MIN_BUDGET,
+)
+
+
+def _health_status(http_status: int, latency_ms: int) -> str:
+    if http_status in (200, 304):
+        return "green" if latency_ms < 5000 else "amber"
+    return "amber" if http_status else "red"
+
+
+def _record_feed_health(source: str, http_status: int, latency_ms: int, nbytes: int, parsed_ok: bool) -> None:
+    """Record the outcome of a real ingestion fetch (the pinger only covers untouched feeds)."""
+    status = _health_status(http_status, latency_ms)
+    if status == "green" and not parsed_ok:
+        status = "amber"  # reachable but no usable entries
+    _feed_health[source] = {
+        "status": status,
+        "latency_ms": latency_ms,
+        "http": http_status,
+        "bytes": nbytes,
+        "parsed": parsed_ok,
+        "via": "ingest",
+        "last_checked": datetime.now(timezone.utc).isoformat(),
+        "checked_at": time.time(),
+    }
+    _feed_breakers.record(source, status == "green", latency_ms)
 
 
 async def _ping_feed(session: aiohttp.ClientSession, feed: Dict) -> Dict:
@@ -95,37 +315,48 @@ async def _ping_feed(session: aiohttp.ClientSession, feed: Dict) -> Dict:
     url = feed["url"]
     start = time.monotonic()
     try:
-        async with session.get(url, headers={"User-Agent": "NarvoBot/2.0"}, allow_redirects=True) as resp:
+        async with session.get(url, allow_redirects=True, timeout=_HEALTH_TIMEOUT) as resp:
             latency = int((time.monotonic() - start) * 1000)
-            if resp.status == 200:
-                status = "green" if latency < 5000 else "amber"
-            else:
-                status = "amber"
-            return {"source": name, "status": status, "latency_ms": latency, "http": resp.status}
+            return {
+                "source": name,
+                "status": _health_status(resp.status, latency),
+                "latency_ms": latency,
+                "http": resp.status,
+            }
     except asyncio.TimeoutError:
         return {"source": name, "status": "red", "latency_ms": 10000, "http": 0}
     except Exception:
         return {"source": name, "status": "red", "latency_ms": -1, "http": 0}
 
 
-async def run_health_check() -> Dict:
-    """Check all feeds concurrently. Returns full health map."""
+async def run_health_check(force: bool = False) -> Dict:
+    """Probe feeds concurrently. Returns full health map.
+
+    Feeds that ingestion fetched within HEALTH_PROBE_AFTER seconds already have real
+    health data and are skipped unless `force` is set.
+    """
     global _feed_health, _health_check_running
     if _health_check_running:
         return _feed_health
     _health_check_running = True
     now = datetime.now(timezone.utc).isoformat()
+    cutoff = time.time() - HEALTH_PROBE_AFTER
     try:
-        timeout = aiohttp.ClientTimeout(total=8)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            tasks = [_ping_feed(session, f) for f in RSS_FEEDS]
-            results = await asyncio.gather(*tasks)
+        session = get_ingest_session()
+        stale = [
+            f for f in RSS_FEEDS
+            if force or _feed_health.get(f["source"], {}).get("checked_at", 0) < cutoff
+        ]
+        tasks = [_ping_feed(session, f) for f in stale]
+        results = await asyncio.gather(*tasks)
         for r in results:
             _feed_health[r["source"]] = {
                 "status": r["status"],
                 "latency_ms": r["latency_ms"],
                 "http": r["http"],
+                "via": "probe",
                 "last_checked": now,
+                "checked_at": time.time(),
             }
     finally:
         _health_check_running = False
@@ -144,7 +375,12 @@ def get_feed_health() -> Dict:
             "region": feed.get("region", "local"),
             "status": h["status"] if isinstance(h.get("status"), str) else "unknown",
             "latency_ms": h.get("latency_ms", -1),
+            "http": h.get("http"),
+            "bytes": h.get("bytes"),
+            "parsed": h.get("parsed"),
+            "via": h.get("via"),
             "last_checked": h.get("last_checked"),
+            "breaker": _feed_breakers.status(name),
         }
         sources.append(entry)
         if entry["status"] == "green":
@@ -160,61 +396,240 @@ def get_feed_health() -> Dict:
         "amber": amber,
         "red": red,
         "unknown": len(RSS_FEEDS) - green - amber - red,
+        "open_circuits": sum(1 for s in sources if s["breaker"]["state"] != "closed"),
         "sources": sources,
     }
 
-async def fetch_rss_feed(feed_config: Dict, timeout: int = 10) -> List[Dict]:
-    """Fetch and parse a single RSS feed with error handling"""
+
+# ── Conditional GET state (per feed URL) ───────────────────────────────
+# Validators + last normalized items, so unchanged feeds skip download and/or parse.
+_feed_validators: Dict = {}  # { url: { etag, last_modified, body_hash, items, ...counters } }
+
+
+def _validator_state(url: str) -> Dict:
+    state = _feed_validators.get(url)
+    if state is None:
+        state = {
+            "etag": None,
+            "last_modified": None,
+            "body_hash": None,
+            "items": [],
+            "last_bytes": 0,
+            "requests": 0,
+            "not_modified": 0,
+            "unchanged": 0,
+            "parsed": 0,
+            "truncated": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+        }
+        _feed_validators[url] = state
+    return state
+
+
+def _items_from_rows(rows: List[ItemRow], feed_config: Dict) -> List[Article]:
+    """Attach feed-level fields and the ingest-time classification to parsed item tuples,
+    producing read-only Article records (done once per parsed body, never per request)."""
+    source = feed_config["source"]
+    category = feed_config.get("category", "General")
+    region = feed_config.get("region", "Africa")
+    items = []
+    for item_id, title, summary, source_url, image_url, published, tags in rows:
+        label = classify(title, summary, category)
+        items.append(Article(
+            id=item_id,
+            title=title,
+            summary=summary,
+            source=source,
+            source_url=source_url,
+            image_url=image_url,
+            published=published,
+            category=label.category,
+            region=region,
+            truth_score=100,
+            listen_count=0,
+            tags=tags or label.tags,
+            is_breaking=label.is_breaking,
+        ))
+    return items
+
+
+async def fetch_rss_feed(
+    feed_config: Dict,
+    timeout: int = 10,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> List[Dict]:
+    """Fetch and parse a single RSS feed with error handling (shared pooled session by default).
+
+    Returns [] when the fetch fails (see _fetch_feed for the caching and health details).
+    """
+    items, _ = await _fetch_feed(feed_config, timeout, session)
+    return items
+
+
+async def _fetch_feed(
+    feed_config: Dict,
+    timeout: int = 10,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> Tuple[List[Dict], bool]:
+    """Fetch one feed; returns (items, ok), where ok is False when the feed was not fetched
+    and parsed this time (open circuit, timeout, error status, unparseable body).
+
+    Sends If-None-Match / If-Modified-Since from the last response; on 304, or when the
+    body hash is unchanged, the previously normalized items are reused without parsing.
+    Every fetch records status, latency, size and parse result into _feed_health.
+    A feed whose circuit is open is not contacted (its last good items are returned), and
+    each fetch is capped at the feed's latency budget rather than the full `timeout`.
+    Connect, download, parse and normalize times are sampled into _ingest_telemetry.
+    """
     items = []
+    session = session or get_ingest_session()
+    state = _validator_state(feed_config["url"])
+    source = feed_config["source"]
+    if not _feed_breakers.allow(source):
+        return list(state["items"]), False
+    timeout = min(timeout, _feed_breakers.budget(source))
+    headers = {}
+    if state["etag"]:
+        headers["If-None-Match"] = state["etag"]
+    if state["last_modified"]:
+        headers["If-Modified-Since"] = state["last_modified"]
+    start = time.monotonic()
+    latency = -1
+    http_status = 0
+    nbytes = 0
+    parsed_ok = False
+    timings: Dict = {}  # connect_ms filled in by the session's trace hooks
+    sample = {"parse_ms": 0.0, "normalize_ms": 0.0, "entries": 0, "new_items": 0}
+    fetch_start = time.perf_counter()
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-            async with session.get(feed_config["url"], headers={"User-Agent": "NarvoBot/2.0"}) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    parsed = feedparser.parse(content)
-                    
-                    for entry in parsed.entries[:15]:
-                        item_id = hashlib.md5(f"{entry.get('link', '')}{entry.get('title', '')}".encode()).hexdigest()[:12]
-                        
-                        published = None
-                        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                            try:
-                                published = datetime(*entry.published_parsed[:6]).isoformat()
-                            except (TypeError, ValueError):
-                                pass
-                        
-                        image_url = None
-                        if hasattr(entry, 'media_content') and entry.media_content:
-                            image_url = entry.media_content[0].get('url')
-                        elif hasattr(entry, 'enclosures') and entry.enclosures:
-                            for enc in entry.enclosures:
-                                if enc.get('type', '').startswith('image'):
-                                    image_url = enc.get('href')
-                                    break
-                        
-                        summary = entry.get('summary', entry.get('description', ''))[:500]
-                        if '<' in summary:
-                            import re
-                            summary = re.sub(r'<[^>]+>', '', summary)
-                        
-                        items.append({
-                            "id": item_id,
-                            "title": entry.get('title', 'Untitled')[:200],
-                            "summary": summary,
-                            "source": feed_config["source"],
-                            "source_url": entry.get('link'),
-                            "image_url": image_url,
-                            "published": published,
-                            "category": feed_config.get("category", "General"),
-                            "region": feed_config.get("region", "Africa"),
-                            "truth_score": 100,
-                            "listen_count": 0,
-                            "tags": [t.get('term', '') for t in entry.get('tags', [])][:5] if hasattr(entry, 'tags') else [],
-                        })
+        async with session.get(
+            feed_config["url"], headers=headers, timeout=aiohttp.ClientTimeout(total=timeout),
+            trace_request_ctx=timings,
+        ) as response:
+            latency = int((time.monotonic() - start) * 1000)
+            http_status = response.status
+            state["requests"] += 1
+            if response.status == 304 and state["body_hash"]:
+                state["not_modified"] += 1
+                state["bytes_saved"] += state["last_bytes"]
+                items = list(state["items"])
+                parsed_ok = True
+            elif response.status == 200:
+                # Stops reading once the first entries are in (or at FEED_MAX_BYTES)
+                content, truncated = await read_feed_body(response)
+                sample["download_done"] = time.perf_counter()
+                nbytes = len(content)
+                state["truncated"] += int(truncated)
+                body_hash = hashlib.blake2b(content, digest_size=16).hexdigest()
+                state["bytes_downloaded"] += nbytes
+                state["last_bytes"] = nbytes
+                # Validators are kept only for a body we have items for: a 304 must have something to reuse
+                validators = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+                if body_hash == state["body_hash"]:
+                    state["unchanged"] += 1
+                    state.update(validators)
+                    items = list(state["items"])
+                else:
+                    t0 = time.perf_counter()
+                    rows = await parse_feed(content)
+                    t1 = time.perf_counter()
+                    known = {i["id"] for i in state["items"]}
+                    items = _items_from_rows(rows, feed_config)
+                    sample["parse_ms"] = (t1 - t0) * 1000
+                    sample["normalize_ms"] = (time.perf_counter() - t1) * 1000
+                    sample["new_items"] = sum(1 for i in items if i["id"] not in known)
+                    state["parsed"] += 1
+                    state["body_hash"] = body_hash
+                    state["items"] = items
+                    state.update(validators)
+                parsed_ok = bool(items)
+    except asyncio.TimeoutError:
+        latency = int(timeout * 1000)
+        logger.error("Error fetching %s: timed out after %.1fs", feed_config["source"], timeout)
     except Exception as e:
         logger.error("Error fetching %s: %s", feed_config["source"], e)
 
-    return items
+    _record_feed_health(feed_config["source"], http_status, latency, nbytes, parsed_ok)
+    end = time.perf_counter()
+    connect_ms = timings.get("connect_ms", 0.0)
+    download_done = sample.pop("download_done", None) or end
+    sample.update(
+        connect_ms=connect_ms,
+        download_ms=max(0.0, (download_done - fetch_start) * 1000 - connect_ms),
+        total_ms=(end - fetch_start) * 1000,
+        bytes=nbytes,
+        entries=len(items),
+    )
+    _ingest_telemetry.record(source, sample)
+    return items, parsed_ok
+
+
+# ── Ingestion telemetry ──
+# Per-feed samples kept (ring buffer; oldest overwritten)
+INGEST_TELEMETRY_SAMPLES = int(os.environ.get("INGEST_TELEMETRY_SAMPLES", "256"))
+_TELEMETRY_METRICS = (
+    "connect_ms", "download_ms", "parse_ms", "normalize_ms", "total_ms", "bytes", "entries", "new_items",
+)
+# total_ms histogram bucket upper bounds (ms)
+_TELEMETRY_EDGES = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_ingest_telemetry = MetricRings(_TELEMETRY_METRICS, capacity=INGEST_TELEMETRY_SAMPLES)
+
+
+def get_ingest_telemetry() -> Dict:
+    """Per-feed p50/p95/p99 of fetch stages, bytes, entries and new items, slowest feeds first."""
+    feeds = []
+    for source in _ingest_telemetry.keys():
+        summary = _ingest_telemetry.summary(source)
+        summary["source"] = source
+        summary["total_ms_histogram"] = _ingest_telemetry.histogram(source, "total_ms", _TELEMETRY_EDGES)
+        feeds.append(summary)
+    time_spent = sum(f["total_ms"]["sum"] for f in feeds) or 1.0
+    for f in feeds:
+        f["share_of_time"] = round(f["total_ms"]["sum"] / time_spent, 3)
+    feeds.sort(key=lambda f: f["total_ms"]["p95"], reverse=True)
+    return {
+        "samples_per_feed": INGEST_TELEMETRY_SAMPLES,
+        "fetches_recorded": _ingest_telemetry.recorded,
+        "histogram_edges_ms": list(_TELEMETRY_EDGES),
+        "feeds": feeds,
+    }
+
+
+def get_feed_cache_stats() -> Dict:
+    """Per-feed conditional-GET hit ratios: 304s and unchanged bodies vs. full parses."""
+    feeds = []
+    totals = dict.fromkeys(
+        ("requests", "not_modified", "unchanged", "parsed", "truncated", "bytes_downloaded", "bytes_saved"), 0
+    )
+    for feed in RSS_FEEDS:
+        state = _feed_validators.get(feed["url"])
+        if not state:
+            continue
+        hits = state["not_modified"] + state["unchanged"]
+        feeds.append({
+            "name": feed["source"],
+            "requests": state["requests"],
+            "not_modified": state["not_modified"],
+            "unchanged": state["unchanged"],
+            "parsed": state["parsed"],
+            "truncated": state["truncated"],
+            "hit_ratio": round(hits / state["requests"], 3) if state["requests"] else 0.0,
+            "bytes_downloaded": state["bytes_downloaded"],
+            "bytes_saved": state["bytes_saved"],
+            "has_etag": bool(state["etag"]),
+            "has_last_modified": bool(state["last_modified"]),
+        })
+        for key in totals:
+            totals[key] += state[key]
+    hits = totals["not_modified"] + totals["unchanged"]
+    totals["hit_ratio"] = round(hits / totals["requests"], 3) if totals["requests"] else 0.0
+    return {"totals": totals, "feeds": feeds}
+
 
 async def fetch_all_news(
     limit: int = 50,
@@ -223,7 +638,8 @@ async def fetch_all_news(
 ) -> List[Dict]:
     """Fetch news from all RSS feeds (single source of truth for RSS)."""
     all_news = []
-    tasks = [fetch_rss_feed(feed) for feed in RSS_FEEDS]
+    session = get_ingest_session()
+    tasks = [fetch_rss_feed(feed, session=session) for feed in RSS_FEEDS]
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
     for items in results:
@@ -274,58 +690,123 @@ async def search_news(query: str, category: Optional[str] = None, limit: int = 2
         "query": query
     }
 
+# ── Materialized views (breaking, digest) ──────────────────────────────
+
+# Breaking candidates are the newest stories; /news/breaking serves up to BREAKING_VIEW_SIZE
+BREAKING_SCAN = 30
+BREAKING_VIEW_SIZE = 3
+DIGEST_SIZE = 5
+
+
+@dataclass(frozen=True)
+class MaterializedView:
+    """A ready-to-serve JSON document derived from one news snapshot.
+
+    `version` and `etag` only change when the document's content changes, so clients
+    polling with If-None-Match get 304s across snapshots that did not affect it.
+    """
+    name: str
+    payload: Any
+    body: bytes
+    etag: str
+    version: int
+    snapshot_version: int
+    updated_at: str
+
+
+_materialized: Dict[str, MaterializedView] = {}
+_materialized_from: Optional[NewsSnapshot] = None
+
+
+def _breaking_payload(snap: NewsSnapshot) -> List[Dict]:
+    latest = snap.items[:BREAKING_SCAN]
+    breaking = [dict(story) for story in latest if story.get("is_breaking")][:BREAKING_VIEW_SIZE]
+    if not breaking and latest:
+        breaking = [{**latest[0], "is_developing": True}]
+    return breaking
+
+
+def _digest_payload(snap: NewsSnapshot) -> Dict:
+    return {
+        "title": "NARVO DAILY DIGEST",
+        "top_stories": [
+            {"id": s.get("id"), "title": s.get("title"), "category": s.get("category"), "source": s.get("source")}
+            for s in snap.items[:DIGEST_SIZE]
+        ],
+        "briefing_available": True,
+    }
+
+
+_VIEW_BUILDERS = {"breaking": _breaking_payload, "digest": _digest_payload}
+
+
+def _materialize_views(snap: NewsSnapshot) -> None:
+    """Rebuild every view for `snap`; unchanged documents keep their version and ETag."""
+    global _materialized_from
+    for name, build in _VIEW_BUILDERS.items():
+        payload = build(snap)
+        content = json.dumps(payload, sort_keys=True, default=dict).encode()
+        etag = f'"{name}-{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+        previous = _materialized.get(name)
+        if previous is not None and previous.etag == etag:
+            _materialized[name] = replace(previous, snapshot_version=snap.version)
+            continue
+        updated_at = datetime.now(timezone.utc).isoformat()
+        if name == "digest":
+            payload = {**payload, "generated_at": updated_at}
+        _materialized[name] = MaterializedView(
+            name=name,
+            payload=payload,
+            body=json.dumps(payload, default=dict).encode(),
+            etag=etag,
+            version=(previous.version + 1) if previous is not None else 1,
+            snapshot_version=snap.version,
+            updated_at=updated_at,
+        )
+    _materialized_from = snap
+
+
+async def get_news_view(name: str) -> MaterializedView:
+    """Materialized view over the current snapshot (built by the publish hook, or lazily here)."""
+    snap = await get_news_snapshot()
+    if _materialized_from is not snap:
+        _materialize_views(snap)
+    return _materialized[name]
+
+
+async def get_news_view_versions() -> Dict:
+    """Version stamps of every materialized view, for cheap client polling."""
+    views = [await get_news_view(name) for name in _VIEW_BUILDERS]
+    return {
+        v.name: {
+            "version": v.version,
+            "etag": v.etag,
+            "updated_at": v.updated_at,
+            "snapshot_version": v.snapshot_version,
+        }
+        for v in views
+    }
+
+
 async def get_breaking_news() -> Optional[Dict]:
     """Get breaking/developing news (single item)."""
-    all_news = await fetch_all_news(limit=30)
-    breaking_keywords = ['breaking', 'urgent', 'flash', 'just in', 'developing', 'live']
-    for item in all_news:
-        title_lower = item.get("title", "").lower()
-        if any(kw in title_lower for kw in breaking_keywords):
-            return {**item, "is_breaking": True}
-    if all_news:
-        return {**all_news[0], "is_developing": True}
-    return None
+    breaking = (await get_news_view("breaking")).payload
+    return breaking[0] if breaking else None
 
 
 async def get_breaking_news_list(max_items: int = 3) -> List[Dict]:
     """Get breaking/urgent news as a list (for API compatibility)."""
-    all_news = await get_cached_all_news()
-    all_news = (all_news or [])[:30]
-    breaking_keywords = ["breaking", "urgent", "flash", "just in", "developing"]
-    breaking = []
-    for story in all_news:
-        title_lower = (story.get("title") or "").lower()
-        if any(kw in title_lower for kw in breaking_keywords):
-            breaking.append(story)
-    if not breaking and all_news:
-        latest = dict(all_news[0])
-        latest["is_developing"] = True
-        breaking = [latest]
-    return breaking[:max_items]
+    return (await get_news_view("breaking")).payload[:max_items]
+
 
 async def get_trending_topics() -> Dict:
-    """Get trending topics from recent news"""
-    all_news = await fetch_all_news(limit=50)
-    
-    category_counts = {}
-    keyword_counts = {}
-    keywords_to_track = ["election", "economy", "trade", "climate", "technology", "health", "politics", "africa"]
-    
-    for item in all_news:
-        cat = item.get("category", "general").lower()
-        category_counts[cat] = category_counts.get(cat, 0) + 1
-        
-        title_lower = item.get("title", "").lower()
-        for kw in keywords_to_track:
-            if kw in title_lower:
-                keyword_counts[kw] = keyword_counts.get(kw, 0) + 1
-    
-    top_categories = sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    top_keywords = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    
+    """Get trending topics from recent news (served from the incremental trending counters)."""
+    await get_news_snapshot()
     return {
-        "tags": [f"#{cat.upper()}" for cat, _ in top_categories],
-        "topics": [{"name": kw.title(), "count": f"{cnt * 100}+"} for kw, cnt in top_keywords][:5],
+        "tags": [f"#{c['category'].upper()}" for c in get_trending_categories(5)],
+        "topics": [
+            {"name": t["term"].title(), "count": str(t["count"]), "trend": t["trend"]} for t in get_trending_terms(5)
+        ],
         "updated_at": datetime.now(timezone.utc).isoformat()
     }
 
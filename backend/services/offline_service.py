@@ -3,10 +3,11 @@ from datetime import datetime, timezone
 from typing import Dict, List
 
 from lib.supabase_db import get_supabase_db
+from services.fulltext_service import get_full_text
 
 
 def save_article(article_data: Dict) -> Dict:
-    """Save an article for offline reading"""
+    """Save an article for offline reading (with the prefetched article text when cached)"""
     db = get_supabase_db()
     doc = {
         "story_id": article_data.get("story_id"),
@@ -16,6 +17,7 @@ def save_article(article_data: Dict) -> Dict:
         "source": article_data.get("source", ""),
         "category": article_data.get("category", "General"),
         "image_url": article_data.get("image_url"),
+        "full_text": article_data.get("full_text") or get_full_text(article_data.get("story_id")) or "",
         "saved_at": datetime.now(timezone.utc).isoformat(),
     }
     db.table("offline_articles").upsert(doc, on_conflict="story_id").execute()
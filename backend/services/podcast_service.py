@@ -8,6 +8,8 @@ import hashlib
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
 
+from models.article import Episode
+
 logger = logging.getLogger(__name__)
 
 # Real African / global podcast RSS feeds
@@ -25,9 +27,10 @@ PODCAST_FEEDS = [
 ]
 
 # In-memory cache
-_podcast_cache: Dict[str, dict] = {}
+_podcast_cache: Dict[str, Episode] = {}
 _cache_time: Optional[datetime] = None
 CACHE_TTL = 1800  # 30 min
+_refresh_task: Optional[asyncio.Task] = None
 
 
 def _parse_duration(entry) -> str:
@@ -75,17 +78,17 @@ def _parse_feed(feed_info: dict) -> List[dict]:
                 except Exception:
                     pass
             
-            ep = {
-                "id": ep_id,
-                "episode": entry.get("itunes_episode", ""),
-                "title": title,
-                "duration": _parse_duration(entry),
-                "description": entry.get("summary", entry.get("description", ""))[:500],
-                "category": feed_info.get("category", "General"),
-                "published": published,
-                "audio_url": audio_url,
-                "source": feed.feed.get("title", feed_info.get("fallback_title", "")),
-            }
+            ep = Episode(
+                id=ep_id,
+                episode=entry.get("itunes_episode", ""),
+                title=title,
+                duration=_parse_duration(entry),
+                description=entry.get("summary", entry.get("description", ""))[:500],
+                category=feed_info.get("category", "General"),
+                published=published,
+                audio_url=audio_url,
+                source=feed.feed.get("title", feed_info.get("fallback_title", "")),
+            )
             episodes.append(ep)
             _podcast_cache[ep_id] = ep
     except Exception as e:
@@ -93,24 +96,41 @@ def _parse_feed(feed_info: dict) -> List[dict]:
     return episodes
 
 
-async def get_podcasts(sort: str = "latest", limit: int = 10, category: str = None) -> List[dict]:
-    """Fetch podcast episodes from all feeds"""
+def _cache_is_stale() -> bool:
+    return _cache_time is None or (datetime.now(timezone.utc) - _cache_time).total_seconds() >= CACHE_TTL
+
+
+async def refresh_podcasts() -> None:
+    """Re-parse all podcast feeds into the cache."""
     global _cache_time
-    
-    # Use cache if fresh
-    if _cache_time and (datetime.now(timezone.utc) - _cache_time).seconds < CACHE_TTL and _podcast_cache:
-        episodes = list(_podcast_cache.values())
-    else:
-        episodes = []
-        # Parse feeds concurrently-ish (feedparser is sync, but we batch)
-        loop = asyncio.get_event_loop()
-        for feed_info in PODCAST_FEEDS:
-            try:
-                parsed = await loop.run_in_executor(None, _parse_feed, feed_info)
-                episodes.extend(parsed)
-            except Exception as e:
-                logger.error("[Podcast] Error fetching %s: %s", feed_info.get("url"), e)
-        _cache_time = datetime.now(timezone.utc)
+    # Parse feeds concurrently-ish (feedparser is sync, but we batch)
+    loop = asyncio.get_event_loop()
+    for feed_info in PODCAST_FEEDS:
+        try:
+            await loop.run_in_executor(None, _parse_feed, feed_info)
+        except Exception as e:
+            logger.error("[Podcast] Error fetching %s: %s", feed_info.get("url"), e)
+    _cache_time = datetime.now(timezone.utc)
+
+
+def refresh_in_background() -> None:
+    """Schedule a podcast refresh unless one is already running."""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.get_running_loop().create_task(refresh_podcasts())
+
+
+async def get_podcasts(sort: str = "latest", limit: int = 10, category: str = None) -> List[dict]:
+    """Fetch podcast episodes from all feeds.
+
+    Only an empty cache waits on the feeds; a stale one is served while it refreshes in the background.
+    """
+    if not _podcast_cache:
+        refresh_in_background()
+        await asyncio.shield(_refresh_task)
+    elif _cache_is_stale():
+        refresh_in_background()
+    episodes = list(_podcast_cache.values())
     
     # Filter by category
     if category and category != "all":
@@ -125,6 +145,27 @@ async def get_podcasts(sort: str = "latest", limit: int = 10, category: str = No
     return episodes[:limit]
 
 
+def export_podcast_cache() -> Optional[Dict]:
+    """Cached episodes as plain data for the on-disk warm-restart cache."""
+    if not _podcast_cache or _cache_time is None:
+        return None
+    return {"cached_at": _cache_time.isoformat(), "episodes": list(_podcast_cache.values())}
+
+
+def restore_podcast_cache(data: Dict) -> int:
+    """Seed the cache from disk at startup, keeping the original fetch time."""
+    global _cache_time
+    if _podcast_cache or not data.get("episodes"):
+        return 0
+    for ep in data["episodes"]:
+        _podcast_cache[ep["id"]] = Episode.from_mapping(ep)
+    try:
+        _cache_time = datetime.fromisoformat(data["cached_at"])
+    except (KeyError, TypeError, ValueError):
+        _cache_time = None
+    return len(data["episodes"])
+
+
 def get_podcast_by_id(podcast_id: str) -> Optional[dict]:
     """Get a specific podcast episode by ID"""
     return _podcast_cache.get(podcast_id)
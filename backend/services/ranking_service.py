@@ -0,0 +1,366 @@
+# Ranking service - precomputed top-stories order, re-scored incrementally as stories and listens change
+import asyncio
+import bisect
+import heapq
+import logging
+import math
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A story's score halves every this many hours
+RANKING_HALF_LIFE_HOURS = float(os.environ.get("RANKING_HALF_LIFE_HOURS", "6"))
+# Score multipliers: breaking stories, each doubling of sources reporting the event, each doubling of listens
+RANKING_BREAKING_BOOST = float(os.environ.get("RANKING_BREAKING_BOOST", "1.5"))
+RANKING_CLUSTER_WEIGHT = float(os.environ.get("RANKING_CLUSTER_WEIGHT", "0.5"))
+RANKING_LISTEN_WEIGHT = float(os.environ.get("RANKING_LISTEN_WEIGHT", "0.25"))
+# Each further story from the same source in the ranked list is multiplied by this (stops one feed flooding the top)
+RANKING_SOURCE_REPEAT_PENALTY = float(
+    os.environ.get("RANKING_SOURCE_REPEAT_PENALTY", "0.7")
+)
+# Listen counts come from listening_history plays within this window, refreshed this often (seconds)
+RANKING_LISTEN_WINDOW_HOURS = int(os.environ.get("RANKING_LISTEN_WINDOW_HOURS", "48"))
+RANKING_LISTEN_REFRESH = float(os.environ.get("RANKING_LISTEN_REFRESH", "300"))
+_LISTEN_ROWS_LIMIT = 20000
+# Top-stories score multiplier per source (default 1.0)
+SOURCE_AUTHORITY: Dict[str, float] = {
+    "BBC Africa": 1.2,
+    "Reuters World": 1.2,
+    "BBC World Service": 1.2,
+}
+# Unfiltered rankings are computed once per change to this depth and sliced by requests
+_TOP_CACHED = 100
+
+
+def _published_ts(item: Mapping) -> Optional[float]:
+    published = item.get("published")
+    if not published:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(published).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class RankingEngine:
+    """Stories ordered by a decayed score, maintained incrementally.
+
+    score(now) = base * 2 ** (-(now - published) / half_life), where base multiplies source
+    authority, cluster breadth (distinct sources on the event), the breaking flag and
+    listens. Every story decays at the same rate, so the order never changes with time
+    alone: each story is keyed once by log(base) + published * ln2 / half_life, and only
+    stories whose inputs change are re-keyed. Keys are kept in per-source sorted lists;
+    the ranked list merges them with a growing per-source repeat penalty.
+    """
+
+    def __init__(
+        self,
+        half_life_hours: float = RANKING_HALF_LIFE_HOURS,
+        breaking_boost: float = RANKING_BREAKING_BOOST,
+        cluster_weight: float = RANKING_CLUSTER_WEIGHT,
+        listen_weight: float = RANKING_LISTEN_WEIGHT,
+        repeat_penalty: float = RANKING_SOURCE_REPEAT_PENALTY,
+        authority: Optional[Mapping[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.rate = math.log(2) / (half_life_hours * 3600)
+        self.breaking_boost = breaking_boost
+        self.cluster_weight = cluster_weight
+        self.listen_weight = listen_weight
+        self.repeat_cost = -math.log(repeat_penalty)
+        self.authority: Dict[str, float] = dict(authority or {})
+        self._clock = clock
+        # id -> (key, source, published ts, item)
+        self._entries: Dict[str, Tuple[float, str, float, Mapping]] = {}
+        self._by_source: Dict[str, List[Tuple[float, str]]] = (
+            {}
+        )  # source -> [(-key, id)], best first
+        self._cluster_sources: Dict[str, int] = {}
+        self._listens: Dict[str, int] = {}
+        self.version = 0
+        self._top_version = -1
+        self._top: List[str] = []  # ranked ids for the current version, computed once
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _log_base(self, item_id: str, item: Mapping) -> float:
+        base = math.log(max(self.authority.get(item.get("source") or "", 1.0), 1e-6))
+        sources = self._cluster_sources.get(item_id, 1)
+        base += math.log(1 + self.cluster_weight * math.log2(max(sources, 1)))
+        if item.get("is_breaking"):
+            base += math.log(self.breaking_boost)
+        base += math.log(
+            1 + self.listen_weight * math.log2(1 + self._listens.get(item_id, 0))
+        )
+        return base
+
+    def _insert(self, item_id: str, item: Mapping, ts: float) -> None:
+        key = self._log_base(item_id, item) + ts * self.rate
+        source = item.get("source") or ""
+        self._entries[item_id] = (key, source, ts, item)
+        bisect.insort(self._by_source.setdefault(source, []), (-key, item_id))
+
+    def _drop(self, item_id: str) -> Optional[Tuple[float, str, float, Mapping]]:
+        entry = self._entries.pop(item_id, None)
+        if entry is not None:
+            key, source, _, _ = entry
+            ranked = self._by_source[source]
+            del ranked[bisect.bisect_left(ranked, (-key, item_id))]
+            if not ranked:
+                del self._by_source[source]
+        return entry
+
+    def _rescore(self, item_id: str) -> bool:
+        entry = self._entries.get(item_id)
+        if entry is None:
+            return False
+        key, _, ts, item = entry
+        if self._log_base(item_id, item) + ts * self.rate == key:
+            return False
+        self._drop(item_id)
+        self._insert(item_id, item, ts)
+        return True
+
+    def sync(
+        self, items: Mapping[str, Mapping], cluster_sources: Mapping[str, int]
+    ) -> Tuple[int, int, int]:
+        """Rank exactly `items` (id -> item) given each story's cluster breadth; returns (added, removed, rescored)."""
+        now = self._clock()
+        gone = [i for i in self._entries if i not in items]
+        for item_id in gone:
+            self._drop(item_id)
+            self._cluster_sources.pop(item_id, None)
+        changed = [
+            i
+            for i in items
+            if cluster_sources.get(i, 1) != self._cluster_sources.get(i, 1)
+        ]
+        for item_id in changed:
+            self._cluster_sources[item_id] = cluster_sources.get(item_id, 1)
+        added = 0
+        for item_id, item in items.items():
+            if item_id not in self._entries:
+                ts = _published_ts(item)
+                self._insert(item_id, item, min(ts, now) if ts is not None else now)
+                added += 1
+        rescored = sum(self._rescore(i) for i in changed)
+        if added or gone or rescored:
+            self.version += 1
+        return added, len(gone), rescored
+
+    def set_listens(self, counts: Mapping[str, int]) -> int:
+        """Replace listen counts; only stories whose count changed are re-scored."""
+        changed = {
+            i
+            for i in counts.keys() | self._listens.keys()
+            if counts.get(i, 0) != self._listens.get(i, 0)
+        }
+        self._listens = {i: c for i, c in counts.items() if c}
+        rescored = sum(self._rescore(i) for i in changed)
+        if rescored:
+            self.version += 1
+        return rescored
+
+    def add_listen(self, item_id: str) -> None:
+        self._listens[item_id] = self._listens.get(item_id, 0) + 1
+        if self._rescore(item_id):
+            self.version += 1
+
+    def _merged(
+        self, accept: Optional[Callable[[Mapping], bool]] = None
+    ) -> Iterator[str]:
+        """Ids best first, the n-th story of a source penalised n times (exact k-way merge)."""
+        heads: List[Tuple[float, str, str, int, int]] = (
+            []
+        )  # (-adjusted, id, source, index, repeats)
+
+        def push(source: str, index: int, repeats: int) -> None:
+            ranked = self._by_source[source]
+            while index < len(ranked):
+                neg_key, item_id = ranked[index]
+                if accept is None or accept(self._entries[item_id][3]):
+                    heapq.heappush(
+                        heads,
+                        (
+                            neg_key + repeats * self.repeat_cost,
+                            item_id,
+                            source,
+                            index,
+                            repeats,
+                        ),
+                    )
+                    return
+                index += 1
+
+        for source in self._by_source:
+            push(source, 0, 0)
+        while heads:
+            _, item_id, source, index, repeats = heapq.heappop(heads)
+            yield item_id
+            push(source, index + 1, repeats + 1)
+
+    def top(
+        self, limit: int, accept: Optional[Callable[[Mapping], bool]] = None
+    ) -> List[Tuple[Mapping, float]]:
+        """(item, current score) for the best `limit` stories, optionally only those `accept` allows."""
+        if accept is None and limit <= _TOP_CACHED:
+            if self._top_version != self.version:
+                self._top = list(islice(self._merged(), _TOP_CACHED))
+                self._top_version = self.version
+            ids = self._top[:limit]
+        else:
+            ids = list(islice(self._merged(accept), limit))
+        now = self._clock()
+        out = []
+        for item_id in ids:
+            key, _, _, item = self._entries[item_id]
+            out.append((item, math.exp(key - now * self.rate)))
+        return out
+
+    def stats(self) -> Dict:
+        return {
+            "stories": len(self._entries),
+            "sources": len(self._by_source),
+            "with_listens": len(self._listens),
+            "multi_source_events": sum(
+                1 for n in self._cluster_sources.values() if n > 1
+            ),
+            "version": self.version,
+        }
+
+
+_engine = RankingEngine(authority=SOURCE_AUTHORITY)
+_ranked_from = None  # snapshot the engine was last synced with
+_listens_task: Optional[asyncio.Task] = None
+
+
+def update_ranking(snap) -> None:
+    """Snapshot publish hook: score stories that entered, drop those that left, re-score changed clusters."""
+    global _ranked_from
+    from services.aggregator_service import get_cached_aggregator_items
+    from services.cluster_service import clusters_for
+
+    start = time.perf_counter()
+    index = clusters_for(snap, get_cached_aggregator_items())
+    breadth = {
+        item_id: len(cluster.sources) for item_id, cluster in index.by_item.items()
+    }
+    added, removed, rescored = _engine.sync(snap.by_id, breadth)
+    _ranked_from = snap
+    if added or removed or rescored:
+        logger.info(
+            "[Ranking] +%s -%s ~%s stories in %.1fms (%s ranked)",
+            added,
+            removed,
+            rescored,
+            (time.perf_counter() - start) * 1000,
+            len(_engine),
+        )
+
+
+async def get_top_stories(
+    limit: int = 20, region: Optional[str] = None, category: Optional[str] = None
+) -> List[Dict]:
+    """Best stories right now (score included), from the precomputed ranking."""
+    from services.news_service import get_news_snapshot
+
+    snap = await get_news_snapshot()
+    if (
+        _ranked_from is not snap
+    ):  # engine replaced or the hook has not run for this snapshot
+        update_ranking(snap)
+    region_l, category_l = (region or "").lower(), (category or "").lower()
+
+    def matches(item: Mapping) -> bool:
+        return (not region_l or (item.get("region") or "").lower() == region_l) and (
+            not category_l or (item.get("category") or "").lower() == category_l
+        )
+
+    accept = (
+        matches if region or category else None
+    )  # unfiltered requests use the cached top list
+    return [
+        {**item, "rank_score": round(score, 4)}
+        for item, score in _engine.top(limit, accept)
+    ]
+
+
+# ── Listen counts (listening_history) ──
+
+
+def _fetch_listen_counts() -> Counter:
+    from lib.supabase_db import get_supabase_db
+
+    since = (
+        datetime.now(timezone.utc) - timedelta(hours=RANKING_LISTEN_WINDOW_HOURS)
+    ).isoformat()
+    r = (
+        get_supabase_db()
+        .table("listening_history")
+        .select("track_id")
+        .gte("played_at", since)
+        .limit(_LISTEN_ROWS_LIMIT)
+        .execute()
+    )
+    return Counter(row["track_id"] for row in r.data or [] if row.get("track_id"))
+
+
+async def refresh_listen_counts() -> int:
+    """Reload recent play counts per story (blocking Supabase call runs in a thread)."""
+    counts = await asyncio.to_thread(_fetch_listen_counts)
+    rescored = _engine.set_listens(counts)
+    if rescored:
+        logger.info(
+            "[Ranking] Listen counts: %s stories played, %s re-scored",
+            len(counts),
+            rescored,
+        )
+    return rescored
+
+
+def record_listen(story_id: str) -> None:
+    """A play was just recorded: count it now rather than at the next refresh."""
+    if story_id:
+        _engine.add_listen(story_id)
+
+
+async def _run_listen_refresher() -> None:
+    while True:
+        try:
+            await refresh_listen_counts()
+        except Exception as e:
+            logger.warning("[Ranking] Listen count refresh failed: %s", e)
+        await asyncio.sleep(RANKING_LISTEN_REFRESH)
+
+
+def start_listen_refresher() -> None:
+    """Keep listen counts current (app startup)."""
+    global _listens_task
+    if _listens_task is None or _listens_task.done():
+        _listens_task = asyncio.get_running_loop().create_task(_run_listen_refresher())
+
+
+async def stop_listen_refresher() -> None:
+    global _listens_task
+    if _listens_task is not None:
+        _listens_task.cancel()
+        _listens_task = None
+
+
+def get_ranking_status() -> Dict:
+    return {
+        "half_life_hours": RANKING_HALF_LIFE_HOURS,
+        "source_repeat_penalty": RANKING_SOURCE_REPEAT_PENALTY,
+        "listen_refresher_running": _listens_task is not None
+        and not _listens_task.done(),
+        **_engine.stats(),
+    }
@@ -0,0 +1,237 @@
+# Snapshot service - stale-while-revalidate, single-flight news snapshots
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from models.article import Article
+
+logger = logging.getLogger(__name__)
+
+ViewKey = Tuple[Optional[str], Optional[str]]
+# Snapshot items are read-only; per-request enrichment lives in side tables
+Item = Mapping
+
+
+def freeze(item: Mapping) -> Item:
+    """Read-only Article record for an item (records are returned as is)."""
+    return Article.from_mapping(item)
+
+
+def build_views(items: Sequence[Item]) -> Dict[ViewKey, Sequence[Item]]:
+    """(region, category) -> items in input order, lower-cased keys, None = any.
+
+    One pass over a newest-first list yields every per-region, per-category and
+    region x category view already sorted, so list endpoints only slice.
+    """
+    views: Dict[ViewKey, Sequence[Item]] = {(None, None): items}
+    for item in items:
+        region = (item.get("region") or "").lower()
+        category = (item.get("category") or "").lower()
+        for key in ((region, None), (None, category), (region, category)):
+            views.setdefault(key, []).append(item)
+    return views
+
+
+def view_key(region: Optional[str], category: Optional[str]) -> ViewKey:
+    return (region.lower() if region else None, category.lower() if category else None)
+
+
+@dataclass
+class NewsSnapshot:
+    """One published, immutable build of the RSS news list (newest first).
+
+    `items` is a tuple of read-only mappings, so handlers can hold or slice it without copying.
+    """
+
+    items: Tuple[Item, ...]
+    version: int
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.created_at)
+
+    @property
+    def created_iso(self) -> str:
+        return datetime.fromtimestamp(self.created_at, tz=timezone.utc).isoformat()
+
+    @cached_property
+    def by_id(self) -> Dict[str, Item]:
+        """id -> item, built once per snapshot."""
+        return {item["id"]: item for item in self.items if item.get("id")}
+
+    @cached_property
+    def views(self) -> Dict[ViewKey, Sequence[Item]]:
+        """Pre-sorted region/category views, built once per snapshot."""
+        return build_views(self.items)
+
+    def view(
+        self, region: Optional[str] = None, category: Optional[str] = None
+    ) -> Sequence[Item]:
+        return self.views.get(view_key(region, category), ())
+
+
+class EvictedItems:
+    """Bounded id -> item map of items that dropped out of an index (oldest evicted first).
+
+    Lets links to rotated-out stories keep resolving without a rescan or refetch.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._items: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def retire(self, old: Dict[str, Dict], new: Dict[str, Dict]) -> int:
+        """Remember items present in `old` but missing from `new`; returns how many were added."""
+        added = 0
+        for item_id, item in old.items():
+            if item_id not in new:
+                self._items[item_id] = item
+                self._items.move_to_end(item_id)
+                added += 1
+        while len(self._items) > self.limit:
+            self._items.popitem(last=False)
+        return added
+
+    def get(self, item_id: str) -> Optional[Dict]:
+        return self._items.get(item_id)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SnapshotManager:
+    """Serve the last good snapshot immediately; rebuild it in the background once stale.
+
+    Concurrent refresh requests share one in-flight task, so a cache expiry under load
+    costs one upstream fan-out instead of one per request. Only a cold start (no snapshot
+    yet) waits, and every cold caller waits on that same task. While `maintained()`
+    returns True (e.g. the feed scheduler is merging deltas), TTL rebuilds are skipped.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Awaitable[List[Dict]]],
+        ttl: int = 120,
+        retry_after: int = 30,
+        maintained: Optional[Callable[[], bool]] = None,
+        on_publish: Optional[
+            Callable[[Optional[NewsSnapshot], NewsSnapshot], None]
+        ] = None,
+    ):
+        self._loader = loader
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.maintained = maintained
+        self.on_publish = on_publish
+        self._retry_at = 0.0
+        self._snapshot: Optional[NewsSnapshot] = None
+        self._version = 0
+        self._task: Optional[asyncio.Task] = None
+        self.refresh_count = 0
+        self.failed_refreshes = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def current(self) -> Optional[NewsSnapshot]:
+        return self._snapshot
+
+    @property
+    def refreshing(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def is_stale(self) -> bool:
+        if self._snapshot is None:
+            return True
+        if self.maintained is not None and self.maintained():
+            return False
+        return self._snapshot.age_seconds >= self.ttl
+
+    async def get(self) -> NewsSnapshot:
+        """Return the current snapshot, scheduling a background refresh if it is stale."""
+        snap = self._snapshot
+        if snap is None:
+            return await self.refresh()
+        if self.is_stale() and time.monotonic() >= self._retry_at:
+            self.refresh_in_background()
+        return snap
+
+    def refresh_in_background(self) -> asyncio.Task:
+        """Start a refresh unless one is already in flight; returns the shared task."""
+        task = self._task
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
+            task = asyncio.get_running_loop().create_task(self._rebuild())
+            self._task = task
+        return task
+
+    async def refresh(self) -> NewsSnapshot:
+        """Wait for the (shared) in-flight refresh and return the resulting snapshot."""
+        return await asyncio.shield(self.refresh_in_background())
+
+    def publish(
+        self, items: Iterable[Mapping], created_at: Optional[float] = None
+    ) -> NewsSnapshot:
+        """Install a new snapshot (items frozen into a tuple) with the next version number."""
+        self._version += 1
+        snap = NewsSnapshot(
+            items=tuple(freeze(i) for i in items),
+            version=self._version,
+            created_at=created_at or time.time(),
+        )
+        previous, self._snapshot = self._snapshot, snap
+        if self.on_publish is not None:
+            try:
+                self.on_publish(previous, snap)
+            except Exception as e:
+                logger.error("[Snapshot] on_publish hook failed: %s", e)
+        return snap
+
+    async def _rebuild(self) -> NewsSnapshot:
+        self.refresh_count += 1
+        try:
+            items = await self._loader()
+        except Exception as e:
+            items = None
+            self.last_error = str(e)
+            logger.error("[Snapshot] Refresh failed: %s", e)
+        if not items and self._snapshot is not None and self._snapshot.items:
+            # Keep serving the last good snapshot; retry after a short pause.
+            self.failed_refreshes += 1
+            self._retry_at = time.monotonic() + self.retry_after
+            return self._snapshot
+        return self.publish(items or [])
+
+    def status(self) -> Dict:
+        snap = self._snapshot
+        return {
+            "version": snap.version if snap else 0,
+            "count": len(snap.items) if snap else 0,
+            "created_at": snap.created_iso if snap else None,
+            "age_seconds": round(snap.age_seconds, 1) if snap else None,
+            "ttl_seconds": self.ttl,
+            "stale": self.is_stale(),
+            "maintained": bool(self.maintained and self.maintained()),
+            "refreshing": self.refreshing,
+            "refresh_count": self.refresh_count,
+            "failed_refreshes": self.failed_refreshes,
+            "last_error": self.last_error,
+        }
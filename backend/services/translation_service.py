@@ -2,8 +2,9 @@
 import json
 import logging
 import re as _re
-from typing import Dict, Optional
+from typing import Dict, List, Mapping, Optional, Sequence
 
+from services.fulltext_service import FULLTEXT_PROMPT_CHARS
 from services.llm_gemini import generate_gemini
 
 logger = logging.getLogger(__name__)
@@ -176,10 +177,73 @@ Write ONLY the rewritten text, no explanations.""" + _no_sfx_rule,
         }
 
 
+def _strip_code_fence(text: str) -> str:
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.split("```")[1]
+        if cleaned.startswith("json"):
+            cleaned = cleaned[4:]
+    return cleaned.strip()
+
+
+async def translate_headlines(
+    headlines: Sequence[Mapping[str, str]],
+    target_language: str
+) -> Optional[List[Optional[Dict[str, str]]]]:
+    """
+    Translate many headlines in one Gemini call.
+
+    Args:
+        headlines: [{"title": ..., "summary": ...}] in English
+        target_language: Target language code (pcm, yo, ha, ig)
+
+    Returns:
+        One {"title", "summary"} per headline, in order (None where the model skipped one),
+        or None when the call failed
+    """
+    if target_language not in SUPPORTED_LANGUAGES or target_language == "en" or not headlines:
+        return None
+    lang_info = SUPPORTED_LANGUAGES[target_language]
+
+    system_message = f"""You are a professional Nigerian news editor translating headlines for Narvo.
+Translate each news headline and its summary from English into {lang_info['name']} ({lang_info['native_name']}).
+Keep names of people, places and organisations as they are. Keep each title short and each summary faithful.
+Write ONLY translated text, no explanations and no English.
+
+You receive a JSON array of {{"i": number, "title": "...", "summary": "..."}}.
+Respond with ONLY a JSON array of the same length:
+[{{"i": 0, "title": "title in {lang_info['name']}", "summary": "summary in {lang_info['name']}"}}, ...]"""
+    payload = [
+        {"i": i, "title": h.get("title") or "", "summary": h.get("summary") or ""}
+        for i, h in enumerate(headlines)
+    ]
+    user_content = json.dumps(payload, ensure_ascii=False)
+
+    try:
+        response = await generate_gemini(system_message, user_content)
+        if not response:
+            return None
+        rows = json.loads(_strip_code_fence(response))
+    except Exception as e:
+        logger.error("Headline translation error (%s): %s", target_language, e)
+        return None
+    if not isinstance(rows, list):
+        return None
+    out: List[Optional[Dict[str, str]]] = [None] * len(headlines)
+    for row in rows:
+        if not isinstance(row, dict) or not isinstance(row.get("i"), int) or not 0 <= row["i"] < len(out):
+            continue
+        title = _sanitize(str(row.get("title") or "").strip())
+        if title:
+            out[row["i"]] = {"title": title, "summary": _sanitize(str(row.get("summary") or "").strip())}
+    return out
+
+
 async def translate_and_narrate(
     title: str,
     summary: str,
-    target_language: str
+    target_language: str,
+    full_text: Optional[str] = None
 ) -> Dict:
     """
     Combined function to translate news content and generate broadcast narrative.
@@ -188,6 +252,7 @@ async def translate_and_narrate(
         title: News headline
         summary: News summary/content
         target_language: Target language code
+        full_text: Prefetched article text; used as the content instead of the summary when given
     
     Returns:
         Dict with translated narrative and key takeaways
@@ -232,19 +297,14 @@ Respond in JSON format:
   "narrative": "The broadcast narrative in {lang_info['name']}...",
   "key_takeaways": ["Point 1 in {lang_info['name']}", "Point 2", "Point 3"]
 }}"""
-    user_content = f"Transform this news:\n\nTitle: {title}\n\nContent: {summary}"
+    content = full_text[:FULLTEXT_PROMPT_CHARS] if full_text else summary
+    user_content = f"Transform this news:\n\nTitle: {title}\n\nContent: {content}"
 
     try:
         response = await generate_gemini(system_message, user_content)
         if not response:
             return {"success": False, "error": "No Gemini response", "narrative": summary, "key_takeaways": [], "language": target_language}
-        cleaned = response.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.split("```")[1]
-            if cleaned.startswith("json"):
-                cleaned = cleaned[4:]
-        cleaned = cleaned.strip()
-        result = json.loads(cleaned)
+        result = json.loads(_strip_code_fence(response))
         narrative = _sanitize(result.get("narrative", summary))
         takeaways = [_sanitize(kt) for kt in result.get("key_takeaways", []) if _sanitize(kt)]
         return {
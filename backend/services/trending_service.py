@@ -0,0 +1,281 @@
+# Trending service - incremental, time-bucketed term / bigram / category counts with velocity
+import logging
+import os
+import re
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Counts are kept per bucket of this many seconds (by published time)
+TRENDING_BUCKET_SECONDS = int(os.environ.get("TRENDING_BUCKET_SECONDS", "900"))
+# "Now" window whose counts are ranked, and the preceding baseline window velocity is measured against
+TRENDING_WINDOW_SECONDS = int(os.environ.get("TRENDING_WINDOW_SECONDS", str(6 * 3600)))
+TRENDING_BASELINE_SECONDS = int(
+    os.environ.get("TRENDING_BASELINE_SECONDS", str(24 * 3600))
+)
+# A term must appear in at least this many current stories to trend
+TRENDING_MIN_COUNT = int(os.environ.get("TRENDING_MIN_COUNT", "2"))
+# Length of the precomputed rankings that requests slice from
+_RANKED_LIMIT = 50
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9']+")
+_STOPWORDS = frozenset(
+    """a about after again against all amid an and are as at be been before being but by can could did
+    do does during for from has have he her his how if in into is it its just more new news no not now
+    of off on once one only or other our out over own says said she should so some than that the their
+    them then there these they this those through to too under until up upon very was we were what when
+    where which while who whom why will with would year years you your""".split()
+)
+
+
+def _terms(title: str) -> Tuple[str, ...]:
+    """Distinct unigrams and adjacent bigrams of a headline, stopwords removed."""
+    tokens = [t.strip("'") for t in _TOKEN_RE.findall((title or "").lower())]
+    tokens = [t for t in tokens if len(t) > 2 and t not in _STOPWORDS]
+    out = dict.fromkeys(tokens)
+    out.update(dict.fromkeys(f"{a} {b}" for a, b in zip(tokens, tokens[1:])))
+    return tuple(out)
+
+
+def _published_ts(item: Mapping) -> Optional[float]:
+    published = item.get("published")
+    if not published:
+        return None
+    try:
+        dt = datetime.fromisoformat(published.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _trend(velocity: float) -> str:
+    if velocity >= 1.25:
+        return "up"
+    if velocity <= 0.8:
+        return "down"
+    return "stable"
+
+
+class TrendingEngine:
+    """Sliding-window counters updated as stories enter and leave the snapshot.
+
+    Each story contributes its headline terms and category to one time bucket. Running
+    totals for the current and baseline windows are adjusted on add/remove, and buckets
+    are moved between them only when the clock crosses a bucket boundary. Rankings are
+    computed once per change and sliced by requests.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = TRENDING_BUCKET_SECONDS,
+        window_seconds: int = TRENDING_WINDOW_SECONDS,
+        baseline_seconds: int = TRENDING_BASELINE_SECONDS,
+        min_count: int = TRENDING_MIN_COUNT,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.window = max(1, window_seconds // bucket_seconds)
+        self.baseline = max(1, baseline_seconds // bucket_seconds)
+        self.min_count = min_count
+        self._clock = clock
+        self._now = self._bucket_of(clock())
+        # id -> (bucket, terms, category)
+        self._items: Dict[str, Tuple[int, Tuple[str, ...], str]] = {}
+        self._buckets: Dict[int, Tuple[Counter, Counter]] = (
+            {}
+        )  # bucket -> (terms, categories)
+        self._current: Tuple[Counter, Counter] = (Counter(), Counter())
+        self._base: Tuple[Counter, Counter] = (Counter(), Counter())
+        self.version = 0
+        self._ranked_key: tuple = ()
+        self._ranked: Tuple[List[Dict], List[Dict]] = ([], [])
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _bucket_of(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds)
+
+    def _totals_for(self, bucket: int) -> Optional[Tuple[Counter, Counter]]:
+        age = self._now - bucket
+        if age < self.window:
+            return self._current
+        if age < self.window + self.baseline:
+            return self._base
+        return None
+
+    def _apply(
+        self, bucket: int, terms: Iterable[str], category: str, sign: int
+    ) -> None:
+        counts = self._buckets.get(bucket)
+        if counts is None:
+            counts = self._buckets[bucket] = (Counter(), Counter())
+        targets = [counts]
+        totals = self._totals_for(bucket)
+        if totals is not None:
+            targets.append(totals)
+        for term_counts, category_counts in targets:
+            for term in terms:
+                term_counts[term] += sign
+                if term_counts[term] <= 0:
+                    del term_counts[term]
+            category_counts[category] += sign
+            if category_counts[category] <= 0:
+                del category_counts[category]
+        if not counts[1]:
+            del self._buckets[bucket]
+
+    def add(self, item: Mapping) -> None:
+        item_id = item.get("id")
+        if not item_id or item_id in self._items:
+            return
+        ts = _published_ts(item)
+        now = self._clock()
+        bucket = min(
+            self._bucket_of(ts if ts is not None else now), self._bucket_of(now)
+        )
+        entry = (
+            bucket,
+            _terms(item.get("title") or ""),
+            item.get("category") or "General",
+        )
+        self._items[item_id] = entry
+        self._apply(*entry, 1)
+        self.version += 1
+
+    def remove(self, item_id: str) -> None:
+        entry = self._items.pop(item_id, None)
+        if entry is not None:
+            self._apply(*entry, -1)
+            self.version += 1
+
+    def sync(self, items: Mapping[str, Mapping]) -> Tuple[int, int]:
+        """Make the counted stories equal `items` (id -> item); returns (added, removed)."""
+        self.advance()
+        gone = self._items.keys() - items.keys()
+        new = items.keys() - self._items.keys()
+        for item_id in gone:
+            self.remove(item_id)
+        for item_id in new:
+            self.add(items[item_id])
+        return len(new), len(gone)
+
+    def _move(
+        self,
+        lo: int,
+        hi: int,
+        src: Tuple[Counter, Counter],
+        dst: Optional[Tuple[Counter, Counter]],
+    ) -> None:
+        """Move the counts of buckets with lo < bucket <= hi from `src` to `dst` (None drops them)."""
+        for bucket, counts in self._buckets.items():
+            if not lo < bucket <= hi:
+                continue
+            for i, delta in enumerate(counts):
+                total = src[i]
+                total.subtract(delta)
+                for key in [k for k in delta if total[k] <= 0]:
+                    del total[key]
+                if dst is not None:
+                    dst[i].update(delta)
+
+    def advance(self) -> None:
+        """Slide both windows to the current bucket (cheap no-op within a bucket)."""
+        now = self._bucket_of(self._clock())
+        if now <= self._now:
+            return
+        old = self._now
+        w, b = self.window, self.window + self.baseline
+        self._move(old - w, now - w, self._current, self._base)
+        self._move(old - b, now - b, self._base, None)
+        self._now = now
+        self.version += 1
+
+    def _rank(self) -> Tuple[List[Dict], List[Dict]]:
+        self.advance()
+        key = (self.version, self._now)
+        if key == self._ranked_key:
+            return self._ranked
+        scale = self.window / self.baseline
+
+        def ranked(
+            current: Counter, base: Counter, min_count: int
+        ) -> List[Tuple[str, int, float]]:
+            rows = []
+            for name, count in current.items():
+                if count >= min_count:
+                    velocity = (count + 1) / (base.get(name, 0) * scale + 1)
+                    rows.append((count * velocity, name, count, round(velocity, 2)))
+            rows.sort(
+                key=lambda r: (-r[0], -r[1].count(" "), r[1])
+            )  # phrases before their words
+            return [(name, count, velocity) for _, name, count, velocity in rows]
+
+        terms: List[Dict] = []
+        kept_bigrams: List[Tuple[str, int]] = []
+        for name, count, velocity in ranked(
+            self._current[0], self._base[0], self.min_count
+        ):
+            if " " in name:
+                kept_bigrams.append((name, count))
+            elif any(
+                count <= c and name in bigram.split() for bigram, c in kept_bigrams
+            ):
+                continue  # already said by a phrase that is at least as frequent
+            terms.append(
+                {
+                    "term": name,
+                    "count": count,
+                    "velocity": velocity,
+                    "trend": _trend(velocity),
+                }
+            )
+            if len(terms) >= _RANKED_LIMIT:
+                break
+        categories = [
+            {
+                "category": name,
+                "count": count,
+                "velocity": velocity,
+                "trend": _trend(velocity),
+            }
+            for name, count, velocity in ranked(self._current[1], self._base[1], 1)
+        ]
+        self._ranked_key, self._ranked = key, (terms, categories)
+        return self._ranked
+
+    def top_terms(self, limit: int = 10) -> List[Dict]:
+        return self._rank()[0][:limit]
+
+    def top_categories(self, limit: int = 10) -> List[Dict]:
+        return self._rank()[1][:limit]
+
+
+_engine = TrendingEngine()
+
+
+def update_trending(items: Mapping[str, Mapping]) -> None:
+    """Snapshot publish hook: count stories that entered, forget those that left."""
+    start = time.perf_counter()
+    added, removed = _engine.sync(items)
+    if added or removed:
+        logger.info(
+            "[Trending] +%s -%s stories in %.1fms (%s counted)",
+            added,
+            removed,
+            (time.perf_counter() - start) * 1000,
+            len(_engine),
+        )
+
+
+def get_trending_terms(limit: int = 10) -> List[Dict]:
+    return _engine.top_terms(limit)
+
+
+def get_trending_categories(limit: int = 10) -> List[Dict]:
+    return _engine.top_categories(limit)
@@ -55,8 +55,10 @@ CREATE TABLE IF NOT EXISTS offline_articles (
   source text,
   category text DEFAULT 'General',
   image_url text,
+  full_text text DEFAULT '',
   saved_at timestamptz NOT NULL DEFAULT now()
 );
+ALTER TABLE offline_articles ADD COLUMN IF NOT EXISTS full_text text DEFAULT '';
 
 -- listening_history
 CREATE TABLE IF NOT EXISTS listening_history (
@@ -6,6 +6,9 @@ import os
 import sys
 
 import pytest
+import pytest_asyncio
+
+from feed_helpers import make_rss
 
 # Ensure backend root is on path when running pytest from repo root (e.g. pytest backend/tests)
 _backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -22,3 +25,76 @@ def client():
     """FastAPI TestClient for in-process requests. Use client.get('/api/health'), client.post('/api/...', json={}), etc."""
     with TestClient(app) as c:
         yield c
+
+
+@pytest_asyncio.fixture
+async def feed_server():
+    """Local aiohttp server: /etag/<name> honours If-None-Match, /plain/<name> always returns 200,
+    /big/<name> streams a 500-entry feed, /dead/<name> always fails (hits counted in server.dead_hits),
+    /article/<name> serves an article page (a near-empty one for "stub"), /image/<name> a 1200x800 JPEG
+    (fetches counted in server.image_hits)."""
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    async def etag(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(
+            text=make_rss(5, request.match_info["name"]), headers={"ETag": '"v1"'}
+        )
+
+    async def plain(request):
+        return web.Response(text=make_rss(5, request.match_info["name"]))
+
+    async def big(request):
+        return web.Response(text=make_rss(500, request.match_info["name"]))
+
+    dead_hits = []
+
+    async def dead(request):
+        dead_hits.append(request.match_info["name"])
+        return web.Response(status=503)
+
+    async def article(request):
+        name = request.match_info["name"]
+        paragraphs = (
+            ""
+            if name == "stub"
+            else "".join(
+                f"<p>Paragraph {i} of the {name} article, long enough to be counted as body text.</p>"
+                for i in range(12)
+            )
+        )
+        return web.Response(
+            text=f"<html><body><nav><p>Home | World | Sport | Business | Opinion | Video</p></nav>"
+            f"<article><h1>{name}</h1>{paragraphs}</article></body></html>",
+            content_type="text/html",
+        )
+
+    image_hits = []
+
+    async def image(request):
+        import io
+        from PIL import Image
+
+        image_hits.append(request.match_info["name"])
+        buf = io.BytesIO()
+        Image.new("RGB", (1200, 800), (20, 120, 200)).save(buf, "JPEG", quality=95)
+        return web.Response(body=buf.getvalue(), content_type="image/jpeg")
+
+    app = web.Application()
+    app.router.add_get("/etag/{name}", etag)
+    app.router.add_get("/plain/{name}", plain)
+    app.router.add_get("/big/{name}", big)
+    app.router.add_get("/dead/{name}", dead)
+    app.router.add_get("/article/{name}", article)
+    app.router.add_get("/image/{name}", image)
+    server = TestServer(app)
+    server.dead_hits = dead_hits
+    server.image_hits = image_hits
+    await server.start_server()
+    yield server
+    await server.close()
+    from lib.http_client import close_ingest_session
+
+    await close_ingest_session()
@@ -0,0 +1,22 @@
+"""
+Shared builders for the ingestion tests: RSS documents and news items.
+"""
+
+
+def make_rss(n, tag="feed"):
+    items = "".join(
+        f"<item><title>{tag} story {i}</title><link>http://example.com/{tag}/{i}</link>"
+        f"<description>&lt;p&gt;Summary {i}&lt;/p&gt;</description>"
+        f"<pubDate>Mon, 0{1 + i % 9} Jun 2026 10:00:00 GMT</pubDate></item>"
+        for i in range(n)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{tag}</title>{items}</channel></rss>'
+
+
+def make_item(i, source="A", published=None):
+    return {
+        "id": f"{source}{i}",
+        "title": f"{source} headline number {i}",
+        "source": source,
+        "published": published or f"2026-06-01T{10 + i:02d}:00:00",
+    }
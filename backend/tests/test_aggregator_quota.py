@@ -0,0 +1,133 @@
+"""
+Unit tests for per-query aggregator caching and the quota scheduler.
+Run: cd backend && python -m pytest tests/test_aggregator_quota.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestAggregatorQuota:
+    def test_quota_is_shared_by_popularity_and_capped(self):
+        from lib.quota_scheduler import QuotaScheduler
+
+        now = [1_780_000_000.0 - 1_780_000_000.0 % 86400 + 3600]  # 01:00 UTC
+        sched = QuotaScheduler(
+            {"ms": 96}, min_interval=60, clock=lambda: now[0]
+        )  # burst: 2 calls
+        sched.track("default", "ms", pinned=True)
+        sched.track("hot", "ms")
+        sched.track("rare", "ms")
+        for _ in range(9):
+            sched.requested("hot")
+        sched.requested("rare")
+        assert sched.interval("default") == pytest.approx(
+            86400 / 48
+        )  # pinned: at least half the quota
+        assert sched.interval("hot") == pytest.approx(86400 / 96 / 0.9)
+        assert sched.interval("rare") == pytest.approx(86400 / 96 / 0.1)
+        assert sched.take_due() == [
+            "default",
+            "hot",
+        ]  # all due; the bucket allows two calls
+        assert sched.eta("rare") == pytest.approx(900)  # next token at 96/day
+        for key in ("default", "hot"):
+            sched.fetched(key)
+        now[0] += 900
+        assert sched.take_due() == ["rare"]
+        sched.fetched("rare")
+        assert sched.take_due() == [] and sched.next_wakeup() > 0
+
+        sched.restore_usage(
+            "ms", sched.usage()["ms"]["day"], 96
+        )  # day's quota spent before a restart
+        now[0] += 3 * 3600
+        assert sched.take_due() == [] and sched.eta("hot") == pytest.approx(
+            20 * 3600 - 900
+        )
+        now[0] += 20 * 3600  # next UTC day
+        assert sched.take_due() == ["default", "hot"]
+        assert sched.usage()["ms"]["used_today"] == 2
+
+    @pytest.mark.asyncio
+    async def test_queries_are_served_from_cache_and_refreshed_by_scheduler(
+        self, monkeypatch
+    ):
+        import services.aggregator_service as ag
+        from lib.quota_scheduler import QuotaScheduler
+
+        calls = []
+
+        def fake_fetch(prefix):
+            async def fetch(keywords, limit):
+                calls.append((prefix, keywords, limit))
+                return [
+                    {
+                        "id": f"{prefix}_{keywords}_{i}",
+                        "title": keywords,
+                        "aggregator": prefix,
+                    }
+                    for i in range(limit)
+                ]
+
+            return fetch
+
+        monkeypatch.setattr(ag, "MEDIASTACK_KEY", "k")
+        monkeypatch.setattr(ag, "NEWSDATA_KEY", "")
+        monkeypatch.setattr(ag, "fetch_mediastack", fake_fetch("ms"))
+        monkeypatch.setattr(ag, "refresh_in_background", lambda: None)
+        monkeypatch.setattr(
+            ag,
+            "_scheduler",
+            QuotaScheduler({"mediastack": 480, "newsdata": 0}, min_interval=600),
+        )
+        monkeypatch.setattr(ag, "_query_results", {})
+        monkeypatch.setattr(
+            ag,
+            "_aggregator_cache",
+            {
+                "mediastack": [],
+                "newsdata": [],
+                "last_fetched": None,
+                "last_fetched_ts": 0,
+            },
+        )
+
+        miss = ag.get_cached_query("mediastack", "Lagos  FLOODS", 5)
+        assert miss == {
+            "count": 0,
+            "articles": [],
+            "cached": False,
+            "fetched_at": None,
+            "refresh_eta_seconds": 0,
+        }
+        assert calls == []  # never a live upstream call on the request path
+        assert (
+            ag.get_cached_query("newsdata", "Lagos", 5)["refresh_eta_seconds"] is None
+        )  # not configured
+
+        await ag.refresh_cache()
+        assert sorted(calls) == [
+            ("ms", "africa nigeria", 20),
+            ("ms", "floods lagos", 20),
+        ]
+        assert (
+            len(ag._aggregator_cache["mediastack"]) == 20
+        )  # the default query feeds /api/news
+
+        hit = ag.get_cached_query(
+            "mediastack", "floods, lagos", 12
+        )  # same normalized query and bucket
+        assert hit["cached"] and hit["count"] == 12 and hit["refresh_eta_seconds"] > 0
+        both = await ag.fetch_all_aggregators("Nigeria Africa")
+        assert (
+            both["mediastack"]["count"] == 20
+            and both["newsdata"]["count"] == 0
+            and both["cached"]
+        )
+        await ag.refresh_cache()
+        assert len(calls) == 2  # nothing due yet
+        assert ag.get_aggregator_status()["quota"]["mediastack"]["used_today"] == 2
@@ -0,0 +1,39 @@
+"""
+Unit tests for the compact Article record.
+Run: cd backend && python -m pytest tests/test_article_record.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestArticleRecord:
+    def test_record_reads_like_the_dict_it_replaces(self):
+        import pickle
+        from fastapi.encoders import jsonable_encoder
+        from models.article import Article
+
+        data = {
+            "id": "x1",
+            "title": "T",
+            "source": "".join(["Pun", "ch"]),
+            "tags": ["a", "b"],
+            "extra": 1,
+        }
+        a = Article(data)
+        assert dict(a) == {**data, "tags": ("a", "b")} and a == {
+            **data,
+            "tags": ("a", "b"),
+        }
+        assert "summary" not in a and a.get("summary", "-") == "-" and a["extra"] == 1
+        assert a["source"] is Article(source="Punch")["source"]  # interned
+        assert jsonable_encoder(a) == {**data, "tags": ["a", "b"]}
+        assert pickle.loads(pickle.dumps(a)) == a
+        with pytest.raises(TypeError):
+            a["title"] = "changed"
+        with pytest.raises(AttributeError):
+            a.title = "changed"
+        assert not hasattr(a, "__dict__")
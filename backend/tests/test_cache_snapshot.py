@@ -0,0 +1,79 @@
+"""
+Unit tests for the on-disk warm-restart cache snapshot.
+Run: cd backend && python -m pytest tests/test_cache_snapshot.py -v
+"""
+
+import pytest
+import sys
+import os
+
+from feed_helpers import make_item
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestCacheSnapshot:
+    def test_store_roundtrip_and_corruption(self, tmp_path):
+        from lib.snapshot_store import encode_snapshot, read_snapshot, write_snapshot
+
+        path = str(tmp_path / "s.snap")
+        write_snapshot(path, encode_snapshot({"a": [1, "é"]}))
+        assert read_snapshot(path) == {"a": [1, "é"]}
+        assert [p.name for p in tmp_path.iterdir()] == [
+            "s.snap"
+        ]  # no temp files left behind
+        blob = bytearray(open(path, "rb").read())
+        blob[-1] ^= 0xFF
+        open(path, "wb").write(bytes(blob))
+        assert read_snapshot(path) is None
+        assert read_snapshot(str(tmp_path / "missing.snap")) is None
+
+    @pytest.mark.asyncio
+    async def test_caches_restored_after_restart(self, tmp_path, monkeypatch):
+        import services.cache_snapshot_service as cs
+        import services.news_service as ns
+        import services.podcast_service as ps
+        import services.aggregator_service as ag
+        from datetime import datetime, timezone
+        from services.snapshot_service import SnapshotManager
+
+        now = datetime.now(timezone.utc)
+        monkeypatch.setattr(cs, "CACHE_SNAPSHOT_DIR", str(tmp_path))
+        monkeypatch.setattr(cs, "_last_stamp", None)
+        monkeypatch.setattr(ns, "_news_snapshots", SnapshotManager(lambda: None))
+        monkeypatch.setattr(
+            ps, "_podcast_cache", {"ep-1": {"id": "ep-1", "title": "Pod"}}
+        )
+        monkeypatch.setattr(ps, "_cache_time", now)
+        monkeypatch.setattr(
+            ag,
+            "_aggregator_cache",
+            {
+                "mediastack": [{"id": "m1"}],
+                "newsdata": [],
+                "last_fetched": now.isoformat(),
+                "last_fetched_ts": 0,
+            },
+        )
+        ns._news_snapshots.publish([make_item(1), make_item(2)])
+        assert await cs.save_cache_snapshot()
+        assert not await cs.save_cache_snapshot()  # unchanged -> no rewrite
+
+        # "Restart": empty caches, then load from disk
+        monkeypatch.setattr(ns, "_news_snapshots", SnapshotManager(lambda: None))
+        monkeypatch.setattr(ps, "_podcast_cache", {})
+        monkeypatch.setattr(
+            ag,
+            "_aggregator_cache",
+            {
+                "mediastack": [],
+                "newsdata": [],
+                "last_fetched": None,
+                "last_fetched_ts": 0,
+            },
+        )
+        restored = await cs.load_cache_snapshot()
+        assert restored == {"news": 2, "podcasts": 1, "aggregator": 1}
+        assert [n["id"] for n in ns._news_snapshots.current.items] == ["A1", "A2"]
+        assert ps.get_podcast_by_id("ep-1")["title"] == "Pod"
+        assert not ag._cache_is_stale()
@@ -0,0 +1,101 @@
+"""
+Unit tests for keyword story classification.
+Run: cd backend && python -m pytest tests/test_classification.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestClassification:
+    def test_automaton_matches_whole_words_and_stems(self):
+        from lib.aho_corasick import Automaton
+
+        ac = Automaton()
+        for kw, value in [
+            ("ai", "tech"),
+            ("sport", "sports"),
+            ("just in", "breaking"),
+            ("in time", "time"),
+        ]:
+            ac.add(kw, value)
+        assert ac.values("Minister said rain") == set()  # "ai" inside "said", "rain"
+        assert ac.values("AI chips and sports news") == {"tech", "sports"}
+        assert ac.values("JUST IN: ushers") == {"breaking"}
+        assert ac.values("just in time") == {
+            "breaking",
+            "time",
+        }  # overlapping patterns via failure links
+
+    def test_items_are_classified_at_ingest(self):
+        import services.news_service as ns
+        from services.narrative_service import extract_category, extract_tags
+
+        rows = [
+            (
+                "a1",
+                "BREAKING: Senate passes Nigeria electoral bill",
+                "",
+                "u1",
+                None,
+                "",
+                (),
+            ),
+            (
+                "a2",
+                "Falcons win AFCON opener",
+                "The league match ended 2-0",
+                "u2",
+                None,
+                "",
+                ("Football",),
+            ),
+            ("a3", "Fuel price rises again", "", "u3", None, "", ()),
+        ]
+        general = ns._items_from_rows(rows, {"source": "S", "category": "General"})
+        assert [i["category"] for i in general] == ["Politics", "Sports", "General"]
+        assert [i["is_breaking"] for i in general] == [True, False, False]
+        assert general[0]["tags"] == ("Politics", "Nigeria", "Breaking") and general[1][
+            "tags"
+        ] == ("Football",)
+        # A feed's own category is kept
+        assert (
+            ns._items_from_rows(rows[:1], {"source": "S", "category": "Economy"})[0][
+                "category"
+            ]
+            == "Economy"
+        )
+        assert extract_category("Vaccine rollout", "") == "Health"
+        assert extract_tags("Breaking: Africa summit", "Politics") == [
+            "#POLITICS",
+            "#AFRICA",
+            "#BREAKING",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_breaking_list_reads_precomputed_flag(self, monkeypatch):
+        import services.news_service as ns
+        from services.snapshot_service import SnapshotManager
+
+        mgr = SnapshotManager(lambda: None)
+        mgr.publish(
+            [
+                {
+                    "id": "n1",
+                    "title": "Breaking news: a story",
+                    "published": "2026-06-02",
+                },  # not flagged
+                {
+                    "id": "n2",
+                    "title": "Calm story",
+                    "published": "2026-06-01",
+                    "is_breaking": True,
+                },
+            ]
+        )
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        assert [s["id"] for s in await ns.get_breaking_news_list()] == ["n2"]
+        assert (await ns.get_breaking_news())["id"] == "n2"
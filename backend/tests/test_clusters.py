@@ -0,0 +1,148 @@
+"""
+Unit tests for near-duplicate story clustering.
+Run: cd backend && python -m pytest tests/test_clusters.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _story(item_id, source, title, summary, published):
+    return {
+        "id": item_id,
+        "source": source,
+        "title": title,
+        "summary": summary,
+        "published": published,
+        "region": "local",
+        "category": "Politics",
+    }
+
+
+_BUDGET = [
+    _story(
+        "p1",
+        "Punch",
+        "Tinubu signs 2026 budget into law",
+        "President Bola Tinubu on Monday signed the N54.9trn 2026 appropriation bill into law at the State House",
+        "2026-06-01T10:00:00",
+    ),
+    _story(
+        "v1",
+        "Vanguard",
+        "President Tinubu signs N54.9trn 2026 budget into law",
+        "Tinubu signed the 2026 appropriation bill at the Presidential Villa, Abuja on Monday",
+        "2026-06-01T11:00:00",
+    ),
+    _story(
+        "e1",
+        "ESPN",
+        "Super Eagles beat Ghana 2-1 in AFCON qualifier",
+        "Nigeria came from behind to beat the Black Stars in Accra",
+        "2026-06-01T12:00:00",
+    ),
+]
+
+
+class TestStoryClusters:
+    def test_near_duplicates_cluster_across_sources(self):
+        from services.cluster_service import cluster_items
+
+        index = cluster_items(_BUDGET)
+        assert len(index.clusters) == 2
+        budget = index.by_item["v1"]
+        assert (
+            budget is index.by_item["p1"] and budget.id == "cl-p1"
+        )  # named after the first report
+        assert budget.sources == ["Vanguard", "Punch"] and index.by_item["e1"].size == 1
+        assert index.duplication_rate == round(1 - 2 / 3, 3)
+
+    def test_key_survives_lead_rotation_and_older_duplicate(self):
+        from services.cluster_service import StoryClusterer
+
+        clusterer = StoryClusterer()
+        assert clusterer.update(_BUDGET).by_item["v1"].id == "cl-p1"
+        older = _story(
+            "g1",
+            "Guardian",
+            "Tinubu signs N54.9trn 2026 budget into law",
+            "President Tinubu on Monday signed the 2026 appropriation bill into law",
+            "2026-06-01T09:00:00",
+        )
+        index = clusterer.update(_BUDGET + [older])
+        budget = index.by_item["g1"]
+        assert budget.lead["id"] == "g1" and budget.id == "cl-p1"
+        # The story that named the cluster rotates out of the feed
+        index = clusterer.update([s for s in _BUDGET if s["id"] != "p1"] + [older])
+        assert index.by_item["v1"].id == index.by_item["g1"].id == "cl-p1"
+        assert index.by_item["e1"].id == "cl-e1"
+
+    def test_update_signs_only_new_stories(self, monkeypatch):
+        import services.cluster_service as cs
+
+        signed = []
+        real = cs.signature
+        monkeypatch.setattr(cs, "signature", lambda sh: signed.append(sh) or real(sh))
+        clusterer = cs.StoryClusterer()
+        clusterer.update(_BUDGET[:2])
+        index = clusterer.update(_BUDGET)
+        assert len(signed) == 3 and len(index.clusters) == 2
+
+    @pytest.mark.asyncio
+    async def test_narrative_generated_once_per_cluster(self, monkeypatch):
+        import services.news_service as ns
+        import routes.news as rn
+        from services.snapshot_service import SnapshotManager
+
+        mgr = SnapshotManager(lambda: None)
+        mgr.publish(sorted(_BUDGET, key=lambda x: x["published"], reverse=True))
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        calls = []
+
+        async def fake_narrative(text):
+            calls.append(text)
+            return {"narrative": "Budget signed", "key_takeaways": []}
+
+        monkeypatch.setattr(rn, "generate_narrative", fake_narrative)
+        a = await rn.get_news_detail("p1")
+        b = await rn.get_news_detail("v1")
+        assert (
+            a["narrative"] == b["narrative"]
+            and a["cluster_id"] == b["cluster_id"] == "cl-p1"
+        )
+        assert len(calls) == 1
+
+        clusters = await rn.get_news_clusters(
+            region=None, category=None, min_size=2, limit=10
+        )
+        assert [c["id"] for c in clusters["clusters"]] == ["cl-p1"]
+
+    @pytest.mark.asyncio
+    async def test_narration_generated_once_per_cluster_and_language(self, monkeypatch):
+        import services.news_service as ns
+        import routes.translation as rt
+        from services.snapshot_service import SnapshotManager
+
+        mgr = SnapshotManager(lambda: None)
+        mgr.publish(sorted(_BUDGET, key=lambda x: x["published"], reverse=True))
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        calls = []
+
+        async def fake_narrate(title, summary, target_language, full_text=None):
+            calls.append(target_language)
+            return {"success": True, "narrative": f"{target_language}: {title}"}
+
+        monkeypatch.setattr(rt, "translate_and_narrate", fake_narrate)
+        a, b, c = [
+            await rt.translate_narrate(
+                rt.NarrateRequest(
+                    title=s["title"], summary="", target_language=lang, story_id=s["id"]
+                )
+            )
+            for s, lang in ((_BUDGET[0], "yo"), (_BUDGET[1], "yo"), (_BUDGET[1], "ha"))
+        ]
+        assert a == b and c["narrative"].startswith("ha:")
+        assert calls == ["yo", "ha"]
@@ -0,0 +1,81 @@
+"""
+Unit tests for the streaming feed parser and incremental feed reads.
+Run: cd backend && python -m pytest tests/test_feed_parser.py -v
+"""
+
+import pytest
+import sys
+import os
+
+from feed_helpers import make_rss
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestFeedParser:
+    def test_parse_feed_bytes_returns_compact_rows(self):
+        from lib.feed_parser import parse_feed_bytes
+
+        rows = parse_feed_bytes(make_rss(20).encode())
+        assert len(rows) == 15
+        item_id, title, summary, link, image_url, published, tags = rows[0]
+        assert len(item_id) == 12 and title == "feed story 0"
+        assert summary == "Summary 0" and link == "http://example.com/feed/0"
+        assert published == "2026-06-01T10:00:00" and tags == ()
+
+    def test_stream_engine_matches_feedparser(self):
+        from lib.feed_parser import _feedparser_rows, _stream_rows
+
+        atom = (
+            '<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>Atom one</title>'
+            '<link rel="alternate" href="http://example.org/1"/>'
+            '<link rel="enclosure" type="image/jpeg" href="http://example.org/1.jpg"/>'
+            "<published>2026-06-01T11:00:00+01:00</published><summary>Plain</summary>"
+            '<category term="Politics"/></entry></feed>'
+        ).encode()
+        for content in (make_rss(20).encode(), atom):
+            assert _stream_rows(content, 15) == _feedparser_rows(content, 15)
+
+    def test_unparseable_xml_falls_back_to_feedparser(self):
+        from lib.feed_parser import _stream_rows, parse_feed_bytes
+
+        html_entities = make_rss(2).replace("story 0", "story&nbsp;0").encode()
+        assert _stream_rows(html_entities, 15) is None
+        assert len(parse_feed_bytes(html_entities)) == 2
+
+    def test_late_parse_error_falls_back_to_feedparser(self):
+        from lib.feed_parser import _stream_rows, parse_feed_bytes
+
+        late_entity = make_rss(5).replace("story 2", "story&nbsp;2").encode()
+        assert _stream_rows(late_entity, 15) is None
+        assert len(parse_feed_bytes(late_entity)) == 5
+
+    def test_body_cut_at_byte_cap_keeps_complete_entries(self):
+        from lib.feed_parser import _stream_rows
+
+        body = make_rss(5).encode()
+        cut = body[: body.index(b"<item>", body.index(b"</item>")) + 10]
+        rows = _stream_rows(cut, 15)
+        assert [r[1] for r in rows] == ["feed story 0"]
+
+    @pytest.mark.asyncio
+    async def test_large_feed_read_stops_after_entries(self, feed_server):
+        from services.news_service import fetch_rss_feed, _feed_validators
+
+        feed = {"url": str(feed_server.make_url("/big/c")), "source": "C"}
+        items = await fetch_rss_feed(feed)
+        state = _feed_validators[feed["url"]]
+        assert len(items) == 15 and items[-1]["title"] == "c story 14"
+        assert state["truncated"] == 1
+        assert state["last_bytes"] < len(make_rss(500, "c"))
+
+    @pytest.mark.asyncio
+    async def test_parse_feed_thread_fallback(self, monkeypatch):
+        import lib.feed_parser as fp
+
+        monkeypatch.setattr(fp, "FEED_PARSE_WORKERS", 0)
+        monkeypatch.setattr(fp, "_executor", None)
+        rows = await fp.parse_feed(make_rss(3).encode())
+        assert len(rows) == 3
+        assert not isinstance(fp._executor, fp.ProcessPoolExecutor)
+        fp.shutdown_parse_executor()
@@ -0,0 +1,120 @@
+"""
+Unit tests for adaptive feed polling and incremental snapshot merges.
+Run: cd backend && python -m pytest tests/test_feed_scheduler.py -v
+"""
+
+import pytest
+import sys
+import os
+
+from feed_helpers import make_item
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestFeedScheduler:
+    def test_cadence_tracks_publish_gaps(self):
+        from services.feed_scheduler import FeedCadence, FEED_POLL_MIN, FEED_POLL_MAX
+
+        hourly = [make_item(i) for i in range(6)]
+        c = FeedCadence(interval=3600)
+        for _ in range(6):
+            c.learn(hourly, new_count=1)
+        assert abs(c.interval - 1800) < 60  # half the one-hour publish gap
+        for _ in range(20):
+            c.learn(hourly, new_count=0)
+        assert c.interval == FEED_POLL_MAX
+        c.interval = 10
+        c.learn([], new_count=0)
+        assert c.interval >= FEED_POLL_MIN
+
+    @pytest.mark.asyncio
+    async def test_dispatch_polls_each_feed_with_bounded_concurrency(self):
+        import asyncio
+        from services.feed_scheduler import FeedScheduler
+
+        active, peak, seen = 0, 0, []
+
+        async def fetch(feed):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return [make_item(1, feed["source"])]
+
+        def on_items(feed, items):
+            seen.append(feed["source"])
+            return len(items)
+
+        sched = FeedScheduler(fetch, on_items, concurrency=3)
+        sched.sync_feeds(
+            [{"url": f"u{i}", "source": f"S{i}"} for i in range(10)], stagger=0
+        )
+        sched.start()
+        for _ in range(100):
+            if len(seen) == 10:
+                break
+            await asyncio.sleep(0.01)
+        await sched.stop()
+        assert sorted(seen) == sorted(f"S{i}" for i in range(10))
+        assert peak <= 3
+
+
+class TestSnapshotMerge:
+    def test_merge_inserts_new_and_drops_rotated_items(self, monkeypatch):
+        import services.news_service as ns
+        from services.snapshot_service import SnapshotManager
+
+        mgr = SnapshotManager(lambda: None)
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        mgr.publish(
+            sorted(
+                [make_item(1, "A"), make_item(2, "A"), make_item(3, "B")],
+                key=lambda x: x["published"],
+                reverse=True,
+            )
+        )
+
+        new = ns.merge_feed_items(
+            {"source": "A"}, [make_item(2, "A"), make_item(5, "A")]
+        )
+        assert new == 1
+        ids = [n["id"] for n in mgr.current.items]
+        assert ids == ["A5", "B3", "A2"] and mgr.current.version == 2
+
+        assert (
+            ns.merge_feed_items({"source": "A"}, [make_item(2, "A"), make_item(5, "A")])
+            == 0
+        )
+        assert mgr.current.version == 2
+
+    def test_empty_poll_keeps_source_items(self, monkeypatch):
+        import services.news_service as ns
+        from services.snapshot_service import SnapshotManager
+
+        mgr = SnapshotManager(lambda: None)
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        mgr.publish([make_item(2, "A"), make_item(1, "B")])
+        assert ns.merge_feed_items({"source": "A"}, []) == 0
+        assert [n["id"] for n in mgr.current.items] == [
+            "A2",
+            "B1",
+        ] and mgr.current.version == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_poll_is_not_merged(self, monkeypatch):
+        import services.news_service as ns
+        from services.feed_scheduler import FeedScheduler
+
+        async def failed_fetch(feed_config):
+            return [], False
+
+        merged = []
+        monkeypatch.setattr(ns, "_fetch_feed", failed_fetch)
+        sched = FeedScheduler(
+            ns._poll_feed, lambda feed, items: merged.append(items) or 0
+        )
+        sched.sync_feeds([{"url": "u", "source": "A"}], stagger=0)
+        await sched._poll("u")
+        assert merged == [] and sched.status()["schedule"][0]["polls"] == 0
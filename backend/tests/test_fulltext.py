@@ -0,0 +1,87 @@
+"""
+Unit tests for background full-text prefetch.
+Run: cd backend && python -m pytest tests/test_fulltext.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestFullTextPrefetch:
+    def test_extractor_keeps_article_paragraphs_only(self):
+        from lib.article_text import extract_article_text
+
+        html = (
+            b"<html><head><script>var s = '<p>not text</p>';</script></head><body>"
+            b"<div class='share-tools'><p>Share this story on every network you can think of today</p></div>"
+            b"<article><p>The first paragraph of the story, long enough to count as body.</p>"
+            b"<p>Photo: AP</p><p>A second paragraph &amp; <b>bold</b> text that also counts as body."
+            b"<p>An unclosed third paragraph that still belongs to the article body.</article>"
+            b"<footer><p>Copyright notice which is long enough to look like a paragraph</p></footer></body></html>"
+        )
+        assert extract_article_text(html).split("\n\n") == [
+            "The first paragraph of the story, long enough to count as body.",
+            "A second paragraph & bold text that also counts as body.",
+            "An unclosed third paragraph that still belongs to the article body.",
+        ]
+        assert extract_article_text(b"<html><body><p>Too short</p></body></html>") == ""
+
+    @pytest.mark.asyncio
+    async def test_prefetched_text_feeds_detail_narrative(
+        self, feed_server, monkeypatch
+    ):
+        from collections import OrderedDict
+        import services.fulltext_service as ft
+        import services.news_service as ns
+        import routes.news as rn
+        from services.snapshot_service import SnapshotManager
+
+        monkeypatch.setattr(ft, "_bodies", OrderedDict())
+        monkeypatch.setattr(ft, "_failed", OrderedDict())
+        monkeypatch.setattr(ft, "_bodies_size", 0)
+        summaries = {  # distinct events, so each story gets its own narrative
+            "alpha": "Lawmakers debate the federal budget.",
+            "beta": "Floods close roads across the delta.",
+            "stub": "Short summary.",
+        }
+        items = [
+            {
+                "id": f"s{name}",
+                "title": f"Story {name}",
+                "summary": summary,
+                "source_url": str(feed_server.make_url(f"/article/{name}")),
+            }
+            for name, summary in summaries.items()
+        ]
+        assert await ft.prefetch_stories(items) == 2
+        text = ft.get_full_text("salpha")
+        assert (
+            text.startswith("Paragraph 0 of the alpha article")
+            and "Home | World" not in text
+        )
+        assert (
+            ft.get_full_text("sstub") is None
+            and ft.get_fulltext_status()["cached"] == 2
+        )
+        assert (
+            await ft.prefetch_stories(items) == 0
+        )  # cached and recently failed stories are skipped
+
+        prompts = []
+
+        async def fake_narrative(text):
+            prompts.append(text)
+            return {"narrative": "N", "key_takeaways": []}
+
+        monkeypatch.setattr(rn, "generate_narrative", fake_narrative)
+        monkeypatch.setattr(ns, "_news_snapshots", SnapshotManager(lambda: None))
+        ns._news_snapshots.publish(items)
+        monkeypatch.setattr(ns, "_story_enrichment", OrderedDict())
+        detail = await rn.get_news_detail("sbeta")
+        assert prompts[0].startswith("Story beta\n\nParagraph 0 of the beta article")
+        assert detail["full_text"] == ft.get_full_text("sbeta")
+        assert (await rn.get_news_detail("sstub"))["full_text"] is None
+        assert prompts[1] == "Story stub\n\nShort summary."
@@ -0,0 +1,136 @@
+"""
+Unit tests for pre-translated headlines.
+Run: cd backend && python -m pytest tests/test_headline_translation.py -v
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestHeadlineTranslation:
+    @pytest.mark.asyncio
+    async def test_batch_response_is_matched_by_index(self, monkeypatch):
+        import services.translation_service as ts
+
+        async def fake_gemini(system, user):
+            assert len(json.loads(user)) == 3 and "Yorùbá" in system
+            return (
+                '```json\n[{"i": 2, "title": "Àkọlé 2", "summary": "S2"}, {"i": 0, "title": "Àkọlé 0"},'
+                ' {"i": 7, "title": "stray"}, {"i": 1, "title": ""}]\n```'
+            )
+
+        monkeypatch.setattr(ts, "generate_gemini", fake_gemini)
+        out = await ts.translate_headlines(
+            [{"title": f"Title {i}", "summary": "S"} for i in range(3)], "yo"
+        )
+        assert out == [
+            {"title": "Àkọlé 0", "summary": ""},
+            None,
+            {"title": "Àkọlé 2", "summary": "S2"},
+        ]
+        assert await ts.translate_headlines([{"title": "T"}], "en") is None
+
+    @pytest.mark.asyncio
+    async def test_new_stories_are_translated_in_batches_and_served_by_lang(
+        self, monkeypatch
+    ):
+        from collections import OrderedDict
+        from datetime import datetime, timedelta, timezone
+        from fastapi import HTTPException, Response
+        import services.headline_service as hs
+        import services.news_service as ns
+        import routes.news as rn
+        from services.snapshot_service import SnapshotManager
+
+        monkeypatch.setattr(hs, "HEADLINE_LANGUAGES", ("yo", "ha"))
+        monkeypatch.setattr(hs, "HEADLINE_BATCH_SIZE", 10)
+        monkeypatch.setattr(
+            hs, "_translations", {"yo": OrderedDict(), "ha": OrderedDict()}
+        )
+        monkeypatch.setattr(hs, "_failed", {"yo": OrderedDict(), "ha": OrderedDict()})
+        monkeypatch.setattr(hs, "GEMINI_API_KEY", "test")
+        calls = []
+
+        async def fake_translate(headlines, lang):
+            calls.append((lang, [h["title"] for h in headlines]))
+            if lang == "ha" and any(h["title"] == "Story 0" for h in headlines):
+                return None  # this call fails: its stories stay in English and are not retried at once
+            return [
+                {
+                    "title": f"[{lang}] {h['title']}",
+                    "summary": f"[{lang}] {h['summary']}",
+                }
+                for h in headlines
+            ]
+
+        monkeypatch.setattr(hs, "translate_headlines", fake_translate)
+        monkeypatch.setattr(
+            ns,
+            "_news_snapshots",
+            SnapshotManager(lambda: None, on_publish=ns._on_news_publish),
+        )
+        now = datetime.now(timezone.utc)
+        stories = [
+            {
+                "id": f"h{i}",
+                "title": f"Story {i}",
+                "summary": f"Summary {i}",
+                "source": "Src",
+                "published": (now - timedelta(minutes=i)).isoformat(),
+            }
+            for i in range(25)
+        ]
+        hs.start_headline_translator()
+        try:
+            ns._news_snapshots.publish(stories)
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if len(calls) == 6 and not hs._pending:
+                    break
+            assert sorted(len(titles) for _, titles in calls) == [5, 5, 10, 10, 10, 10]
+            assert calls[0][1][0] == "Story 0"  # newest first
+            assert (
+                len(hs._translations["yo"]) == 25 and len(hs._translations["ha"]) == 15
+            )
+            assert (
+                hs.queue_for_translation(stories) == 0
+            )  # translated or recently failed
+        finally:
+            await hs.stop_headline_translator()
+
+        def news(lang, limit=20):
+            return rn.get_news(
+                Response(),
+                region=None,
+                category=None,
+                limit=limit,
+                include_aggregators=False,
+                aggregator_sources=None,
+                lang=lang,
+            )
+
+        yo = await news("yo")
+        assert yo[0]["title"] == "[yo] Story 0" and yo[0]["summary"] == "[yo] Summary 0"
+        assert yo[0]["original_title"] == "Story 0" and yo[0]["language"] == "yo"
+        ha = await news("ha")
+        assert (
+            ha[0]["title"] == "Story 0"
+            and "language" not in ha[0]
+            and ha[19]["title"] == "[ha] Story 19"
+        )
+        assert (await news("en", 3))[0]["title"] == "Story 0"
+        with pytest.raises(HTTPException) as exc:
+            await news("fr", 3)
+        assert exc.value.status_code == 400
+
+        exported = hs.export_headline_translations()
+        monkeypatch.setattr(
+            hs, "_translations", {"yo": OrderedDict(), "ha": OrderedDict()}
+        )
+        assert hs.restore_headline_translations(json.loads(json.dumps(exported))) == 40
+        assert hs.localize_items(stories[:1], "yo")[0]["title"] == "[yo] Story 0"
@@ -0,0 +1,122 @@
+"""
+Unit tests for the /api/img image proxy and placeholders.
+Run: cd backend && python -m pytest tests/test_image_proxy.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestImageProxy:
+    def test_blurhash_matches_reference_encoder(self):
+        import numpy as np
+        from lib.image_codec import blurhash
+
+        y, x = np.mgrid[0:24, 0:32]
+        pixels = np.stack([x * 8, y * 10, (x + y) * 4], axis=-1).astype(np.uint8)
+        assert (
+            blurhash(pixels) == "LxH27b2kwzX5mAWYjuf7gKfkfQfj"
+        )  # value from the reference implementation
+
+    def test_disk_lru_evicts_least_recently_used_and_survives_reopen(self, tmp_path):
+        import os
+        import time
+        from lib.disk_cache import DiskLRU
+
+        cache = DiskLRU(str(tmp_path), max_bytes=350)
+        for key in ("aa01", "bb02", "cc03"):
+            cache.put(key, key.encode() * 25)  # 100 bytes each
+            past = time.time() - 100 + len(cache)
+            os.utime(cache._path(key), (past, past))
+        assert cache.get("aa01") is not None  # now most recently used
+        cache.put("dd04", b"x" * 100)
+        assert "bb02" not in cache and "cc03" in cache and "aa01" in cache
+        reopened = DiskLRU(
+            str(tmp_path), max_bytes=250
+        )  # recency rebuilt from mtimes: cc03 is oldest
+        assert (
+            "cc03" not in reopened
+            and reopened.get("aa01")
+            and reopened.get("dd04") == b"x" * 100
+        )
+
+    @pytest.mark.asyncio
+    async def test_proxy_resizes_once_and_placeholders_are_precomputed(
+        self, feed_server, tmp_path, monkeypatch
+    ):
+        from collections import OrderedDict
+        import httpx
+        from fastapi import FastAPI
+        import services.image_service as img
+        from routes.images import router
+
+        for name in ("_known", "_placeholders", "_failed", "_pending"):
+            monkeypatch.setattr(img, name, OrderedDict())
+        monkeypatch.setattr(img, "IMAGE_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(img, "_cache", None)
+        url = str(feed_server.make_url("/image/photo"))
+        assert img.register_images([url, None, "data:image/png;base64,xx"]) == 1
+
+        assert await img.compute_placeholders([url]) == 1
+        placeholder = img.get_image_placeholder(url)
+        r, g, b = (int(placeholder["color"][i : i + 2], 16) for i in (1, 3, 5))
+        assert abs(r - 20) + abs(g - 120) + abs(b - 200) <= 6  # JPEG rounding
+        assert (placeholder["width"], placeholder["height"]) == (1200, 800) and len(
+            placeholder["blurhash"]
+        ) == 28
+        listed = img.with_image_placeholders(
+            [{"id": "a", "image_url": url}, {"id": "b", "image_url": None}]
+        )
+        assert (
+            listed[0]["image_placeholder"] == placeholder
+            and "image_placeholder" not in listed[1]
+        )
+
+        app = FastAPI()
+        app.include_router(router)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://t"
+        ) as client:
+            r = await client.get(
+                "/api/img",
+                params={"url": url, "w": 300},
+                headers={"Accept": "image/webp,*/*"},
+            )
+            assert r.status_code == 200 and r.headers["content-type"] == "image/webp"
+            assert (
+                "immutable" in r.headers["cache-control"]
+                and r.headers["vary"] == "Accept"
+            )
+            from PIL import Image
+            import io
+
+            assert Image.open(io.BytesIO(r.content)).size == (
+                320,
+                213,
+            )  # rounded up to the 320 bucket
+            jpeg = await client.get(
+                "/api/img", params={"url": url, "w": 100, "fmt": "jpeg"}
+            )
+            assert (
+                jpeg.headers["content-type"] == "image/jpeg"
+                and "vary" not in jpeg.headers
+            )
+            again = await client.get(
+                "/api/img",
+                params={"url": url, "w": 300},
+                headers={"Accept": "image/webp", "If-None-Match": r.headers["etag"]},
+            )
+            assert again.status_code == 304
+            unknown = await client.get(
+                "/api/img", params={"url": "https://elsewhere.example/x.jpg"}
+            )
+            assert unknown.status_code == 404 and "location" not in unknown.headers
+            dead = str(feed_server.make_url("/dead/photo"))
+            img.register_images([dead])
+            broken = await client.get("/api/img", params={"url": dead})
+            assert broken.status_code == 302 and broken.headers["location"] == dead
+        assert feed_server.image_hits == ["photo"]  # the original was fetched once
+        assert img.get_image_status()["cache"]["entries"] == 3  # master + two variants
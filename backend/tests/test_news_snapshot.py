@@ -0,0 +1,351 @@
+"""
+Unit tests for the news snapshot, its id index, read-only items and precomputed views.
+Run: cd backend && python -m pytest tests/test_news_snapshot.py -v
+"""
+
+import pytest
+import sys
+import os
+
+from feed_helpers import make_item
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestSnapshotManager:
+    @pytest.mark.asyncio
+    async def test_concurrent_cold_callers_share_one_refresh(self):
+        import asyncio
+        from services.snapshot_service import SnapshotManager
+
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return [{"id": "a"}]
+
+        mgr = SnapshotManager(loader, ttl=60)
+        snaps = await asyncio.gather(*(mgr.get() for _ in range(10)))
+        assert len(calls) == 1
+        assert all(s.version == 1 for s in snaps)
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_served_while_refreshing(self):
+        import asyncio
+        from services.snapshot_service import SnapshotManager
+
+        release = asyncio.Event()
+
+        async def loader():
+            await release.wait()
+            return [{"id": "new"}]
+
+        mgr = SnapshotManager(loader, ttl=0)
+        mgr.publish([{"id": "old"}])
+        snap = await mgr.get()
+        assert snap.items == ({"id": "old"},) and mgr.refreshing
+        release.set()
+        await mgr.refresh()
+        assert mgr.current.version == 2 and mgr.current.items == ({"id": "new"},)
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_last_good_snapshot(self):
+        from services.snapshot_service import SnapshotManager
+
+        async def loader():
+            return []
+
+        mgr = SnapshotManager(loader, ttl=0)
+        mgr.publish([{"id": "good"}])
+        snap = await mgr.refresh()
+        assert snap.items == ({"id": "good"},) and mgr.failed_refreshes == 1
+
+
+class TestStoryIndex:
+    @pytest.mark.asyncio
+    async def test_lookup_covers_snapshot_aggregator_and_evicted(self, monkeypatch):
+        import services.news_service as ns
+        import services.aggregator_service as ag
+        from services.snapshot_service import EvictedItems, SnapshotManager
+
+        evicted = EvictedItems(2)
+        mgr = SnapshotManager(
+            lambda: None,
+            on_publish=lambda old, new: old and evicted.retire(old.by_id, new.by_id),
+        )
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        monkeypatch.setattr(ns, "_evicted_stories", evicted)
+        monkeypatch.setattr(
+            ag,
+            "_aggregator_cache",
+            {
+                "mediastack": [{"id": "agg1", "title": "Agg"}],
+                "newsdata": [],
+                "last_fetched": None,
+                "last_fetched_ts": 0,
+            },
+        )
+        mgr.publish([make_item(1), make_item(2), make_item(3)])
+        assert (await ns.find_story("A2"))["id"] == "A2"
+        assert (await ns.find_story("agg1"))["title"] == "Agg"
+
+        mgr.publish(
+            [make_item(4)]
+        )  # A1-A3 rotate out; only the 2 most recent evictions are kept
+        assert (await ns.find_story("A3"))["id"] == "A3"
+        assert await ns.find_story("A1") is None
+        assert await ns.find_story("nope") is None
+
+
+class TestReadOnlySnapshot:
+    @pytest.mark.asyncio
+    async def test_items_are_frozen_and_enrichment_is_side_table(self, monkeypatch):
+        import services.news_service as ns
+        import routes.news as rn
+        from services.snapshot_service import SnapshotManager
+
+        mgr = SnapshotManager(lambda: None)
+        mgr.publish([make_item(1)])
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        assert await ns.get_cached_all_news() is mgr.current.items  # zero-copy
+        with pytest.raises(TypeError):
+            mgr.current.items[0]["title"] = "changed"
+
+        calls = []
+
+        async def fake_narrative(text):
+            calls.append(text)
+            return {"narrative": "Told as a story", "key_takeaways": ["One"]}
+
+        monkeypatch.setattr(rn, "generate_narrative", fake_narrative)
+        detail = await rn.get_news_detail("A1")
+        again = await rn.get_news_detail("A1")
+        assert (
+            detail == again
+            and detail["narrative"] == "Told as a story"
+            and len(calls) == 1
+        )
+        assert "narrative" not in mgr.current.items[0]
+
+
+class TestSnapshotViews:
+    @pytest.mark.asyncio
+    async def test_news_views_match_filter_and_sort(self, monkeypatch):
+        import time
+        import services.news_service as ns
+        import services.aggregator_service as ag
+        from fastapi import Response
+        from routes.news import get_news
+        from services.snapshot_service import SnapshotManager
+
+        items = [
+            dict(make_item(i, src), region=region, category=cat)
+            for i, (src, region, cat) in enumerate(
+                [
+                    ("A", "local", "Politics"),
+                    ("B", "local", "Sports"),
+                    ("C", "continental", "Politics"),
+                    ("D", "international", "Business"),
+                    ("E", "local", "Politics"),
+                ]
+            )
+        ]
+        mgr = SnapshotManager(lambda: None)
+        mgr.publish(sorted(items, key=lambda x: x["published"], reverse=True))
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        monkeypatch.setattr(
+            ag,
+            "_aggregator_cache",
+            {
+                "mediastack": [
+                    {
+                        "id": "m1",
+                        "title": "Agg",
+                        "region": "Local",
+                        "category": "politics",
+                        "published": "2026-06-01T12:30:00",
+                        "aggregator": "mediastack",
+                    }
+                ],
+                "newsdata": [],
+                "last_fetched": None,
+                "last_fetched_ts": time.monotonic(),
+            },
+        )
+
+        def expected(region, category, agg=()):
+            pool = list(mgr.current.items) + list(agg)
+            if region:
+                pool = [n for n in pool if n["region"].lower() == region.lower()]
+            if category:
+                pool = [n for n in pool if n["category"].lower() == category.lower()]
+            return [
+                n["id"]
+                for n in sorted(pool, key=lambda x: x["published"], reverse=True)
+            ]
+
+        filters = [
+            (None, None),
+            ("LOCAL", None),
+            (None, "politics"),
+            ("local", "Politics"),
+            ("mars", None),
+        ]
+        for region, category in filters:
+            got = await get_news(
+                Response(),
+                region=region,
+                category=category,
+                limit=50,
+                include_aggregators=False,
+                aggregator_sources=None,
+                lang=None,
+            )
+            assert [n["id"] for n in got] == expected(region, category)
+
+        agg = ag.normalize_to_news_items(ag._aggregator_cache["mediastack"])
+        got = await get_news(
+            Response(),
+            region="local",
+            category="politics",
+            limit=2,
+            include_aggregators=True,
+            aggregator_sources=None,
+            lang=None,
+        )
+        assert (
+            [n["id"] for n in got]
+            == expected("local", "politics", agg)[:2]
+            == ["E4", "m1"]
+        )
+
+    def test_aggregator_views_built_once_per_index(self, monkeypatch):
+        import time
+        import services.aggregator_service as ag
+
+        monkeypatch.setattr(
+            ag,
+            "_aggregator_cache",
+            {
+                "mediastack": [
+                    {
+                        "id": "m1",
+                        "title": "Agg",
+                        "region": "Local",
+                        "category": "politics",
+                        "published": "2026-06-01T12:30:00",
+                        "aggregator": "mediastack",
+                    }
+                ],
+                "newsdata": [],
+                "last_fetched": None,
+                "last_fetched_ts": time.monotonic(),
+            },
+        )
+        monkeypatch.setattr(ag, "_index_sources", (None, None))
+        monkeypatch.setattr(ag, "_views", {})
+        builds = []
+        real = ag.build_views
+        monkeypatch.setattr(
+            ag, "build_views", lambda items: builds.append(1) or real(items)
+        )
+
+        assert [i["id"] for i in ag.get_aggregator_view(None, "local", "Politics")] == [
+            "m1"
+        ]
+        for region in ("mars", "venus", "pluto"):
+            assert ag.get_aggregator_view(None, region, None) == ()
+        assert ag.get_aggregator_view(["mediastack", "bogus"], "local", None)
+        assert not ag.get_aggregator_view(["bogus"], None, None)
+        assert not ag.get_aggregator_view(["nope"], None, None)
+        assert len(builds) == 3
+        assert set(ag._views) == {None, frozenset({"mediastack"}), frozenset()}
+        assert ("mars", None) not in ag._views[None]
+
+
+class TestMaterializedViews:
+    @pytest.mark.asyncio
+    async def test_views_are_built_per_snapshot_and_polled_with_etags(
+        self, monkeypatch
+    ):
+        import httpx
+        import server
+        import services.news_service as ns
+        from services.snapshot_service import SnapshotManager
+
+        async def no_fetch(*a, **k):
+            raise AssertionError("views must not refetch feeds")
+
+        monkeypatch.setattr(ns, "fetch_all_news", no_fetch)
+        monkeypatch.setattr(ns, "_materialized", {})
+        mgr = SnapshotManager(lambda: None, on_publish=ns._on_news_publish)
+        stories = [
+            {
+                "id": f"s{i}",
+                "title": f"Story {i}",
+                "published": f"2026-06-0{9 - i}",
+                "source": "A",
+            }
+            for i in range(6)
+        ]
+        mgr.publish(stories)
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://t"
+        ) as client:
+            r = await client.get("/api/notifications/digest")
+            assert [s["id"] for s in r.json()["top_stories"]] == [
+                "s0",
+                "s1",
+                "s2",
+                "s3",
+                "s4",
+            ]
+            etag = r.headers["etag"]
+            assert (
+                await client.get(
+                    "/api/notifications/digest", headers={"If-None-Match": etag}
+                )
+            ).status_code == 304
+
+            mgr.publish(
+                stories + [{"id": "old", "title": "Old", "published": "2020-01-01"}]
+            )  # not in the top 5
+            assert (
+                await client.get(
+                    "/api/notifications/digest", headers={"If-None-Match": etag}
+                )
+            ).status_code == 304
+            breaking = await client.get("/api/news/breaking")
+            assert (
+                breaking.json()[0]["id"] == "s0"
+                and breaking.json()[0]["is_developing"] is True
+            )
+
+            mgr.publish(
+                [
+                    {
+                        "id": "b",
+                        "title": "Flash",
+                        "published": "2026-06-10",
+                        "is_breaking": True,
+                    }
+                ]
+                + stories
+            )
+            versions = (await client.get("/api/news/views")).json()
+            assert (
+                versions["digest"]["version"] == 2
+                and versions["digest"]["snapshot_version"] == 3
+            )
+            assert (
+                await client.get(
+                    "/api/notifications/digest", headers={"If-None-Match": etag}
+                )
+            ).status_code == 200
+            assert [
+                s["id"] for s in (await client.get("/api/news/breaking")).json()
+            ] == ["b"]
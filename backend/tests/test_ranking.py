@@ -0,0 +1,110 @@
+"""
+Unit tests for the precomputed top-stories ranking.
+Run: cd backend && python -m pytest tests/test_ranking.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestRanking:
+    def _engine(self, now, **kw):
+        from services.ranking_service import RankingEngine
+
+        return RankingEngine(
+            half_life_hours=6, repeat_penalty=0.5, clock=lambda: now[0], **kw
+        )
+
+    def test_decay_penalties_and_incremental_rescoring(self):
+        now = [1_780_000_000.0]  # 2026-05-28
+        engine = self._engine(now, authority={"Wire": 1.2})
+
+        def story(i, source, hours_ago, **extra):
+            from datetime import datetime, timezone
+
+            ts = datetime.fromtimestamp(
+                now[0] - hours_ago * 3600, timezone.utc
+            ).isoformat()
+            return {"id": i, "source": source, "published": ts, **extra}
+
+        items = {
+            s["id"]: s
+            for s in [
+                story("f1", "Flood", 0.1),
+                story("f2", "Flood", 0.2),
+                story("f3", "Flood", 0.3),
+                story("f4", "Flood", 0.4),
+                story("w1", "Wire", 2),
+                story("b1", "Blog", 1, is_breaking=True),
+                story("o1", "Blog", 30),
+            ]
+        }
+        assert engine.sync(items, {}) == (7, 0, 0)
+        ranked = engine.top(7)
+        ids = [item["id"] for item, _ in ranked]
+        assert ids[:3] == [
+            "b1",
+            "f1",
+            "w1",
+        ]  # the flooding feed's 2nd story is penalised behind them
+        assert ids[-1] == "o1"
+        now[0] += 6 * 3600  # time alone never reorders; every score halves
+        later = engine.top(7)
+        assert [item["id"] for item, _ in later] == ids
+        assert later[0][1] == pytest.approx(ranked[0][1] / 2)
+
+        # f4 is reported by three other sources: only it is re-keyed, and it rises
+        assert engine.sync(items, {"f4": 4}) == (0, 0, 1)
+        assert [item["id"] for item, _ in engine.top(2)] == ["f4", "b1"]
+        version = engine.version
+        assert engine.set_listens({"o1": 255}) == 1 and engine.version == version + 1
+        assert engine.set_listens({"o1": 255}) == 0
+        del items["f4"]
+        assert engine.sync(items, {}) == (0, 1, 0)
+        assert "f4" not in [item["id"] for item, _ in engine.top(10)]
+        assert [
+            item["id"]
+            for item, _ in engine.top(5, accept=lambda item: item["source"] == "Blog")
+        ] == ["b1", "o1"]
+
+    @pytest.mark.asyncio
+    async def test_top_endpoint_ranks_on_publish(self, monkeypatch):
+        from datetime import datetime, timedelta, timezone
+        from fastapi import Response
+        import services.news_service as ns
+        import services.ranking_service as rs
+        import routes.news as rn
+        from services.snapshot_service import SnapshotManager
+
+        monkeypatch.setattr(rs, "_engine", rs.RankingEngine())
+        monkeypatch.setattr(rs, "_ranked_from", None)
+        mgr = SnapshotManager(lambda: None, on_publish=ns._on_news_publish)
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        now = datetime.now(timezone.utc)
+        titles = [
+            "Senate passes the new budget after a long debate",
+            "Markets rally in Lagos trading",
+            "Flood warning issued for Kogi riverside communities",
+        ]
+        stories = [
+            {
+                "id": f"s{i}",
+                "title": titles[i % 3] + ("" if i < 3 else f" update {i}"),
+                "source": f"Src{i}",
+                "region": "local" if i % 2 else "international",
+                "published": (now - timedelta(hours=i)).isoformat(),
+            }
+            for i in range(6)
+        ]
+        mgr.publish(stories)
+        assert (
+            rs._ranked_from is mgr.current
+        )  # scored by the publish hook, not on request
+        top = await rn.get_news_top(Response(), None, None, 3)
+        assert top[0]["id"] == "s0" and top[0]["rank_score"] > top[1]["rank_score"]
+        assert [
+            s["id"] for s in await rn.get_news_top(Response(), "local", None, 5)
+        ] == ["s1", "s3", "s5"]
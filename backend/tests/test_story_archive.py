@@ -0,0 +1,170 @@
+"""
+Unit tests for the day-partitioned story archive.
+Run: cd backend && python -m pytest tests/test_story_archive.py -v
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestStoryArchive:
+    def test_segments_index_and_reopen(self, tmp_path):
+        from datetime import date
+        from lib.story_archive import StoryArchive
+        from models.article import Article
+
+        archive = StoryArchive(str(tmp_path))
+        stories = [
+            Article(
+                id="a1", title="Day one", published="2026-06-01T08:00:00", tags=["x"]
+            ),
+            {"id": "a2", "title": "Day one later", "published": "2026-06-01T20:00:00"},
+            {"id": "b1", "title": "Day two", "published": "2026-06-02T09:00:00+01:00"},
+        ]
+        assert (
+            archive.append(stories) == 3 and archive.append(stories[:1]) == 0
+        )  # already archived
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "2026-06-01.idx",
+            "2026-06-01.seg",
+            "2026-06-02.idx",
+            "2026-06-02.seg",
+        ]
+        assert archive.get("a1") == {
+            "id": "a1",
+            "title": "Day one",
+            "published": "2026-06-01T08:00:00",
+            "tags": ["x"],
+        }
+
+        reopened = StoryArchive(str(tmp_path))  # index rebuilt from the .idx files
+        assert (
+            len(reopened) == 3
+            and reopened.get("b1")["title"] == "Day two"
+            and reopened.get("zz") is None
+        )
+        days = [
+            i["id"] for i in reopened.iter_range(date(2026, 6, 1), date(2026, 6, 2))
+        ]
+        assert days == ["b1", "a2", "a1"]
+        with open(tmp_path / "2026-06-02.idx", "ab") as f:
+            f.write(
+                b"\x00" * 8 + (10**6).to_bytes(8, "little") + b"\x00" * 8
+            )  # torn write past the segment
+        assert len(StoryArchive(str(tmp_path))) == 3
+
+    def test_prune_drops_expired_days_while_open(self, tmp_path):
+        from datetime import datetime, timedelta, timezone
+        from lib.story_archive import StoryArchive
+
+        now = datetime.now(timezone.utc)
+        archive = StoryArchive(str(tmp_path), retention_days=30)
+        archive.append(
+            [
+                {"id": "old", "published": (now - timedelta(days=40)).isoformat()},
+                {"id": "new", "published": now.isoformat()},
+            ]
+        )
+        assert archive.get("old") is not None and archive.prune() == 1
+        assert archive.get("old") is None and archive.get("new")["id"] == "new"
+        assert len(archive) == 1 and archive.stats()["segments"] == 1
+        assert archive.prune() == 0
+
+    def test_remap_by_another_thread_does_not_break_a_read(self, tmp_path, monkeypatch):
+        import threading
+        from lib.story_archive import StoryArchive
+
+        archive = StoryArchive(str(tmp_path))
+        day = "2026-06-01T08:00:00"
+        archive.append([{"id": "s0", "title": "first", "published": day}])
+        assert archive.get("s0") is not None  # maps the segment as it is now
+        archive.append([{"id": "s1", "title": "grown", "published": day}])
+        original, racer, seen = archive._map, [], []
+
+        def racing_map(d, end):
+            # While this read holds the old mapping, another thread reads s1, which remaps the segment
+            m = original(d, end)
+            if not racer:
+                racer.append(
+                    threading.Thread(target=lambda: seen.append(archive.get("s1")))
+                )
+                racer[0].start()
+                racer[0].join(timeout=0.2)
+            return m
+
+        monkeypatch.setattr(archive, "_map", racing_map)
+        assert archive.get("s0")["title"] == "first"
+        racer[0].join()
+        assert seen[0]["title"] == "grown"
+
+    @pytest.mark.asyncio
+    async def test_archiver_prunes_once_a_day(self, tmp_path, monkeypatch):
+        from datetime import date
+        import services.archive_service as arch
+
+        monkeypatch.setattr(arch, "STORY_ARCHIVE_DIR", str(tmp_path))
+        monkeypatch.setattr(arch, "_archive", None)
+        archive = await asyncio.to_thread(arch._get_archive, True)
+        calls = []
+        monkeypatch.setattr(archive, "prune", lambda: calls.append(1) or 0)
+        await arch.prune_archive()  # just opened (and pruned) today
+        monkeypatch.setattr(arch, "_pruned_on", date(2000, 1, 1))
+        await arch.prune_archive()
+        await arch.prune_archive()
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_rotated_out_story_resolves_from_disk(self, tmp_path, monkeypatch):
+        import services.archive_service as arch
+        import services.news_service as ns
+        import routes.news as rn
+        from services.snapshot_service import EvictedItems, SnapshotManager
+
+        monkeypatch.setattr(arch, "STORY_ARCHIVE_DIR", str(tmp_path))
+        monkeypatch.setattr(arch, "_archive", None)
+        monkeypatch.setattr(ns, "_evicted_stories", EvictedItems(0))
+        mgr = SnapshotManager(lambda: None, on_publish=ns._on_news_publish)
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        arch.start_story_archiver()
+        try:
+            mgr.publish(
+                [
+                    {
+                        "id": "old",
+                        "title": "Old story",
+                        "published": "2026-05-30T10:00:00",
+                        "source": "Punch",
+                    }
+                ]
+            )
+            mgr.publish(
+                [
+                    {
+                        "id": "new",
+                        "title": "New story",
+                        "published": "2026-06-01T10:00:00",
+                        "source": "Punch",
+                    }
+                ]
+            )
+        finally:
+            await arch.stop_story_archiver()
+        assert (await ns.find_story("old"))["title"] == "Old story"
+        from datetime import date
+
+        listing = await rn.get_news_archive(
+            start=date(2026, 5, 1),
+            end=date(2026, 6, 15),
+            source="punch",
+            category=None,
+            limit=1,
+            offset=0,
+        )
+        assert [i["id"] for i in listing["items"]] == ["new"] and listing["has_more"]
+        assert (
+            listing["start"] == "2026-05-16"
+        )  # ranges are capped at ARCHIVE_MAX_RANGE_DAYS
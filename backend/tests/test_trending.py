@@ -0,0 +1,131 @@
+"""
+Unit tests for incremental trending terms.
+Run: cd backend && python -m pytest tests/test_trending.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestTrending:
+    def test_counts_follow_snapshot_and_window(self):
+        from services.trending_service import TrendingEngine
+
+        now = [86400.0 * 100]
+        engine = TrendingEngine(
+            bucket_seconds=3600,
+            window_seconds=3 * 3600,
+            baseline_seconds=12 * 3600,
+            clock=lambda: now[0],
+        )
+
+        def iso(hours_ago):
+            from datetime import datetime, timezone
+
+            return datetime.fromtimestamp(
+                now[0] - hours_ago * 3600, timezone.utc
+            ).isoformat()
+
+        items = {
+            "b1": {
+                "id": "b1",
+                "title": "Naira falls against dollar",
+                "published": iso(1),
+                "category": "Economy",
+            },
+            "b2": {
+                "id": "b2",
+                "title": "Naira falls again at parallel market",
+                "published": iso(2),
+                "category": "Economy",
+            },
+            "b3": {
+                "id": "b3",
+                "title": "CBN moves as naira falls",
+                "published": iso(0),
+                "category": "Economy",
+            },
+            "o1": {
+                "id": "o1",
+                "title": "Fuel queues return",
+                "published": iso(5),
+                "category": "General",
+            },
+            "o2": {
+                "id": "o2",
+                "title": "Fuel queues in Abuja",
+                "published": iso(6),
+                "category": "General",
+            },
+            "o3": {
+                "id": "o3",
+                "title": "Fuel queues ease",
+                "published": iso(1),
+                "category": "General",
+            },
+            "o4": {
+                "id": "o4",
+                "title": "Fuel price protest",
+                "published": iso(2),
+                "category": "General",
+            },
+        }
+        assert engine.sync(items) == (7, 0)
+        top = engine.top_terms(3)
+        assert (
+            top[0]["term"] == "naira falls"
+            and top[0]["count"] == 3
+            and top[0]["trend"] == "up"
+        )
+        assert "naira" not in [t["term"] for t in top]  # covered by the bigram
+        fuel = next(t for t in engine.top_terms(10) if t["term"] == "fuel")
+        assert (
+            fuel["count"] == 2 and fuel["velocity"] < top[0]["velocity"]
+        )  # rising slower vs. its baseline
+        assert engine.top_categories(1)[0]["category"] == "Economy"
+
+        assert engine.sync({k: v for k, v in items.items() if k != "b3"}) == (0, 1)
+        assert engine.top_terms(1)[0]["count"] == 2
+        now[0] += 3 * 3600  # the naira stories slide into the baseline
+        assert all(t["term"] != "naira falls" for t in engine.top_terms(10))
+        now[0] += 24 * 3600
+        assert engine.top_terms(10) == [] and engine.top_categories(10) == []
+
+    @pytest.mark.asyncio
+    async def test_trending_endpoint_is_served_from_snapshot_counters(
+        self, monkeypatch
+    ):
+        import services.news_service as ns
+        import services.trending_service as ts
+        from datetime import datetime, timezone
+        from services.snapshot_service import SnapshotManager
+
+        monkeypatch.setattr(ts, "_engine", ts.TrendingEngine())
+
+        async def no_fetch(*a, **k):
+            raise AssertionError("trending must not refetch feeds")
+
+        monkeypatch.setattr(ns, "fetch_all_news", no_fetch)
+        mgr = SnapshotManager(lambda: None, on_publish=ns._on_news_publish)
+        stamp = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        mgr.publish(
+            [
+                {
+                    "id": f"n{i}",
+                    "title": f"Election tribunal day {i}",
+                    "published": stamp,
+                    "category": "Politics",
+                }
+                for i in range(3)
+            ]
+        )
+        monkeypatch.setattr(ns, "_news_snapshots", mgr)
+        result = await ns.get_trending_topics()
+        assert result["tags"] == ["#POLITICS"]
+        assert (
+            result["topics"][0]["name"] == "Election Tribunal"
+            and result["topics"][0]["count"] == "3"
+        )
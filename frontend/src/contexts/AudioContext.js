@@ -262,7 +262,8 @@ export const AudioProvider = ({ children }) => {
       const response = await api.post('api/tts/generate', {
         text: textToSpeak.slice(0, 4000),
         voice_id: voiceModel,
-        language: broadcastLanguage
+        language: broadcastLanguage,
+        story_id: track.id
       });
       
       if (!response.ok) throw new Error('TTS generation failed');
@@ -39,7 +39,7 @@ export const useAudioPrefetch = (articles = [], voiceId = 'nova', limit = 3) =>
           const text = (article.narrative || article.summary || article.title || '').slice(0, 500);
           if (!text) continue;
 
-          await api.post('api/tts/generate', { text, voice_id: voiceId, language: 'en' }, { signal: controller.signal });
+          await api.post('api/tts/generate', { text, voice_id: voiceId, language: 'en', story_id: article.id }, { signal: controller.signal });
           prefetchedIds.add(article.id);
         } catch {
           // Abort or network error — silently skip
@@ -169,7 +169,7 @@ const NewsDetailPage = () => {
     const vid = voiceModel || 'emma';
     const lang = broadcastLanguage || 'en';
     
-    api.post('api/tts/generate', { text: text.slice(0, 4000), voice_id: vid, language: lang })
+    api.post('api/tts/generate', { text: text.slice(0, 4000), voice_id: vid, language: lang, story_id: news.id })
       .then(r => r.ok ? r.json() : null)
       .then(data => {
         if (data?.audio_url) pregenAudioUrl.current = data.audio_url;